@@ -16,6 +16,7 @@ setup(
         "pandas>=2.0.0",
         "scipy>=1.10.0",
         "scikit-learn>=1.3.0",
+        "pyarrow>=12.0.0",
         "matplotlib>=3.7.0",
         "seaborn>=0.12.0",
         "jupyter>=1.0.0",
@@ -45,4 +46,9 @@ setup(
         "Programming Language :: Python :: 3.11",
     ],
     keywords="audiometry synthetic-data healthcare machine-learning privacy",
+    entry_points={
+        "console_scripts": [
+            "synthh=synthh.cli:main",
+        ],
+    },
 )
\ No newline at end of file
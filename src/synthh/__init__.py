@@ -3,31 +3,123 @@ SyntHH: Synthetic Hearing Health Data Generation and Validation
 
 A research project for generating synthetic audiometric data that preserves
 statistical properties of real hearing measurements while protecting patient privacy.
+
+Public names are resolved lazily (PEP 562): submodules such as the cleaner
+(scipy) or the tympanometry visualizer (matplotlib, seaborn) are imported on
+first attribute access, so ``import synthh`` stays cheap.
 """
 
+import importlib
+from typing import TYPE_CHECKING
+
 __version__ = "0.1.0"
 __author__ = "LB"
 
-# Import main preprocessing components
-from .data_loader import NHANESDataLoader, load_nhanes_data
-from .data_cleaner import NHANESDataCleaner, clean_nhanes_data  
-from .feature_engineering import NHANESFeatureEngineer, engineer_nhanes_features
-from .preprocessing_pipeline import NHANESPreprocessingPipeline, preprocess_nhanes_data
-
-__all__ = [
+# Public name -> submodule providing it
+_LAZY_ATTRIBUTES = {
     # Data Loading
-    'NHANESDataLoader',
-    'load_nhanes_data',
+    'NHANESDataLoader': 'data_loader',
+    'load_nhanes_data': 'data_loader',
+    'NHANESTympanometryLoader': 'tympanometry_loader',
+    'load_nhanes_tympanometry': 'tympanometry_loader',
+    'NHANESAcousticReflexLoader': 'acoustic_reflex_loader',
+    'load_nhanes_acoustic_reflex': 'acoustic_reflex_loader',
+    'NHANESWidebandLoader': 'wideband_loader',
+    'load_nhanes_wideband': 'wideband_loader',
+    'WidebandStore': 'wideband_loader',
+    'summarize_absorbance_batch': 'wideband_loader',
+    'CurveStore': 'curve_store',
+    'CurveCache': 'curve_cache',
+    'get_curve_cache': 'curve_cache',
+    'CurveSimilarityIndex': 'curve_index',
+    'calculate_tympanometric_parameters_batch': 'tympanometry_batch',
+    'fit_tympanograms_batch': 'tympanometry_batch',
+    'classify_tympanograms_batch': 'tympanometry_batch',
+    'calculate_reflex_parameters_batch': 'reflex_batch',
+    'classify_reflex_responses_batch': 'reflex_batch',
     
-    # Data Cleaning  
-    'NHANESDataCleaner',
-    'clean_nhanes_data',
+    # Data Cleaning
+    'NHANESDataCleaner': 'data_cleaner',
+    'clean_nhanes_data': 'data_cleaner',
     
     # Feature Engineering
-    'NHANESFeatureEngineer', 
-    'engineer_nhanes_features',
+    'NHANESFeatureEngineer': 'feature_engineering',
+    'engineer_nhanes_features': 'feature_engineering',
+    
+    # Hearing Loss Grading
+    'HearingLossGrader': 'hearing_loss_grading',
+    'grade_hearing_loss': 'hearing_loss_grading',
+    
+    # Audiogram Shape Features
+    'AudiogramShapeAnalyzer': 'audiogram_shape',
+    'compute_shape_features': 'audiogram_shape',
+    
+    # Normative Tables
+    'NormativePercentileTable': 'normative_tables',
+    'build_normative_table': 'normative_tables',
+    
+    # Feature Store
+    'NHANESFeatureStore': 'feature_store',
+    'engineer_nhanes_features_cached': 'feature_store',
     
     # Preprocessing Pipeline
-    'NHANESPreprocessingPipeline',
-    'preprocess_nhanes_data'
-]
\ No newline at end of file
+    'NHANESPreprocessingPipeline': 'preprocessing_pipeline',
+    'preprocess_nhanes_data': 'preprocessing_pipeline',
+    
+    # Configuration Sweeps
+    'ConfigurationSweep': 'sweep',
+    'sweep_nhanes_configs': 'sweep',
+    
+    # Visualization
+    'TympanometryVisualizer': 'tympanometry_visualizer',
+    'visualize_participant_tympanograms': 'tympanometry_visualizer'
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    """Import the submodule providing a public name on first access."""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    globals()[name] = value  # Later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    """List module attributes including the lazily imported names."""
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+if TYPE_CHECKING:
+    from .data_loader import NHANESDataLoader, load_nhanes_data
+    from .tympanometry_loader import NHANESTympanometryLoader, load_nhanes_tympanometry
+    from .acoustic_reflex_loader import NHANESAcousticReflexLoader, load_nhanes_acoustic_reflex
+    from .wideband_loader import (
+        NHANESWidebandLoader,
+        WidebandStore,
+        load_nhanes_wideband,
+        summarize_absorbance_batch
+    )
+    from .curve_store import CurveStore
+    from .curve_cache import CurveCache, get_curve_cache
+    from .curve_index import CurveSimilarityIndex
+    from .tympanometry_batch import (
+        calculate_tympanometric_parameters_batch,
+        classify_tympanograms_batch,
+        fit_tympanograms_batch
+    )
+    from .reflex_batch import calculate_reflex_parameters_batch, classify_reflex_responses_batch
+    from .data_cleaner import NHANESDataCleaner, clean_nhanes_data
+    from .feature_engineering import NHANESFeatureEngineer, engineer_nhanes_features
+    from .hearing_loss_grading import HearingLossGrader, grade_hearing_loss
+    from .audiogram_shape import AudiogramShapeAnalyzer, compute_shape_features
+    from .normative_tables import NormativePercentileTable, build_normative_table
+    from .feature_store import NHANESFeatureStore, engineer_nhanes_features_cached
+    from .preprocessing_pipeline import NHANESPreprocessingPipeline, preprocess_nhanes_data
+    from .sweep import ConfigurationSweep, sweep_nhanes_configs
+    from .tympanometry_visualizer import TympanometryVisualizer, visualize_participant_tympanograms
+    
\ No newline at end of file
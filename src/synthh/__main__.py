@@ -0,0 +1,8 @@
+"""Allow ``python -m synthh`` to run the command-line interface."""
+
+import sys
+
+from .cli import main
+
+
+sys.exit(main())
@@ -12,6 +12,14 @@ from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
+from .curve_cache import CurveCache, get_curve_cache
+from .curve_store import CurveStore, load_or_build_curve_store
+from .reflex_batch import (
+    REFLEX_PARAMETER_NAMES,
+    calculate_reflex_parameters_batch,
+    classify_reflex_responses_batch
+)
+
 
 class NHANESAcousticReflexLoader:
     """
@@ -22,14 +30,25 @@ class NHANESAcousticReflexLoader:
     1.5 seconds following acoustic stimulation at 1000 Hz and 2000 Hz.
     """
     
-    def __init__(self, data_dir: Union[str, Path]):
+    def __init__(
+        self,
+        data_dir: Union[str, Path],
+        derived_dir: Optional[Union[str, Path]] = None,
+        curve_cache: Optional[CurveCache] = None
+    ):
         """
         Initialize the acoustic reflex data loader.
         
         Args:
             data_dir: Path to the NHANES data directory containing reflex files.
+            derived_dir: Optional directory for saved curve stores. Defaults to
+                        a 'derived' directory next to the reflex files.
+            curve_cache: Optional cache of per-participant curves and parameters.
+                        Defaults to the cache shared by all loaders.
         """
         self.data_dir = Path(data_dir)
+        self.reflex_dir = self.data_dir / 'nhanes' / 'reflex'
+        self.derived_dir = Path(derived_dir) if derived_dir else self.reflex_dir / 'derived'
         
         # NHANES acoustic reflex specifications
         self.n_measurements = 84  # 84 time points over 1.5 seconds
@@ -69,6 +88,10 @@ class NHANESAcousticReflexLoader:
             'decay_threshold_percent': 50, # % - significant decay if >50% in 10 seconds
             'min_reflex_magnitude': 0.1    # ml - minimum detectable reflex
         }
+        
+        # Curve store of the most recently queried frame
+        self._curve_store = None
+        self.curve_cache = curve_cache if curve_cache is not None else get_curve_cache()
     
     def _generate_time_values(self) -> np.ndarray:
         """
@@ -79,6 +102,10 @@ class NHANESAcousticReflexLoader:
         """
         return np.linspace(0, self.total_duration_ms, self.n_measurements)
     
+    def get_cohort_file(self, cohort_suffix: str) -> Path:
+        """Get the path of a cohort's acoustic reflex file."""
+        return self.reflex_dir / f'nhanes_auxr_{cohort_suffix}'
+    
     def load_cohort_data(self, cohort_suffix: str) -> pd.DataFrame:
         """
         Load acoustic reflex data for a single cohort.
@@ -92,7 +119,7 @@ class NHANESAcousticReflexLoader:
         Raises:
             FileNotFoundError: If the acoustic reflex file is not found.
         """
-        filepath = self.data_dir / 'nhanes' / 'reflex' / f'nhanes_auxr_{cohort_suffix}'
+        filepath = self.get_cohort_file(cohort_suffix)
         
         try:
             df = pd.read_csv(filepath)
@@ -103,6 +130,101 @@ class NHANESAcousticReflexLoader:
                 f"Please ensure data directory structure is correct."
             )
     
+    def build_curve_store(self, df: pd.DataFrame) -> CurveStore:
+        """
+        Pack the reflex curves of a frame into a SEQN-indexed curve store.
+        
+        Args:
+            df: DataFrame containing acoustic reflex data.
+            
+        Returns:
+            CurveStore of shape (participants, 4 channels, 84 points), with
+            the channels 'Right_1000Hz', 'Left_1000Hz', 'Right_2000Hz' and
+            'Left_2000Hz'.
+        """
+        channel_columns = {
+            f'{ear.title()}_{freq}Hz': self.column_patterns[freq][ear]
+            for freq in self.frequencies
+            for ear in ['right', 'left']
+        }
+        
+        return CurveStore.from_frame(
+            df,
+            channel_columns,
+            self.time_values,
+            x_name='Time_ms',
+            y_name='Compliance_Change_ml'
+        )
+    
+    def get_curve_store(self, df: pd.DataFrame, refresh: bool = False) -> CurveStore:
+        """
+        Get the curve store of a frame, building it on first use.
+        
+        The store of the most recently queried frame is kept, so repeated
+        lookups against the same frame are O(1). The store is matched by
+        frame identity, so pass refresh=True after modifying a frame in
+        place. The rebuilt store has a new token, so curves cached from the
+        old store are not served again.
+        
+        Args:
+            df: DataFrame containing acoustic reflex data.
+            refresh: Rebuild the store even if the frame was queried before.
+            
+        Returns:
+            CurveStore for the frame.
+        """
+        if refresh or self._curve_store is None or self._curve_store[0] is not df:
+            self._curve_store = (df, self.build_curve_store(df))
+        return self._curve_store[1]
+    
+    def get_curve_store_path(self, cohort_suffix: str) -> Path:
+        """Get the directory of a cohort's saved curve store."""
+        cohort = cohort_suffix.replace('.csv', '')
+        return self.derived_dir / f'nhanes_auxr_{cohort}_curves'
+    
+    def load_curve_store(
+        self,
+        cohort_suffix: str,
+        dtype: str = 'float32',
+        mmap: bool = True,
+        refresh: bool = False
+    ) -> CurveStore:
+        """
+        Load a cohort's reflex curves as a memory-mapped curve store.
+        
+        The CSV is parsed only the first time (or when it changes); the
+        store is then saved in binary form and memory-mapped on later loads.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '1999-2000.csv').
+            dtype: 'float32', or 'int16' for curves quantised to the
+                  0.001 ml precision of the NHANES files.
+            mmap: Memory-map the curve array instead of reading it.
+            refresh: Rebuild the store even if a valid saved store exists.
+            
+        Returns:
+            CurveStore of shape (participants, 4 channels, 84 points).
+            
+        Raises:
+            FileNotFoundError: If the acoustic reflex file is not found.
+        """
+        source_file = self.get_cohort_file(cohort_suffix)
+        if not source_file.exists():
+            raise FileNotFoundError(
+                f"Acoustic reflex file not found: {source_file}. "
+                f"Please ensure data directory structure is correct."
+            )
+        
+        return load_or_build_curve_store(
+            self.get_curve_store_path(cohort_suffix),
+            source_file,
+            lambda: self.build_curve_store(self.load_cohort_data(cohort_suffix)),
+            dtype=dtype,
+            mmap=mmap,
+            refresh=refresh,
+            metadata={'cohort': cohort_suffix.replace('.csv', ''), 'measurement': 'acoustic_reflex'}
+        )
+    
     def extract_reflex_data(
         self,
         df: pd.DataFrame,
@@ -128,39 +250,26 @@ class NHANESAcousticReflexLoader:
         if frequency not in self.frequencies:
             raise ValueError(f"Frequency {frequency} not supported. Use {self.frequencies}")
         
-        # Find participant data
-        participant_data = df[df['SEQN'] == seqn]
-        
-        if participant_data.empty:
-            raise ValueError(f"Participant SEQN {seqn} not found in dataset")
-        
-        participant_data = participant_data.iloc[0]  # Get first (should be only) row
-        
-        # Get column names for this frequency
-        right_columns = self.column_patterns[frequency]['right']
-        left_columns = self.column_patterns[frequency]['left']
+        # O(1) lookup of the participant's row, through the curve cache
+        store = self.get_curve_store(df)
         
-        # Extract right ear data
-        right_ear_data = pd.DataFrame({
-            'Time_ms': self.time_values,
-            'Compliance_Change_ml': [participant_data[col] if col in participant_data.index 
-                                   else np.nan for col in right_columns],
-            'Ear': 'Right',
-            'Frequency_Hz': frequency
-        })
-        
-        # Extract left ear data
-        left_ear_data = pd.DataFrame({
-            'Time_ms': self.time_values,
-            'Compliance_Change_ml': [participant_data[col] if col in participant_data.index 
-                                   else np.nan for col in left_columns],
-            'Ear': 'Left',
-            'Frequency_Hz': frequency
-        })
+        def build_ear_data(ear: str) -> pd.DataFrame:
+            # The frame's own values (the curve store holds float32)
+            columns = self.column_patterns[frequency][ear.lower()]
+            compliance = pd.to_numeric(df.iloc[store.get_row(seqn)].reindex(columns), errors='coerce')
+            return pd.DataFrame({
+                'Time_ms': self.time_values,
+                'Compliance_Change_ml': compliance.to_numpy(dtype=np.float64),
+                'Ear': ear,
+                'Frequency_Hz': frequency
+            })
         
         return {
-            'right': right_ear_data,
-            'left': left_ear_data
+            ear.lower(): self.curve_cache.get_or_compute(
+                ('acoustic_reflex', store.token, seqn, f'{ear}_{frequency}Hz', 'curve'),
+                lambda: build_ear_data(ear)
+            ).copy()
+            for ear in ['Right', 'Left']
         }
     
     def extract_all_frequencies(
@@ -294,6 +403,48 @@ class NHANESAcousticReflexLoader:
             'baseline_stability': baseline_stability
         }
     
+    def get_participant_reflex_parameters(
+        self,
+        df: pd.DataFrame,
+        seqn: Union[int, float],
+        frequency: int = 1000
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get the reflex parameters of both ears of a participant at one frequency.
+        
+        Parameters are computed with calculate_reflex_parameters() on the
+        participant's row of the frame and kept in the curve cache.
+        
+        Args:
+            df: DataFrame containing acoustic reflex data.
+            seqn: Participant sequence number (SEQN).
+            frequency: Test frequency in Hz (1000 or 2000).
+            
+        Returns:
+            Dictionary with 'right' and 'left' parameter dictionaries.
+            
+        Raises:
+            ValueError: If participant SEQN is not found or frequency is invalid.
+        """
+        if frequency not in self.frequencies:
+            raise ValueError(f"Frequency {frequency} not supported. Use {self.frequencies}")
+        
+        store = self.get_curve_store(df)
+        
+        def compute(ear: str) -> Dict[str, float]:
+            # The frame's own values (the curve store holds float32)
+            columns = self.column_patterns[frequency][ear.lower()]
+            compliance = pd.to_numeric(df.iloc[store.get_row(seqn)].reindex(columns), errors='coerce')
+            return self.calculate_reflex_parameters(self.time_values, compliance.to_numpy(dtype=np.float64))
+        
+        parameters = {}
+        for ear in ['Right', 'Left']:
+            parameters[ear.lower()] = dict(self.curve_cache.get_or_compute(
+                ('acoustic_reflex', store.token, seqn, f'{ear}_{frequency}Hz', 'parameters'), lambda: compute(ear)
+            ))
+        
+        return parameters
+    
     def classify_reflex_response(
         self,
         reflex_params: Dict[str, float],
@@ -348,6 +499,120 @@ class NHANESAcousticReflexLoader:
             'clinical_significance': clinical_significance
         }
     
+    def get_reflex_tensor(
+        self,
+        df: pd.DataFrame,
+        seqn_list: Optional[List[Union[int, float]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the reflex curves of many participants into one tensor.
+        
+        Args:
+            df: DataFrame containing acoustic reflex data.
+            seqn_list: Optional participant sequence numbers. If None, all rows
+                      of the frame are used. Participants not found are skipped.
+            
+        Returns:
+            Tuple of (found SEQNs, float64 tensor of shape (n_found, 2 ears,
+            2 frequencies, 84) with ears ordered right, left and frequencies
+            as in self.frequencies). Columns missing from the frame are NaN.
+        """
+        if seqn_list is None:
+            seqns = df['SEQN'].to_numpy(dtype=np.float64)
+            rows = np.arange(len(df))
+        else:
+            seqns, rows = self.get_curve_store(df).lookup(seqn_list, missing='skip')
+        
+        # Curves from the frame's own values (the curve store holds float32)
+        tensor = np.full((len(rows), 2, len(self.frequencies), self.n_measurements), np.nan)
+        for ear_idx, ear in enumerate(['right', 'left']):
+            for freq_idx, freq in enumerate(self.frequencies):
+                columns = self.column_patterns[freq][ear]
+                present = [i for i, col in enumerate(columns) if col in df.columns]
+                if present:
+                    values = df[[columns[i] for i in present]].to_numpy(dtype=np.float64, na_value=np.nan)
+                    tensor[:, ear_idx, freq_idx, present] = values[rows]
+        
+        return seqns, tensor
+    
+    def calculate_reflex_table(
+        self,
+        df: pd.DataFrame,
+        seqn_list: Optional[List[Union[int, float]]] = None,
+        stimulus_intensity_db: Optional[float] = None
+    ) -> pd.DataFrame:
+        """
+        Calculate reflex parameters and response types for every ear and
+        frequency of many participants.
+        
+        Uses the batched engine, whose results match
+        calculate_reflex_parameters() applied to each curve.
+        
+        Args:
+            df: DataFrame containing acoustic reflex data.
+            seqn_list: Optional participant sequence numbers. If None, all rows
+                      of the frame are used. Participants not found are skipped.
+            stimulus_intensity_db: Optional stimulus intensity in dB SPL.
+            
+        Returns:
+            DataFrame with one row per participant, ear and frequency: the
+            parameter columns, response_type (categorical), SEQN, Ear and
+            Frequency_Hz.
+        """
+        seqns, tensor = self.get_reflex_tensor(df, seqn_list)
+        
+        params = calculate_reflex_parameters_batch(
+            self.time_values, tensor, self.reflex_thresholds['min_reflex_magnitude']
+        )
+        
+        table = pd.DataFrame({name: values.reshape(-1) for name, values in params.items()})
+        table['response_type'] = classify_reflex_responses_batch(
+            table,
+            stimulus_intensity_db,
+            abnormal_threshold_db=self.reflex_thresholds['abnormal_threshold_db'],
+            decay_threshold_percent=self.reflex_thresholds['decay_threshold_percent']
+        )
+        
+        n_freqs = len(self.frequencies)
+        table['SEQN'] = np.repeat(seqns, 2 * n_freqs)
+        table['Ear'] = np.tile(np.repeat(['Right', 'Left'], n_freqs), len(seqns))
+        table['Frequency_Hz'] = np.tile(self.frequencies, 2 * len(seqns))
+        
+        return table
+    
+    def summarize_reflex_table(
+        self,
+        table: pd.DataFrame,
+        by: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Summarize a reflex table by group, e.g. reflex prevalence per ear
+        and frequency.
+        
+        Args:
+            table: Reflex table from calculate_reflex_table().
+            by: Grouping columns. Defaults to ['Ear', 'Frequency_Hz'] (plus
+               'Cohort' if present).
+            
+        Returns:
+            DataFrame with the number of curves, the proportion with a
+            reflex present, the median of each parameter and the proportion
+            of each response type per group.
+        """
+        if by is None:
+            by = [col for col in ['Cohort', 'Ear', 'Frequency_Hz'] if col in table.columns]
+        
+        grouped = table.groupby(by, sort=False, observed=True)
+        summary = grouped[REFLEX_PARAMETER_NAMES[1:]].median()
+        summary.insert(0, 'reflex_present', grouped['reflex_present'].mean())
+        summary.insert(0, 'n_curves', grouped.size())
+        
+        response_types = pd.crosstab(
+            [table[col] for col in by], table['response_type'], normalize='index', dropna=False
+        )
+        
+        return summary.join(response_types.add_prefix('response_'))
+    
     def get_participant_list(self, df: pd.DataFrame) -> List[float]:
         """
         Get list of available participant SEQNs in the dataset.
@@ -0,0 +1,270 @@
+"""
+NHANES Audiogram Shape Feature Module
+
+This module provides batch detectors for clinically important audiogram
+shape features computed over the (N, 2, 5) threshold tensor in one pass:
+the 4 kHz noise notch (depth and width), interaural differences per
+frequency, asymmetry scores, unilateral and asymmetric loss flags, and
+better/worse-ear indicators. It is designed for both engineered NHANES
+data and large synthetic batches.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import NHANESFeatureEngineer
+
+
+class AudiogramShapeAnalyzer:
+    """
+    A class for computing audiogram shape features over a threshold tensor.
+    
+    All features are computed with array operations over the whole batch,
+    so the cost is a handful of passes over an (N, 2, 5) array regardless
+    of the number of records.
+    """
+    
+    def __init__(self, engineer: Optional[NHANESFeatureEngineer] = None):
+        """
+        Initialize the shape analyzer with standard clinical criteria.
+        
+        Args:
+            engineer: Feature engineer defining frequency and ear order. A
+                     default engineer is used if None.
+        """
+        self.engineer = engineer or NHANESFeatureEngineer()
+        
+        # Noise notch criterion (dB worse at 4 kHz than both shoulders)
+        self.notch_criterion = 10
+        self.notch_frequency = '4kHz'
+        self.low_shoulder_frequencies = ['1kHz', '2kHz']
+        self.recovery_frequency = '8kHz'
+        
+        # Asymmetry criteria (dB)
+        self.asymmetry_frequencies = ['0.5kHz', '1kHz', '2kHz', '4kHz']
+        self.asymmetry_threshold = 15
+        self.normal_limit = self.engineer.hearing_loss_threshold
+        
+        self.better_ear_labels = self.engineer.ears + ['Equal']
+    
+    def _freq_idx(self, freq: str) -> int:
+        """Return the tensor index of a frequency label."""
+        return self.engineer.frequency_labels.index(freq)
+    
+    def _octave_positions(self) -> np.ndarray:
+        """Return the test frequencies on an octave (log2 kHz) axis."""
+        return np.log2([float(freq.replace('kHz', '')) for freq in self.engineer.frequency_labels])
+    
+    def compute_notch_features(self, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute 4 kHz noise notch depth, width and presence for each ear.
+        
+        The notch depth is the amount by which the 4 kHz threshold exceeds
+        the higher of the low-frequency shoulder (better of 1 and 2 kHz) and
+        the 8 kHz recovery threshold. A notch is present if the depth meets
+        the notch criterion.
+        
+        The width is the full width of the notch at half depth, in octaves:
+        the span between the points either side of 4 kHz where the
+        audiogram, interpolated linearly between test frequencies on the
+        octave axis, falls below the half-depth level (reference + depth / 2).
+        The span is measured through the 4 kHz centre, so a notch confined
+        to 4 kHz has a width below one octave. A run that is still above
+        the level at the lowest test frequency ends there.
+        
+        Args:
+            thresholds: Threshold tensor of shape (N, 2, 5).
+        
+        Returns:
+            Dictionary of (N, 2) arrays: 'depth' (dB), 'width' (octaves, 0
+            without a notch) and 'present' (1.0/0.0 as float). All three are
+            NaN where the depth is missing; the width is also NaN where a
+            threshold needed for the interpolation is missing.
+        """
+        centre = self._freq_idx(self.notch_frequency)
+        shoulder_idx = [self._freq_idx(freq) for freq in self.low_shoulder_frequencies]
+        octaves = self._octave_positions()
+        n_freq = len(octaves)
+        
+        notch = thresholds[..., centre]
+        low_shoulder = thresholds[..., shoulder_idx].min(axis=-1)
+        recovery = thresholds[..., self._freq_idx(self.recovery_frequency)]
+        
+        reference = np.maximum(low_shoulder, recovery)
+        depth = notch - reference
+        present = depth >= self.notch_criterion
+        
+        # Contiguous runs above the half-depth level on either side of the centre
+        half_depth_level = reference + depth / 2
+        above = thresholds >= half_depth_level[..., None]
+        left_run = np.cumprod(above[..., centre - 1::-1], axis=-1).sum(axis=-1) if centre > 0 else 0
+        right_run = np.cumprod(above[..., centre + 1:], axis=-1).sum(axis=-1)
+        
+        def crossing(last_above: np.ndarray, first_below: np.ndarray) -> np.ndarray:
+            """Octave position where the audiogram crosses the level between two frequencies."""
+            inside = (first_below >= 0) & (first_below < n_freq)
+            below_idx = np.clip(first_below, 0, n_freq - 1)
+            t_above = np.take_along_axis(thresholds, last_above[..., None], axis=-1)[..., 0]
+            t_below = np.take_along_axis(thresholds, below_idx[..., None], axis=-1)[..., 0]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                fraction = (t_above - half_depth_level) / (t_above - t_below)
+                position = octaves[last_above] + fraction * (octaves[below_idx] - octaves[last_above])
+            return np.where(inside, position, octaves[last_above])
+        
+        left_edge = crossing(centre - left_run, centre - left_run - 1)
+        right_edge = crossing(centre + right_run, centre + right_run + 1)
+        
+        width = np.where(present, right_edge - left_edge, 0).astype(np.float32)
+        width[np.isnan(depth)] = np.nan
+        
+        present = present.astype(np.float32)
+        present[np.isnan(depth)] = np.nan
+        
+        return {
+            'depth': depth.astype(np.float32),
+            'width': width,
+            'present': present
+        }
+    
+    def compute_asymmetry_features(self, thresholds: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Compute interaural differences, asymmetry scores and ear indicators.
+        
+        Args:
+            thresholds: Threshold tensor of shape (N, 2, 5).
+        
+        Returns:
+            Dictionary containing:
+            - 'interaural_difference': (N, 5) right minus left thresholds
+            - 'asymmetry_score': mean absolute difference over 0.5-4 kHz
+            - 'max_interaural_difference': largest absolute difference
+            - 'asymmetric': asymmetry score at or above the criterion
+            - 'unilateral': one ear within normal limits, the other not
+            The two flags are 1.0/0.0 as float, NaN where a needed ear
+            average is missing.
+            - 'better_ear': codes into self.better_ear_labels (-1 if missing)
+        """
+        right_idx = self.engineer.ears.index('Right')
+        left_idx = self.engineer.ears.index('Left')
+        avg_idx = [self._freq_idx(freq) for freq in self.asymmetry_frequencies]
+        
+        difference = thresholds[:, right_idx, :] - thresholds[:, left_idx, :]
+        abs_difference = np.abs(difference)
+        asymmetry_score = abs_difference[:, avg_idx].mean(axis=-1)
+        
+        ear_average = thresholds[..., avg_idx].mean(axis=-1)
+        better_average = ear_average.min(axis=-1)
+        worse_average = ear_average.max(axis=-1)
+        
+        better_ear = np.select(
+            [
+                ear_average[:, right_idx] < ear_average[:, left_idx],
+                ear_average[:, left_idx] < ear_average[:, right_idx],
+                ear_average[:, left_idx] == ear_average[:, right_idx]
+            ],
+            [0, 1, 2],
+            default=-1
+        ).astype(np.int8)
+        
+        # nanmax only over records with at least one difference (no all-NaN slices)
+        has_difference = ~np.isnan(abs_difference).all(axis=-1)
+        max_difference = np.full(len(abs_difference), np.nan)
+        max_difference[has_difference] = np.nanmax(abs_difference[has_difference], axis=-1)
+        
+        asymmetric = np.where(
+            np.isnan(asymmetry_score), np.nan, asymmetry_score >= self.asymmetry_threshold
+        )
+        unilateral = np.where(
+            np.isnan(ear_average).any(axis=-1),
+            np.nan,
+            (better_average <= self.normal_limit) & (worse_average > self.normal_limit)
+        )
+        
+        return {
+            'interaural_difference': difference.astype(np.float32),
+            'asymmetry_score': asymmetry_score.astype(np.float32),
+            'max_interaural_difference': max_difference.astype(np.float32),
+            'asymmetric': asymmetric.astype(np.float32),
+            'unilateral': unilateral.astype(np.float32),
+            'better_ear': better_ear
+        }
+    
+    def compute(
+        self,
+        thresholds: np.ndarray,
+        index: Optional[pd.Index] = None
+    ) -> pd.DataFrame:
+        """
+        Compute all shape features for a threshold tensor.
+        
+        Args:
+            thresholds: Threshold tensor of shape (N, 2, 5).
+            index: Optional index for the returned DataFrame.
+        
+        Returns:
+            DataFrame with notch, interaural difference and asymmetry features.
+            Noise notch, asymmetric and unilateral loss flags are nullable
+            booleans (NA where the values they depend on are missing).
+        """
+        notch = self.compute_notch_features(thresholds)
+        asymmetry = self.compute_asymmetry_features(thresholds)
+        
+        features = {}
+        
+        for ear_idx, ear in enumerate(self.engineer.ears):
+            features[f'Notch Depth {ear}'] = notch['depth'][:, ear_idx]
+            features[f'Notch Width {ear}'] = notch['width'][:, ear_idx]
+            present = notch['present'][:, ear_idx]
+            features[f'Noise Notch {ear}'] = pd.arrays.BooleanArray(present == 1, np.isnan(present))
+        
+        for freq_idx, freq in enumerate(self.engineer.frequency_labels):
+            features[f'{freq} Interaural Difference'] = asymmetry['interaural_difference'][:, freq_idx]
+        
+        features['Asymmetry Score'] = asymmetry['asymmetry_score']
+        features['Max Interaural Difference'] = asymmetry['max_interaural_difference']
+        for name, flag in [('Asymmetric Loss', 'asymmetric'), ('Unilateral Loss', 'unilateral')]:
+            features[name] = pd.arrays.BooleanArray(asymmetry[flag] == 1, np.isnan(asymmetry[flag]))
+        features['Better Ear'] = pd.Categorical.from_codes(
+            asymmetry['better_ear'], categories=self.better_ear_labels
+        )
+        
+        # The worse ear swaps the Right/Left codes and keeps Equal and missing
+        worse_ear_codes = np.array([1, 0, 2, -1], dtype=np.int8)[asymmetry['better_ear']]
+        features['Worse Ear'] = pd.Categorical.from_codes(
+            worse_ear_codes, categories=self.better_ear_labels
+        )
+        
+        return pd.DataFrame(features, index=index)
+    
+    def compute_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute shape features for a wide-format PTA DataFrame.
+        
+        Args:
+            df: Wide-format DataFrame with PTA data.
+        
+        Returns:
+            DataFrame of shape features aligned with the input index.
+        """
+        thresholds = self.engineer.to_threshold_array(df)
+        return self.compute(thresholds, index=df.index)
+
+
+def compute_shape_features(
+    df: pd.DataFrame,
+    engineer: Optional[NHANESFeatureEngineer] = None
+) -> pd.DataFrame:
+    """
+    Convenience function to compute audiogram shape features.
+    
+    Args:
+        df: Wide-format DataFrame with PTA data (real or synthetic).
+        engineer: Optional feature engineer with custom thresholds.
+    
+    Returns:
+        DataFrame of shape features aligned with the input.
+    """
+    analyzer = AudiogramShapeAnalyzer(engineer)
+    return analyzer.compute_dataframe(df)
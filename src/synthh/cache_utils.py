@@ -0,0 +1,303 @@
+"""
+Caching Utilities Module
+
+This module provides the hashing and persistence helpers shared by the
+on-disk caches in SyntHH: stable content hashes for DataFrames and
+configuration dictionaries, atomic Parquet/JSON/directory writes, and a
+Parquet reader that restores the dtypes of written frames.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+
+def hash_dataframe(df: pd.DataFrame, include_index: bool = True) -> str:
+    """
+    Compute a stable content hash for a DataFrame.
+    
+    The hash covers column names, dtypes and every value (via
+    ``pd.util.hash_pandas_object``), so any change to the data produces
+    a different key.
+    
+    Args:
+        df: DataFrame to hash.
+        include_index: Whether the index participates in the hash.
+    
+    Returns:
+        Hexadecimal SHA-256 digest.
+    """
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps([str(col) for col in df.columns]).encode())
+    hasher.update(json.dumps([str(dtype) for dtype in df.dtypes]).encode())
+    
+    if len(df) > 0:
+        row_hashes = pd.util.hash_pandas_object(df, index=include_index)
+        hasher.update(np.ascontiguousarray(row_hashes.to_numpy()).tobytes())
+    
+    return hasher.hexdigest()
+
+
+def hash_config(config: Dict[str, Any]) -> str:
+    """
+    Compute a stable hash for a configuration dictionary.
+    
+    Args:
+        config: JSON-like configuration dictionary. Non-JSON values are
+               hashed through their string representation.
+    
+    Returns:
+        Hexadecimal SHA-256 digest.
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def hash_file(filepath: Union[str, Path], chunk_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 hash of a file's contents.
+    
+    Args:
+        filepath: Path to the file.
+        chunk_size: Number of bytes read per chunk.
+    
+    Returns:
+        Hexadecimal SHA-256 digest.
+    """
+    hasher = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def to_json_safe(obj: Any) -> Any:
+    """
+    Convert numpy and pandas values to native Python types for JSON.
+    
+    DataFrames and Series become (nested) dictionaries and tuple keys become
+    strings; other values are returned unchanged.
+    
+    Args:
+        obj: Object to convert, e.g. a data quality report.
+    
+    Returns:
+        JSON-serializable equivalent of the object.
+    """
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        return to_json_safe(obj.to_dict())
+    elif isinstance(obj, dict):
+        return {
+            str(k) if isinstance(k, tuple) else k: to_json_safe(v)
+            for k, v in obj.items()
+        }
+    elif isinstance(obj, list):
+        return [to_json_safe(item) for item in obj]
+    return obj
+
+
+_umask_lock = threading.Lock()
+
+
+def _current_umask() -> int:
+    """Get the process umask (without changing it where the OS reports it)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('Umask:'):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    
+    with _umask_lock:
+        umask = os.umask(0)
+        os.umask(umask)
+    return umask
+
+
+def set_default_permissions(path: Union[str, Path]) -> Path:
+    """
+    Give a temporary file or directory the permissions of a newly created one.
+    
+    ``tempfile.mkstemp`` and ``mkdtemp`` create private (0600/0700) paths.
+    Outputs that are moved into place with ``os.replace`` should instead
+    respect the umask, as files created with ``open`` and ``mkdir`` do.
+    
+    Args:
+        path: Temporary file or directory.
+    
+    Returns:
+        The path.
+    """
+    path = Path(path)
+    mode = 0o777 if path.is_dir() else 0o666
+    os.chmod(path, mode & ~_current_umask())
+    return path
+
+
+def write_parquet_atomic(df: pd.DataFrame, filepath: Union[str, Path], **kwargs) -> Path:
+    """
+    Write a DataFrame to Parquet so that readers never see a partial file.
+    
+    The data is written to a temporary file in the target directory and
+    moved into place with ``os.replace``.
+    
+    Args:
+        df: DataFrame to write.
+        filepath: Destination Parquet file.
+        **kwargs: Additional arguments passed to ``DataFrame.to_parquet``.
+    
+    Returns:
+        Path of the written file.
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        df.to_parquet(tmp_path, index=False, **kwargs)
+        set_default_permissions(tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return filepath
+
+
+def read_parquet(filepath: Union[str, Path], columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Read a Parquet file written by ``write_parquet_atomic`` with its dtypes.
+    
+    Columns that were plain object columns when written are restored as
+    such; pandas would otherwise read their strings back as the string
+    dtype, and a cached frame would differ from the frame it stands for.
+    
+    Args:
+        filepath: Parquet file to read.
+        columns: Optional list of columns to read. If None, reads all.
+    
+    Returns:
+        DataFrame.
+    """
+    df = pd.read_parquet(filepath, columns=columns)
+    
+    pandas_metadata = pq.read_schema(filepath).pandas_metadata or {}
+    restore = [
+        column['name'] for column in pandas_metadata.get('columns', [])
+        if column.get('numpy_type') == 'object'
+        and column['name'] in df.columns and df[column['name']].dtype != object
+    ]
+    if restore:
+        df = df.astype({col: object for col in restore})
+    
+    return df
+
+
+def write_json_atomic(data: Any, filepath: Union[str, Path], indent: Optional[int] = 2) -> Path:
+    """
+    Write JSON data so that readers never see a partial file.
+    
+    Args:
+        data: JSON-serializable object.
+        filepath: Destination JSON file.
+        indent: Indentation passed to ``json.dump``.
+    
+    Returns:
+        Path of the written file.
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, indent=indent, default=str)
+        set_default_permissions(tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return filepath
+
+
+def write_directory_atomic(writer: Callable[[Path], Any], dirpath: Union[str, Path]) -> Path:
+    """
+    Populate a directory so that readers never see a partial tree.
+    
+    The writer fills a temporary sibling directory, which then replaces the
+    destination. An existing destination is moved aside first and removed
+    after the swap.
+    
+    Args:
+        writer: Callable that writes the directory contents into the path it
+               is given.
+        dirpath: Destination directory.
+    
+    Returns:
+        Path of the written directory.
+    """
+    dirpath = Path(dirpath)
+    dirpath.parent.mkdir(parents=True, exist_ok=True)
+    
+    tmp_dir = Path(tempfile.mkdtemp(dir=dirpath.parent, prefix=f'.{dirpath.name}.', suffix='.tmp'))
+    try:
+        writer(tmp_dir)
+        set_default_permissions(tmp_dir)
+        replace_directory(tmp_dir, dirpath)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    
+    return dirpath
+
+
+def replace_directory(src_dir: Union[str, Path], dirpath: Union[str, Path]) -> Path:
+    """
+    Move a fully written directory (or file) into place.
+    
+    An existing destination is moved aside first and removed after the
+    swap, so readers see either the old or the new contents.
+    
+    Args:
+        src_dir: Populated sibling path of the destination.
+        dirpath: Destination path.
+    
+    Returns:
+        Path of the destination.
+    """
+    src_dir = Path(src_dir)
+    dirpath = Path(dirpath)
+        
+    old_dir = None
+    if dirpath.exists():
+        old_dir = Path(tempfile.mkdtemp(dir=dirpath.parent, prefix=f'.{dirpath.name}.', suffix='.old'))
+        os.replace(dirpath, old_dir / dirpath.name)
+        
+    os.replace(src_dir, dirpath)
+        
+    if old_dir is not None:
+        shutil.rmtree(old_dir, ignore_errors=True)
+    
+    return dirpath
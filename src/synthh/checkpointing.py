@@ -0,0 +1,188 @@
+"""
+NHANES Pipeline Checkpointing Module
+
+This module provides stage-level checkpoints for the NHANES preprocessing
+pipeline. Each stage's output datasets are written to a columnar (Parquet)
+store under a key derived from the stage inputs and the relevant subset of
+the pipeline configuration, so that re-runs can skip unchanged stages.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from .cache_utils import read_parquet, to_json_safe, write_json_atomic, write_parquet_atomic
+
+
+# Bump when stage logic changes so stale checkpoints are not reused
+CHECKPOINT_VERSION = 3
+
+
+class PipelineCheckpointStore:
+    """
+    A columnar checkpoint store for preprocessing pipeline stages.
+    
+    Checkpoints are laid out as ``<checkpoint_dir>/<stage>/<key>/`` with one
+    Parquet file per dataset, an optional JSON file of non-tabular extras
+    (such as quality reports), and a manifest written last to mark
+    completion. Every file is written atomically.
+    """
+    
+    def __init__(self, checkpoint_dir: Union[str, Path]):
+        """
+        Initialize the checkpoint store.
+        
+        Args:
+            checkpoint_dir: Directory in which checkpoints are stored.
+        """
+        self.checkpoint_dir = Path(checkpoint_dir)
+        self.manifest_name = 'manifest.json'
+        self.extras_name = 'extras.json'
+    
+    def _checkpoint_dir(self, stage: str, key: str) -> Path:
+        """Return the directory holding a stage checkpoint."""
+        return self.checkpoint_dir / stage / key
+    
+    def has(self, stage: str, key: str) -> bool:
+        """
+        Check whether a complete checkpoint exists for a stage key.
+        
+        Args:
+            stage: Stage name.
+            key: Stage key.
+        
+        Returns:
+            True if the checkpoint exists.
+        """
+        return (self._checkpoint_dir(stage, key) / self.manifest_name).exists()
+    
+    def save(
+        self,
+        stage: str,
+        key: str,
+        datasets: Optional[Dict[str, pd.DataFrame]] = None,
+        extras: Optional[Any] = None,
+        metadata: Optional[Dict] = None
+    ) -> Path:
+        """
+        Save a stage checkpoint.
+        
+        Args:
+            stage: Stage name.
+            key: Stage key.
+            datasets: Dictionary of output DataFrames to store as Parquet.
+            extras: Optional JSON-like object stored alongside the datasets.
+                   Numpy and pandas values are converted with to_json_safe(),
+                   so DataFrames and Series are restored as dictionaries.
+            metadata: Optional JSON-serializable metadata for the manifest.
+        
+        Returns:
+            Path to the checkpoint directory.
+        """
+        checkpoint_dir = self._checkpoint_dir(stage, key)
+        checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        datasets = datasets or {}
+        
+        for name, df in datasets.items():
+            write_parquet_atomic(df, checkpoint_dir / f'{name}.parquet')
+        
+        if extras is not None:
+            write_json_atomic(to_json_safe(extras), checkpoint_dir / self.extras_name)
+        
+        manifest = {
+            'stage': stage,
+            'key': key,
+            'created': datetime.now().isoformat(),
+            'datasets': list(datasets.keys()),
+            'has_extras': extras is not None,
+            'metadata': metadata or {}
+        }
+        write_json_atomic(manifest, checkpoint_dir / self.manifest_name)
+        
+        return checkpoint_dir
+    
+    def get_manifest(self, stage: str, key: str) -> Dict:
+        """
+        Get the manifest of a stage checkpoint.
+        
+        Args:
+            stage: Stage name.
+            key: Stage key.
+        
+        Returns:
+            Manifest dictionary.
+        """
+        with open(self._checkpoint_dir(stage, key) / self.manifest_name) as f:
+            return json.load(f)
+    
+    def load(
+        self,
+        stage: str,
+        key: str,
+        columns: Optional[Dict[str, List[str]]] = None
+    ) -> Tuple[Dict[str, pd.DataFrame], Any]:
+        """
+        Load a stage checkpoint.
+        
+        Args:
+            stage: Stage name.
+            key: Stage key.
+            columns: Optional mapping of dataset name to the columns to read.
+        
+        Returns:
+            Tuple of (datasets, extras).
+        
+        Raises:
+            KeyError: If no checkpoint exists for the stage key.
+        """
+        if not self.has(stage, key):
+            raise KeyError(f"No checkpoint for stage '{stage}' with key {key}")
+        
+        checkpoint_dir = self._checkpoint_dir(stage, key)
+        manifest = self.get_manifest(stage, key)
+        columns = columns or {}
+        
+        datasets = {
+            name: read_parquet(checkpoint_dir / f'{name}.parquet', columns=columns.get(name))
+            for name in manifest['datasets']
+        }
+        
+        extras = None
+        if manifest['has_extras']:
+            with open(checkpoint_dir / self.extras_name) as f:
+                extras = json.load(f)
+        
+        return datasets, extras
+    
+    def list_keys(self, stage: str) -> List[str]:
+        """
+        List the keys with complete checkpoints for a stage.
+        
+        Args:
+            stage: Stage name.
+        
+        Returns:
+            List of stage keys.
+        """
+        stage_dir = self.checkpoint_dir / stage
+        if not stage_dir.exists():
+            return []
+        
+        return sorted(
+            entry.name for entry in stage_dir.iterdir()
+            if (entry / self.manifest_name).exists()
+        )
+    
+    def clear(self, stage: Optional[str] = None) -> None:
+        """
+        Remove checkpoints.
+        
+        Args:
+            stage: Stage whose checkpoints to remove. If None, removes all.
+        """
+        target = self.checkpoint_dir / stage if stage else self.checkpoint_dir
+        shutil.rmtree(target, ignore_errors=True)
@@ -0,0 +1,550 @@
+"""
+SyntHH Command-Line Interface
+
+This module provides the ``synthh`` console entry point for running the
+preprocessing pipeline, sampling synthetic audiograms from a fitted model,
+evaluating synthetic data, benchmarking and managing the on-disk caches.
+Only the standard library is imported at module level; pandas, scipy and
+the pipeline modules are imported inside the subcommand that needs them,
+so ``synthh --help`` and small subcommands start quickly.
+"""
+
+import argparse
+import inspect
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def _add_common_options(parser: argparse.ArgumentParser) -> None:
+    """Add the options shared by the pipeline subcommands."""
+    parser.add_argument(
+        '--workers', type=int, default=1,
+        help='worker processes for cleaning and feature engineering (default: 1)'
+    )
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='record and print per-stage timings and memory'
+    )
+    parser.add_argument(
+        '--cache-dir', type=Path, default=None,
+        help='directory for stage checkpoints and the feature store (disabled if omitted)'
+    )
+    parser.add_argument(
+        '--log-level', default='WARNING',
+        help='logging level of the pipeline (default: WARNING)'
+    )
+
+
+# Third-party packages whose presence after an import indicates a regression
+HEAVY_MODULES = ['pandas', 'scipy', 'scipy.stats', 'sklearn', 'matplotlib', 'seaborn', 'pyarrow']
+
+# Measures one import in a fresh interpreter and reports it as JSON
+_IMPORT_PROBE = '''
+import importlib, json, sys, time
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'loaded': [m for m in sys.argv[2:] if m in sys.modules]}))
+'''
+
+
+def _get_cache_dirs(cache_dir: Path) -> Dict[str, Path]:
+    """Get the checkpoint and feature store directories inside a cache directory."""
+    return {
+        'checkpoints': cache_dir / 'checkpoints',
+        'features': cache_dir / 'features'
+    }
+
+
+def _make_pipeline(args: argparse.Namespace, output_dir: Optional[Path] = None):
+    """Create a pipeline configured from the common options."""
+    from .preprocessing_pipeline import NHANESPreprocessingPipeline
+    
+    pipeline = NHANESPreprocessingPipeline(args.data_dir, output_dir, log_level=args.log_level)
+    
+    config = {'n_workers': args.workers}
+    if args.profile:
+        config['profile'] = True
+    if args.cache_dir:
+        cache_dirs = _get_cache_dirs(args.cache_dir)
+        config['checkpoint_dir'] = cache_dirs['checkpoints']
+        config['feature_store_dir'] = cache_dirs['features']
+    
+    if getattr(args, 'cohorts', None):
+        config['cohorts'] = args.cohorts
+    
+    return pipeline.configure(**config)
+
+
+def _read_table(filepath: Path):
+    """Read a CSV or Parquet file into a DataFrame."""
+    import pandas as pd
+    
+    if filepath.suffix == '.parquet' or filepath.is_dir():
+        return pd.read_parquet(filepath)
+    return pd.read_csv(filepath)
+
+
+def _write_table(df, filepath: Path) -> None:
+    """Write a DataFrame to CSV or Parquet based on the file extension."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    if filepath.suffix == '.parquet':
+        df.to_parquet(filepath, index=False)
+    else:
+        df.to_csv(filepath, index=False)
+
+
+def cmd_preprocess(args: argparse.Namespace) -> int:
+    """Run the preprocessing pipeline."""
+    pipeline = _make_pipeline(args, args.output_dir)
+    pipeline.configure(
+        missing_strategy=args.missing_strategy,
+        hearing_loss_method=args.hearing_loss_method,
+        export_formats=args.formats,
+        async_export=args.async_export,
+        streaming=args.streaming,
+        memory_budget_mb=args.memory_budget_mb,
+        stream_block_rows=args.block_rows
+    )
+    
+    pipeline.run_full_pipeline(export=not args.no_export)
+    
+    for name, value in pipeline.get_summary_statistics().items():
+        print(f"{name}: {value}")
+    if pipeline.resumed_stages:
+        print(f"resumed_stages: {', '.join(pipeline.resumed_stages)}")
+    for filepath in pipeline.exported_files:
+        print(f"exported: {filepath}")
+    
+    if args.profile:
+        print(pipeline.profile.summary().drop(columns=['started']).to_string(index=False))
+        if args.profile_output:
+            pipeline.profile.to_csv(args.profile_output)
+    
+    return 0
+
+
+def _sample_model(model, n_samples: int, seed: int):
+    """
+    Draw samples from a density model.
+    
+    Supported models have a sample(n) method returning an (n, n_features)
+    array (e.g. scikit-learn's KernelDensity, seeded through a random_state
+    argument) or an (array, labels) tuple (e.g. GaussianMixture, seeded
+    through its random_state attribute).
+    
+    Raises:
+        ValueError: If the model has no sample() method or returns no 2-D array.
+    """
+    import numpy as np
+    
+    if not callable(getattr(model, 'sample', None)):
+        raise ValueError(f"{type(model).__name__} has no sample() method")
+    
+    if 'random_state' in inspect.signature(model.sample).parameters:
+        samples = model.sample(n_samples, random_state=seed)
+    else:
+        if hasattr(model, 'random_state'):
+            model.random_state = seed
+        samples = model.sample(n_samples)
+    
+    if isinstance(samples, tuple):
+        samples = samples[0]  # (samples, component labels)
+    
+    samples = np.asarray(samples, dtype=np.float64)
+    if samples.ndim != 2:
+        raise ValueError(f"{type(model).__name__}.sample() must return a 2-D array of samples")
+    return samples
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    """Sample synthetic audiograms from a pickled density model."""
+    import pickle
+    
+    import numpy as np
+    import pandas as pd
+    
+    from .data_loader import NHANESDataLoader
+    from .feature_engineering import NHANESFeatureEngineer
+    
+    with open(args.model, 'rb') as f:
+        model = pickle.load(f)
+    
+    samples = _sample_model(model, args.n_samples, args.seed)
+    
+    pta_columns = NHANESDataLoader.get_standard_pta_columns()
+    demo_columns = ['Gender', 'Age (years)', 'Race/ethnicity']
+    n_pta = len(pta_columns)
+    
+    if samples.shape[1] not in (n_pta, n_pta + len(demo_columns)):
+        raise ValueError(
+            f"Model produces {samples.shape[1]} features; expected {n_pta} thresholds "
+            f"or {n_pta + len(demo_columns)} thresholds and demographics"
+        )
+    
+    # Thresholds are reported on the audiometric grid
+    data = {
+        col: np.round(samples[:, col_idx] / args.step) * args.step
+        for col_idx, col in enumerate(pta_columns)
+    }
+    
+    if samples.shape[1] > n_pta:
+        # Demographics were modelled as numeric codes; report the package's labels
+        ethnicity_categories = NHANESFeatureEngineer().ethnicity_categories
+        gender_codes = np.rint(np.clip(samples[:, n_pta], 0, 1)).astype(int)
+        ethnicity_codes = np.rint(
+            np.clip(samples[:, n_pta + 2], 0, len(ethnicity_categories) - 1)
+        ).astype(int)
+        
+        data['Gender'] = np.array(['Female', 'Male'])[gender_codes]  # Gender_Numeric coding
+        data['Age (years)'] = np.rint(samples[:, n_pta + 1])
+        data['Race/ethnicity'] = np.array(ethnicity_categories)[ethnicity_codes]
+    
+    synthetic_df = pd.DataFrame(data)
+    _write_table(synthetic_df, args.output)
+    print(f"Wrote {len(synthetic_df)} synthetic audiograms to {args.output}")
+    
+    return 0
+
+
+def _describe_thresholds(df, pta_columns: List[str]):
+    """Summarise threshold distributions per column."""
+    return df[pta_columns].describe(percentiles=[0.25, 0.5, 0.75]).T[
+        ['mean', 'std', '25%', '50%', '75%']
+    ]
+
+
+def _grade_distribution(df, engineer) -> Dict:
+    """Get the better-ear WHO grade distribution in percent."""
+    from .hearing_loss_grading import HearingLossGrader
+    
+    grades = HearingLossGrader(engineer).grade_dataframe(df, standards=['who_2021'])
+    distribution = grades['WHO Grade Better Ear'].value_counts(normalize=True, sort=False) * 100
+    return distribution.round(2).to_dict()
+
+
+def _shape_prevalence(df, engineer) -> Dict:
+    """Get the prevalence of binary audiogram shape findings in percent."""
+    import pandas as pd
+    
+    from .audiogram_shape import AudiogramShapeAnalyzer
+    
+    shape_df = AudiogramShapeAnalyzer(engineer).compute_dataframe(df)
+    # Includes nullable flags; records with a missing finding are left out
+    findings = [col for col in shape_df.columns if pd.api.types.is_bool_dtype(shape_df[col])]
+    return (shape_df[findings].astype('boolean').mean(skipna=True) * 100).round(2).to_dict()
+
+
+def cmd_evaluate(args: argparse.Namespace) -> int:
+    """Evaluate synthetic audiograms, optionally against real data."""
+    import pandas as pd
+    
+    from .feature_engineering import NHANESFeatureEngineer
+    
+    engineer = NHANESFeatureEngineer()
+    synthetic_df = _read_table(args.synthetic)
+    pta_columns = [
+        f'{freq} {ear}' for freq in engineer.frequency_labels for ear in engineer.ears
+        if f'{freq} {ear}' in synthetic_df.columns
+    ]
+    if not pta_columns:
+        raise ValueError(f"No PTA threshold columns found in {args.synthetic}")
+    
+    summary = _describe_thresholds(synthetic_df, pta_columns)
+    report = {
+        'records': len(synthetic_df),
+        'who_grade_better_ear': {'synthetic': _grade_distribution(synthetic_df, engineer)},
+        'shape_prevalence': {'synthetic': _shape_prevalence(synthetic_df, engineer)}
+    }
+    
+    if args.reference:
+        from scipy.stats import ks_2samp
+        
+        reference_df = _read_table(args.reference)
+        reference_summary = _describe_thresholds(reference_df, pta_columns)
+        
+        summary['reference_mean'] = reference_summary['mean']
+        summary['mean_difference'] = summary['mean'] - reference_summary['mean']
+        summary['ks_statistic'] = [
+            ks_2samp(synthetic_df[col].dropna(), reference_df[col].dropna()).statistic
+            for col in pta_columns
+        ]
+        
+        report['reference_records'] = len(reference_df)
+        report['who_grade_better_ear']['reference'] = _grade_distribution(reference_df, engineer)
+        report['shape_prevalence']['reference'] = _shape_prevalence(reference_df, engineer)
+    
+    report['thresholds'] = summary.round(4).to_dict(orient='index')
+    
+    print(summary.round(2).to_string())
+    for section in ['who_grade_better_ear', 'shape_prevalence']:
+        print(f"\n{section}:")
+        print(pd.DataFrame(report[section]).to_string())
+    
+    if args.output:
+        from .cache_utils import write_json_atomic
+        
+        write_json_atomic(report, args.output)
+        print(f"\nWrote evaluation report to {args.output}")
+    
+    return 0
+
+
+def cmd_bench_pipeline(args: argparse.Namespace) -> int:
+    """Benchmark the preprocessing pipeline stages."""
+    import pandas as pd
+    
+    args.profile = True
+    profiles = []
+    
+    for repeat in range(args.repeat):
+        pipeline = _make_pipeline(args, args.output_dir)
+        pipeline.run_full_pipeline(export=args.export)
+        
+        profile = pipeline.profile.summary()
+        profile.insert(0, 'repeat', repeat)
+        profiles.append(profile)
+    
+    results = pd.concat(profiles, ignore_index=True)
+    print(results.drop(columns=['started']).to_string(index=False))
+    
+    if args.output:
+        _write_table(results, args.output)
+    
+    return 0
+
+
+def measure_import_time(module: str, repeat: int = 5) -> Dict:
+    """
+    Measure the import time of a module in fresh interpreters.
+    
+    Args:
+        module: Dotted module name to import.
+        repeat: Number of fresh interpreters to time.
+    
+    Returns:
+        Dictionary with the best and median import time in seconds and the
+        heavy third-party modules the import loaded.
+    """
+    timings = []
+    loaded = []
+    
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-c', _IMPORT_PROBE, module, *HEAVY_MODULES],
+            capture_output=True, text=True, check=True
+        )
+        probe = json.loads(result.stdout)
+        timings.append(probe['seconds'])
+        loaded = probe['loaded']
+    
+    return {
+        'module': module,
+        'best_s': min(timings),
+        'median_s': statistics.median(timings),
+        'loaded': loaded
+    }
+
+
+def cmd_bench_import(args: argparse.Namespace) -> int:
+    """Benchmark package import time and flag regressions."""
+    results = [measure_import_time(module, args.repeat) for module in args.modules]
+    
+    print(f"{'module':<40} {'best_s':>8} {'median_s':>9}  heavy modules loaded")
+    for result in results:
+        print(
+            f"{result['module']:<40} {result['best_s']:>8.3f} {result['median_s']:>9.3f}  "
+            f"{', '.join(result['loaded']) or '-'}"
+        )
+    
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    
+    if args.max_seconds is not None:
+        slow = [result['module'] for result in results if result['median_s'] > args.max_seconds]
+        if slow:
+            print(f"Import time above {args.max_seconds}s: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    
+    return 0
+
+
+def cmd_cache_info(args: argparse.Namespace) -> int:
+    """Show the contents of the cache directory."""
+    from .checkpointing import PipelineCheckpointStore
+    from .feature_store import NHANESFeatureStore
+    
+    cache_dirs = _get_cache_dirs(args.cache_dir)
+    checkpoints = PipelineCheckpointStore(cache_dirs['checkpoints'])
+    
+    stages = sorted(
+        entry.name for entry in cache_dirs['checkpoints'].iterdir() if entry.is_dir()
+    ) if cache_dirs['checkpoints'].exists() else []
+    
+    for stage in stages:
+        keys = checkpoints.list_keys(stage)
+        print(f"checkpoints/{stage}: {len(keys)} entries")
+    
+    entries = NHANESFeatureStore(cache_dirs['features']).list_entries()
+    print(f"features: {len(entries)} entries")
+    
+    total_bytes = sum(
+        path.stat().st_size for path in args.cache_dir.rglob('*') if path.is_file()
+    ) if args.cache_dir.exists() else 0
+    print(f"total size: {total_bytes / 1024 ** 2:.1f} MB")
+    
+    return 0
+
+
+def cmd_cache_clear(args: argparse.Namespace) -> int:
+    """Remove cached checkpoints and feature store entries."""
+    from .checkpointing import PipelineCheckpointStore
+    from .feature_store import NHANESFeatureStore
+    
+    cache_dirs = _get_cache_dirs(args.cache_dir)
+    
+    if args.target in ('all', 'checkpoints'):
+        PipelineCheckpointStore(cache_dirs['checkpoints']).clear(args.stage)
+        print(f"Cleared checkpoints{f' for stage {args.stage}' if args.stage else ''}")
+    
+    if args.target in ('all', 'features'):
+        removed = NHANESFeatureStore(cache_dirs['features']).clear()
+        print(f"Cleared {removed} feature store entries")
+    
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the argument parser of the ``synthh`` command.
+    
+    Returns:
+        Configured argument parser.
+    """
+    parser = argparse.ArgumentParser(
+        prog='synthh',
+        description='Synthetic hearing health data preprocessing, generation and evaluation.'
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    # preprocess
+    preprocess = subparsers.add_parser('preprocess', help='run the NHANES preprocessing pipeline')
+    preprocess.add_argument('data_dir', type=Path, help='NHANES data directory')
+    preprocess.add_argument('-o', '--output-dir', type=Path, default=None, help='export directory')
+    preprocess.add_argument('--cohorts', nargs='+', default=None, help='cohort suffixes to load')
+    preprocess.add_argument(
+        '--missing-strategy', default='listwise', choices=['listwise', 'partial', 'impute']
+    )
+    preprocess.add_argument(
+        '--hearing-loss-method', default='any_frequency',
+        choices=['any_frequency', 'pta_average', 'high_frequency']
+    )
+    preprocess.add_argument('--formats', nargs='+', default=['csv', 'parquet'], choices=['csv', 'parquet'])
+    preprocess.add_argument('--async-export', action='store_true', help='overlap export with feature engineering')
+    preprocess.add_argument('--no-export', action='store_true', help='skip writing output files')
+    preprocess.add_argument('--streaming', action='store_true', help='process row blocks end to end in bounded memory')
+    preprocess.add_argument('--memory-budget-mb', type=float, default=256, help='streaming memory budget per block')
+    preprocess.add_argument('--block-rows', type=int, default=None, help='fixed streaming block size')
+    preprocess.add_argument('--profile-output', type=Path, default=None, help='CSV file for the profile')
+    _add_common_options(preprocess)
+    preprocess.set_defaults(func=cmd_preprocess)
+    
+    # generate
+    generate = subparsers.add_parser('generate', help='sample synthetic audiograms from a pickled model')
+    generate.add_argument(
+        'model', type=Path,
+        help='pickled density model whose sample(n) returns samples or (samples, labels), '
+             'e.g. a scikit-learn KernelDensity or GaussianMixture'
+    )
+    generate.add_argument('-n', '--n-samples', type=int, default=1000)
+    generate.add_argument('-o', '--output', type=Path, required=True, help='CSV or Parquet output file')
+    generate.add_argument('--seed', type=int, default=26)
+    generate.add_argument('--step', type=float, default=5, help='threshold grid step in dB (default: 5)')
+    generate.set_defaults(func=cmd_generate)
+    
+    # evaluate
+    evaluate = subparsers.add_parser('evaluate', help='evaluate synthetic audiograms')
+    evaluate.add_argument('synthetic', type=Path, help='CSV or Parquet file of synthetic audiograms')
+    evaluate.add_argument('-r', '--reference', type=Path, default=None, help='real data to compare against')
+    evaluate.add_argument('-o', '--output', type=Path, default=None, help='JSON report file')
+    evaluate.set_defaults(func=cmd_evaluate)
+    
+    # bench
+    bench = subparsers.add_parser('bench', help='run benchmarks')
+    bench_targets = bench.add_subparsers(dest='target', required=True)
+    
+    bench_pipeline = bench_targets.add_parser('pipeline', help='time the preprocessing stages')
+    bench_pipeline.add_argument('data_dir', type=Path, help='NHANES data directory')
+    bench_pipeline.add_argument('--cohorts', nargs='+', default=None, help='cohort suffixes to load')
+    bench_pipeline.add_argument('--repeat', type=int, default=1)
+    bench_pipeline.add_argument('--export', action='store_true', help='include the export stage')
+    bench_pipeline.add_argument('--output-dir', type=Path, default=None, help='export directory')
+    bench_pipeline.add_argument('-o', '--output', type=Path, default=None, help='CSV file for the results')
+    _add_common_options(bench_pipeline)
+    bench_pipeline.set_defaults(func=cmd_bench_pipeline)
+    
+    bench_import = bench_targets.add_parser('import', help='time package imports in fresh interpreters')
+    bench_import.add_argument(
+        'modules', nargs='*', default=['synthh', 'synthh.cli', 'synthh.data_loader'],
+        help='modules to import (default: synthh, synthh.cli, synthh.data_loader)'
+    )
+    bench_import.add_argument('--repeat', type=int, default=5)
+    bench_import.add_argument(
+        '--max-seconds', type=float, default=None,
+        help='exit with status 1 if a median import time exceeds this'
+    )
+    bench_import.add_argument('-o', '--output', type=Path, default=None, help='JSON file for the results')
+    bench_import.set_defaults(func=cmd_bench_import)
+    
+    # cache
+    cache = subparsers.add_parser('cache', help='inspect or clear the on-disk caches')
+    cache_actions = cache.add_subparsers(dest='action', required=True)
+    
+    cache_info = cache_actions.add_parser('info', help='show cache contents')
+    cache_info.add_argument('--cache-dir', type=Path, required=True)
+    cache_info.set_defaults(func=cmd_cache_info)
+    
+    cache_clear = cache_actions.add_parser('clear', help='remove cache entries')
+    cache_clear.add_argument('--cache-dir', type=Path, required=True)
+    cache_clear.add_argument('--target', default='all', choices=['all', 'checkpoints', 'features'])
+    cache_clear.add_argument('--stage', default=None, help='only clear checkpoints of this stage')
+    cache_clear.set_defaults(func=cmd_cache_clear)
+    
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the ``synthh`` command.
+    
+    Args:
+        argv: Command-line arguments. Defaults to sys.argv[1:].
+    
+    Returns:
+        Process exit code.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    
+    start = time.perf_counter()
+    try:
+        exit_code = args.func(args)
+    except (FileNotFoundError, ValueError, RuntimeError) as e:
+        print(f"synthh: error: {e}", file=sys.stderr)
+        return 1
+    
+    if getattr(args, 'profile', False):
+        print(f"Total time: {time.perf_counter() - start:.2f}s", file=sys.stderr)
+    
+    return exit_code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+NHANES Curve Cache Module
+
+This module provides a thread-safe, size-bounded LRU cache for the
+per-participant results of the tympanometry and acoustic reflex loaders
+(extracted curve frames and computed parameters), keyed by modality, data
+source, SEQN and ear. A single shared cache is used by default by the
+loaders and the tympanometry visualizer, so paging back and forth between
+participants in an interactive tool is a dictionary lookup.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+def _estimate_nbytes(value: Any) -> int:
+    """Estimate the memory used by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_estimate_nbytes(item) for item in value.values())
+    return sys.getsizeof(value)
+
+
+class CurveCache:
+    """
+    A thread-safe LRU cache of per-participant curves and parameters.
+    
+    Entries are evicted least recently used first once the cache holds more
+    than max_entries entries or (if set) more than max_bytes of values.
+    Cached values are shared; callers that hand them out should return
+    copies of mutable values.
+    """
+    
+    def __init__(self, max_entries: int = 4096, max_bytes: Optional[int] = None):
+        """
+        Initialize an empty cache.
+        
+        Args:
+            max_entries: Maximum number of entries.
+            max_bytes: Optional maximum estimated size of all values in bytes.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._nbytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        """Number of cached entries."""
+        return len(self._entries)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        """Whether a key is cached (does not count as a hit or a use)."""
+        return key in self._entries
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+        
+        Args:
+            key: Cache key.
+            default: Value returned if the key is not cached.
+        
+        Returns:
+            Cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key: Hashable, value: Any) -> None:
+        """
+        Cache a value, evicting least recently used entries if needed.
+        
+        Args:
+            key: Cache key.
+            value: Value to cache.
+        """
+        nbytes = _estimate_nbytes(value)
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._nbytes -= previous[1]
+            
+            self._entries[key] = (value, nbytes)
+            self._nbytes += nbytes
+            
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._nbytes > self.max_bytes)
+            ):
+                _, (_, evicted_nbytes) = self._entries.popitem(last=False)
+                self._nbytes -= evicted_nbytes
+                self.evictions += 1
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Get a cached value, computing and caching it on a miss.
+        
+        The value is computed outside the lock, so concurrent misses on the
+        same key may compute it more than once; the last result is kept.
+        
+        Args:
+            key: Cache key.
+            compute: Callable that computes the value.
+        
+        Returns:
+            Cached or computed value.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is missing:
+            value = compute()
+            self.put(key, value)
+        return value
+    
+    def clear(self) -> None:
+        """Drop all cached entries (the counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._nbytes = 0
+    
+    def info(self) -> Dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, estimated cached bytes, hits, misses,
+            evictions and hit rate.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'nbytes': self._nbytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else np.nan
+            }
+
+
+_shared_cache = CurveCache()
+
+
+def get_curve_cache() -> CurveCache:
+    """
+    Get the curve cache shared by the loaders and visualizers.
+    
+    Returns:
+        Shared CurveCache instance.
+    """
+    return _shared_cache
@@ -0,0 +1,393 @@
+"""
+NHANES Curve Similarity Index Module
+
+This module provides a nearest-neighbour index over measurement curves
+(e.g. the 84-point tympanograms of every ear). Curves are projected onto
+their leading principal components, and queries are answered exactly in
+that low-dimensional space, either with a KD-tree or by a blocked search
+in which distances between a block of queries and a block of indexed
+curves are computed as one matrix product and a running top-k is kept.
+The index can be saved as a single .npz file, for clinical review (most
+similar real curves) and for checking that synthetic curves are not
+near-copies of real ones.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache_utils import set_default_permissions
+
+
+def _fill_missing(curves: np.ndarray, x_values: np.ndarray, min_valid: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fill missing points by linear interpolation along each curve.
+    
+    Args:
+        curves: Array of shape (n_curves, n_points).
+        x_values: Measurement points of the curves.
+        min_valid: Minimum number of valid points for a curve to be usable.
+    
+    Returns:
+        Tuple of (filled float64 curves, boolean mask of usable curves).
+        Unusable curves are left as NaN.
+    """
+    curves = np.array(curves, dtype=np.float64)
+    valid = ~np.isnan(curves)
+    usable = valid.sum(axis=1) >= min_valid
+    
+    for row in np.flatnonzero(usable & ~valid.all(axis=1)):
+        mask = valid[row]
+        curves[row] = np.interp(x_values, x_values[mask], curves[row, mask])
+    
+    return curves, usable
+
+
+class CurveSimilarityIndex:
+    """
+    A PCA-reduced exact nearest-neighbour index of curves.
+    
+    Distances are Euclidean distances between the projections of centred
+    curves onto the leading principal components, in the units of the
+    curves (e.g. ml), so they approximate the distance between full curves
+    up to the variance the discarded components explain.
+    """
+    
+    def __init__(
+        self,
+        mean: np.ndarray,
+        components: np.ndarray,
+        explained_variance: np.ndarray,
+        total_variance: float,
+        embeddings: np.ndarray,
+        seqns: np.ndarray,
+        ears: np.ndarray,
+        x_values: np.ndarray
+    ):
+        """
+        Initialize the index (see fit() to build one from curves).
+        
+        Args:
+            mean: Mean curve, shape (n_points,).
+            components: Principal axes, shape (n_components, n_points).
+            explained_variance: Variance along each component.
+            total_variance: Total variance of the indexed curves.
+            embeddings: Projections of the indexed curves, shape (n_curves, n_components).
+            seqns: SEQN of each indexed curve.
+            ears: Ear label of each indexed curve.
+            x_values: Measurement points of the curves.
+        """
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.components = np.asarray(components, dtype=np.float64)
+        self.explained_variance = np.asarray(explained_variance, dtype=np.float64)
+        self.total_variance = float(total_variance)
+        self.embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        self.seqns = np.asarray(seqns, dtype=np.float64)
+        self.ears = np.asarray(ears).astype(str)
+        self.x_values = np.asarray(x_values, dtype=np.float64)
+        
+        # Squared norms of the indexed embeddings, reused by every blocked query
+        self._norms = np.einsum('ij,ij->i', self.embeddings, self.embeddings, dtype=np.float64)
+        self._tree = None
+    
+    @classmethod
+    def fit(
+        cls,
+        curves: np.ndarray,
+        seqns: Sequence[float],
+        ears: Sequence[str],
+        x_values: np.ndarray,
+        n_components: int = 10,
+        min_valid: int = 42
+    ) -> 'CurveSimilarityIndex':
+        """
+        Build an index from a curve matrix.
+        
+        Missing points are filled by linear interpolation; curves with fewer
+        than min_valid valid points are not indexed.
+        
+        Args:
+            curves: Array of shape (n_curves, n_points).
+            seqns: SEQN of each curve.
+            ears: Ear label of each curve.
+            x_values: Measurement points of the curves.
+            n_components: Number of principal components to keep.
+            min_valid: Minimum number of valid points for a curve to be indexed.
+        
+        Returns:
+            CurveSimilarityIndex instance.
+        
+        Raises:
+            ValueError: If the shapes do not match or too few curves are usable.
+        """
+        curves = np.atleast_2d(curves)
+        x_values = np.asarray(x_values, dtype=np.float64)
+        if curves.shape[1] != len(x_values) or len(seqns) != len(curves) or len(ears) != len(curves):
+            raise ValueError(
+                f"Curves of shape {curves.shape} do not match {len(x_values)} points, "
+                f"{len(seqns)} SEQNs and {len(ears)} ear labels"
+            )
+        
+        filled, usable = _fill_missing(curves, x_values, min_valid)
+        filled = filled[usable]
+        if len(filled) <= n_components:
+            raise ValueError(f"Only {len(filled)} usable curves for {n_components} components")
+        
+        # PCA from the eigendecomposition of the (n_points x n_points) covariance
+        mean = filled.mean(axis=0)
+        centred = filled - mean
+        covariance = centred.T @ centred / (len(filled) - 1)
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+        order = np.argsort(eigenvalues)[::-1][:n_components]
+        components = eigenvectors[:, order].T
+        
+        # Fix the sign of each axis so saved indexes are reproducible
+        signs = np.sign(components[np.arange(n_components), np.abs(components).argmax(axis=1)])
+        components *= signs[:, None]
+        
+        return cls(
+            mean,
+            components,
+            np.maximum(eigenvalues[order], 0.0),
+            np.trace(covariance),
+            centred @ components.T,
+            np.asarray(seqns, dtype=np.float64)[usable],
+            np.asarray(ears)[usable],
+            x_values
+        )
+    
+    def __len__(self) -> int:
+        """Number of indexed curves."""
+        return len(self.embeddings)
+    
+    @property
+    def n_components(self) -> int:
+        """Number of principal components."""
+        return len(self.components)
+    
+    @property
+    def explained_variance_ratio(self) -> np.ndarray:
+        """Fraction of the curve variance explained by each component."""
+        return self.explained_variance / self.total_variance
+    
+    def transform(self, curves: np.ndarray, min_valid: int = 1) -> np.ndarray:
+        """
+        Project curves onto the principal components.
+        
+        Args:
+            curves: Array of shape (n_curves, n_points).
+            min_valid: Minimum number of valid points; other curves project to NaN.
+        
+        Returns:
+            Array of shape (n_curves, n_components).
+        """
+        filled, usable = _fill_missing(np.atleast_2d(curves), self.x_values, min_valid)
+        embeddings = (filled - self.mean) @ self.components.T
+        embeddings[~usable] = np.nan
+        return embeddings
+    
+    def query(
+        self,
+        curves: np.ndarray,
+        k: int = 5,
+        method: str = 'kdtree',
+        block_rows: int = 1024
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest indexed curves of every query curve.
+        
+        Args:
+            curves: Query curves of shape (n_queries, n_points).
+            k: Number of neighbours.
+            method: 'kdtree' (a KD-tree over the embeddings, built on first
+                   use) or 'blocked' (blocked brute-force search). Both are exact.
+            block_rows: Queries per block.
+        
+        Returns:
+            Tuple of (distances, indices), each of shape (n_queries, k) and
+            sorted by distance. Queries that cannot be projected (too few
+            valid points) get NaN distances and index -1.
+        """
+        embeddings = self.transform(curves)
+        return self.query_embeddings(embeddings, k, method, block_rows)
+    
+    def query_embeddings(
+        self,
+        embeddings: np.ndarray,
+        k: int = 5,
+        method: str = 'kdtree',
+        block_rows: int = 1024
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k nearest indexed curves of projected queries.
+        
+        Args:
+            embeddings: Query projections of shape (n_queries, n_components).
+            k: Number of neighbours.
+            method: 'kdtree' or 'blocked' (see query()).
+            block_rows: Queries per block.
+        
+        Returns:
+            Tuple of (distances, indices) as in query().
+        
+        Raises:
+            ValueError: If the method is unknown.
+        """
+        if method not in ('kdtree', 'blocked'):
+            raise ValueError(f"Unknown method '{method}'. Use ['kdtree', 'blocked']")
+        
+        embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float64))
+        k = min(k, len(self))
+        n_queries = len(embeddings)
+        
+        distances = np.full((n_queries, k), np.nan)
+        indices = np.full((n_queries, k), -1, dtype=np.int64)
+        usable = np.flatnonzero(~np.isnan(embeddings).any(axis=1))
+        
+        for start in range(0, len(usable), block_rows):
+            rows = usable[start:start + block_rows]
+            if method == 'kdtree':
+                block_distances, block_indices = self._get_tree().query(embeddings[rows], k=k)
+                distances[rows] = block_distances.reshape(len(rows), k)
+                indices[rows] = block_indices.reshape(len(rows), k)
+            else:
+                distances[rows], indices[rows] = self._query_blocked(embeddings[rows], k)
+        
+        return distances, indices
+    
+    def _get_tree(self):
+        """Get the KD-tree over the indexed embeddings, building it on first use."""
+        if self._tree is None:
+            from scipy.spatial import cKDTree  # Deferred: scipy.spatial is slow to import
+            self._tree = cKDTree(self.embeddings.astype(np.float64))
+        return self._tree
+    
+    def _query_blocked(
+        self,
+        queries: np.ndarray,
+        k: int,
+        index_block_rows: int = 32768
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact k nearest neighbours of a block of queries by blocked brute force."""
+        query_norms = np.einsum('ij,ij->i', queries, queries)
+        best_distances = np.full((len(queries), 0), np.inf)
+        best_indices = np.empty((len(queries), 0), dtype=np.int64)
+        
+        for index_start in range(0, len(self), index_block_rows):
+            index_stop = min(index_start + index_block_rows, len(self))
+            
+            # Squared distances via |q|^2 - 2 q.e + |e|^2 for the whole block
+            block = self.embeddings[index_start:index_stop].astype(np.float64)
+            squared = (
+                query_norms[:, None]
+                - 2 * queries @ block.T
+                + self._norms[None, index_start:index_stop]
+            )
+            
+            # Top-k of the block, merged into the running top-k
+            block_k = min(k, index_stop - index_start)
+            block_best = np.argpartition(squared, block_k - 1, axis=1)[:, :block_k]
+            candidates = np.concatenate([best_distances, np.take_along_axis(squared, block_best, axis=1)], axis=1)
+            candidate_indices = np.concatenate([best_indices, block_best + index_start], axis=1)
+            keep = np.argpartition(candidates, k - 1, axis=1)[:, :k]
+            best_distances = np.take_along_axis(candidates, keep, axis=1)
+            best_indices = np.take_along_axis(candidate_indices, keep, axis=1)
+        
+        order = np.argsort(best_distances, axis=1, kind='stable')
+        distances = np.sqrt(np.maximum(np.take_along_axis(best_distances, order, axis=1), 0.0))
+        return distances, np.take_along_axis(best_indices, order, axis=1)
+    
+    def query_frame(
+        self,
+        curves: np.ndarray,
+        k: int = 5,
+        query_ids: Optional[Sequence] = None
+    ) -> pd.DataFrame:
+        """
+        Find nearest neighbours and describe them in long format.
+        
+        Args:
+            curves: Query curves of shape (n_queries, n_points).
+            k: Number of neighbours.
+            query_ids: Optional identifier of each query. Defaults to 0..n-1.
+        
+        Returns:
+            DataFrame with one row per query and neighbour: query, rank (1 =
+            nearest), SEQN, Ear and distance. Queries that cannot be
+            projected are omitted.
+        """
+        distances, indices = self.query(curves, k)
+        query_ids = np.arange(len(distances)) if query_ids is None else np.asarray(query_ids)
+        
+        found = indices >= 0
+        neighbour_indices = indices[found]
+        return pd.DataFrame({
+            'query': np.repeat(query_ids, found.sum(axis=1)),
+            'rank': np.tile(np.arange(1, indices.shape[1] + 1), len(indices))[found.reshape(-1)],
+            'SEQN': self.seqns[neighbour_indices],
+            'Ear': self.ears[neighbour_indices],
+            'distance': distances[found]
+        })
+    
+    def save(self, filepath: Union[str, Path]) -> Path:
+        """
+        Save the index as a .npz file (written atomically).
+        
+        Args:
+            filepath: Destination file.
+        
+        Returns:
+            Path of the written file.
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f,
+                    mean=self.mean,
+                    components=self.components,
+                    explained_variance=self.explained_variance,
+                    total_variance=self.total_variance,
+                    embeddings=self.embeddings,
+                    seqns=self.seqns,
+                    ears=self.ears,
+                    x_values=self.x_values
+                )
+            set_default_permissions(tmp_path)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        return filepath
+    
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'CurveSimilarityIndex':
+        """
+        Load an index saved with save().
+        
+        Args:
+            filepath: Path of the .npz file.
+        
+        Returns:
+            CurveSimilarityIndex instance.
+        """
+        with np.load(filepath, allow_pickle=False) as data:
+            return cls(
+                data['mean'],
+                data['components'],
+                data['explained_variance'],
+                float(data['total_variance']),
+                data['embeddings'],
+                data['seqns'],
+                data['ears'],
+                data['x_values']
+            )
@@ -0,0 +1,489 @@
+"""
+NHANES Curve Store Module
+
+This module packs the per-participant measurement curves of the NHANES
+tympanometry and acoustic reflex files (84 points per ear) into a single
+contiguous (participants, ears, points) float32 array with a SEQN -> row
+index, so that single curves are found in O(1) and batches of curves are
+gathered with one vectorised indexing operation instead of a DataFrame scan
+per participant.
+
+A store can be saved as a directory of .npy arrays (curves as float32 or
+as int16 quantised without loss of the NHANES precision, plus the SEQN
+index) and a JSON metadata file, and memory-mapped back, so that loading a
+cohort does not parse the wide CSV again.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache_utils import hash_file, write_directory_atomic
+
+# Bump when the on-disk layout changes so saved stores are rebuilt
+CURVE_STORE_FORMAT_VERSION = 1
+
+# Missing-value code of quantised (int16) curves
+INT16_MISSING = np.iinfo(np.int16).min
+
+_store_tokens = itertools.count()
+
+
+class CurveStore:
+    """
+    A SEQN-indexed store of measurement curves.
+    
+    Row i of the curve array holds the curves of participant seqns[i], with
+    one curve per ear in the order of `ears`. If a SEQN occurs more than once
+    in the source data, the first occurrence is indexed (as a scan of the
+    frame would find it).
+    """
+    
+    def __init__(
+        self,
+        seqns: np.ndarray,
+        curves: np.ndarray,
+        x_values: np.ndarray,
+        ears: Sequence[str] = ('Right', 'Left'),
+        x_name: str = 'Pressure_daPa',
+        y_name: str = 'Compliance_ml',
+        scale: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the curve store.
+        
+        Args:
+            seqns: Participant sequence numbers, one per row of curves.
+            curves: Array of shape (n_participants, n_ears, n_points). May be
+                   a read-only memory map.
+            x_values: Measurement points (e.g. pressures) shared by all curves.
+            ears: Ear (or channel) labels in the order of the second axis of curves.
+            x_name: Column name of the measurement points in long frames.
+            y_name: Column name of the curve values in long frames.
+            scale: If given, curves are int16 codes of value / scale, with
+                  INT16_MISSING for missing values; they are decoded to
+                  float32 when accessed.
+            metadata: Optional descriptive metadata (e.g. cohort, source file).
+            
+        Raises:
+            ValueError: If the array shapes or dtypes do not match.
+        """
+        if scale is None:
+            curves = np.ascontiguousarray(curves, dtype=np.float32)
+        else:
+            curves = np.ascontiguousarray(curves)
+            if curves.dtype != np.int16:
+                raise ValueError(f"Quantised curves must be int16, got {curves.dtype}")
+        
+        if curves.ndim != 3 or curves.shape[0] != len(seqns) or curves.shape[1] != len(ears):
+            raise ValueError(
+                f"Curves of shape {curves.shape} do not match "
+                f"{len(seqns)} participants and {len(ears)} ears"
+            )
+        if curves.shape[2] != len(x_values):
+            raise ValueError(f"Curves have {curves.shape[2]} points but {len(x_values)} x values were given")
+        
+        self.seqns = np.asarray(seqns, dtype=np.float64)
+        self.curves = curves
+        self.x_values = np.asarray(x_values)
+        self.ears = list(ears)
+        self.x_name = x_name
+        self.y_name = y_name
+        self.scale = scale
+        self.metadata = dict(metadata or {})
+        
+        # Identifies this store's data in shared caches (e.g. CurveCache keys)
+        self.token = next(_store_tokens)
+        
+        # SEQN -> row of its first occurrence (missing SEQNs are not indexed)
+        valid_rows = np.flatnonzero(~np.isnan(self.seqns))
+        unique_seqns, first = np.unique(self.seqns[valid_rows], return_index=True)
+        self.index = pd.Index(unique_seqns)
+        self.rows = valid_rows[first]
+        self._row_lookup = dict(zip(unique_seqns.tolist(), self.rows.tolist()))
+    
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        ear_columns: Dict[str, List[str]],
+        x_values: np.ndarray,
+        x_name: str = 'Pressure_daPa',
+        y_name: str = 'Compliance_ml'
+    ) -> 'CurveStore':
+        """
+        Build a store from a wide NHANES frame.
+        
+        Args:
+            df: DataFrame with a SEQN column and one column per curve point.
+            ear_columns: Mapping of ear label to its point columns, in order.
+                        Columns missing from the frame are filled with NaN.
+            x_values: Measurement points shared by all curves.
+            x_name: Column name of the measurement points in long frames.
+            y_name: Column name of the curve values in long frames.
+        
+        Returns:
+            CurveStore instance.
+        """
+        n_points = len(x_values)
+        curves = np.full((len(df), len(ear_columns), n_points), np.nan, dtype=np.float32)
+        
+        for ear_idx, columns in enumerate(ear_columns.values()):
+            for point_idx, col in enumerate(columns):
+                if col in df.columns:
+                    curves[:, ear_idx, point_idx] = pd.to_numeric(df[col], errors='coerce').to_numpy(
+                        dtype=np.float32, na_value=np.nan
+                    )
+        
+        return cls(df['SEQN'].to_numpy(dtype=np.float64), curves, x_values, list(ear_columns), x_name, y_name)
+    
+    def __len__(self) -> int:
+        """Number of indexed participants."""
+        return len(self.index)
+    
+    def __contains__(self, seqn: Union[int, float]) -> bool:
+        """Whether a participant is in the store."""
+        return seqn in self._row_lookup
+    
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the curve array."""
+        return self.curves.nbytes
+    
+    def _decode(self, curves: np.ndarray) -> np.ndarray:
+        """Convert stored curves to float32 values (a no-op unless quantised)."""
+        if self.scale is None:
+            return curves
+        
+        # Dividing by the inverse step rounds k / 10**d to the nearest float32
+        values = curves.astype(np.float32) / np.float32(round(1 / self.scale, 6))
+        values[curves == INT16_MISSING] = np.nan
+        return values
+    
+    def get_row(self, seqn: Union[int, float]) -> int:
+        """
+        Get the curve array row of a participant.
+        
+        Args:
+            seqn: Participant sequence number.
+        
+        Returns:
+            Row index into the curve array.
+        
+        Raises:
+            ValueError: If participant SEQN is not found in the store.
+        """
+        row = self._row_lookup.get(seqn)
+        if row is None:
+            raise ValueError(f"Participant SEQN {seqn} not found in dataset")
+        return row
+    
+    def get(self, seqn: Union[int, float], ear: Optional[str] = None) -> np.ndarray:
+        """
+        Get the curves of a participant in O(1).
+        
+        Args:
+            seqn: Participant sequence number.
+            ear: Optional ear label. If None, curves of all ears are returned.
+        
+        Returns:
+            Read-only array of shape (n_ears, n_points), or (n_points,) for one
+            ear (a view unless the store is quantised).
+        
+        Raises:
+            ValueError: If participant SEQN is not found in the store.
+        """
+        curves = self.curves[self.get_row(seqn)]
+        if ear is not None:
+            curves = curves[self._ear_index(ear)]
+        
+        curves = self._decode(curves).view()
+        curves.flags.writeable = False
+        return curves
+    
+    def _ear_index(self, ear: str) -> int:
+        """Get the position of an ear label (case-insensitive)."""
+        labels = [label.lower() for label in self.ears]
+        if ear.lower() not in labels:
+            raise ValueError(f"Ear {ear} not available. Use {self.ears}")
+        return labels.index(ear.lower())
+    
+    def lookup(
+        self,
+        seqns: Sequence[Union[int, float]],
+        missing: str = 'skip'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows of many participants at once.
+        
+        Args:
+            seqns: Participant sequence numbers.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            Tuple of (found SEQNs, rows), in the order of seqns.
+        
+        Raises:
+            ValueError: If missing='raise' and a participant is not found.
+        """
+        seqns = np.asarray(seqns, dtype=np.float64)
+        positions = self.index.get_indexer(seqns)
+        found = positions >= 0
+        
+        if missing == 'raise' and not found.all():
+            raise ValueError(f"Participant SEQN {seqns[~found][0]} not found in dataset")
+        
+        return seqns[found], self.rows[positions[found]]
+    
+    def gather(
+        self,
+        seqns: Optional[Sequence[Union[int, float]]] = None,
+        ear: Optional[str] = None,
+        missing: str = 'skip'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the curves of many participants in one indexing operation.
+        
+        Args:
+            seqns: Participant sequence numbers. If None, all indexed participants.
+            ear: Optional ear label. If None, curves of all ears are returned.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            Tuple of (found SEQNs, curve array of shape (n_found, n_ears, n_points)
+            or (n_found, n_points) for one ear).
+        """
+        if seqns is None:
+            found_seqns, rows = self.index.to_numpy(), self.rows
+        else:
+            found_seqns, rows = self.lookup(seqns, missing)
+        
+        if ear is not None:
+            return found_seqns, self._decode(self.curves[rows, self._ear_index(ear)])
+        return found_seqns, self._decode(self.curves[rows])
+    
+    def to_long(
+        self,
+        seqns: Optional[Sequence[Union[int, float]]] = None,
+        ears: Optional[List[str]] = None,
+        missing: str = 'skip'
+    ) -> pd.DataFrame:
+        """
+        Gather curves into a long-format frame.
+        
+        Rows are ordered by participant (in the order of seqns), then ear, then
+        measurement point.
+        
+        Args:
+            seqns: Participant sequence numbers. If None, all indexed participants.
+            ears: Optional ear labels to include. If None, all ears.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            Long-format DataFrame with columns SEQN, x_name, y_name and Ear.
+        """
+        found_seqns, curves = self.gather(seqns, missing=missing)
+        
+        ear_positions = [self._ear_index(ear) for ear in ears] if ears is not None else range(len(self.ears))
+        ear_labels = [self.ears[i] for i in ear_positions]
+        curves = curves[:, list(ear_positions)]
+        
+        n_found, n_ears, n_points = curves.shape
+        return pd.DataFrame({
+            'SEQN': np.repeat(found_seqns, n_ears * n_points),
+            self.x_name: np.tile(self.x_values, n_found * n_ears),
+            self.y_name: curves.reshape(-1),
+            'Ear': np.tile(np.repeat(ear_labels, n_points), n_found)
+        })
+    
+    def save(
+        self,
+        path: Union[str, Path],
+        dtype: str = 'float32',
+        scale: Optional[float] = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Path:
+        """
+        Save the store as a directory that can be memory-mapped with load().
+        
+        The directory holds curves.npy (all rows, including duplicate SEQNs),
+        seqns.npy and metadata.json, and is replaced atomically.
+        
+        Args:
+            path: Destination directory.
+            dtype: 'float32', or 'int16' to quantise the curves.
+            scale: Quantisation step for 'int16'. If None, the coarsest power
+                  of ten that represents every value exactly is used.
+            metadata: Optional descriptive metadata, merged into the store's.
+            
+        Returns:
+            Path of the saved directory.
+            
+        Raises:
+            ValueError: If the dtype is unknown or the values cannot be quantised.
+        """
+        if dtype not in ('float32', 'int16'):
+            raise ValueError(f"Unknown dtype '{dtype}'. Use ['float32', 'int16']")
+        
+        if dtype == 'int16':
+            if self.scale is not None and scale in (None, self.scale):
+                scale, curves = self.scale, self.curves
+            else:
+                values = self._decode(self.curves)
+                scale = scale if scale is not None else _quantisation_scale(values)
+                curves = _quantise(values, scale)
+        else:
+            scale, curves = None, self._decode(self.curves)
+        
+        info = {
+            'format_version': CURVE_STORE_FORMAT_VERSION,
+            'dtype': dtype,
+            'scale': scale,
+            'shape': list(curves.shape),
+            'ears': self.ears,
+            'x_name': self.x_name,
+            'x_values': self.x_values.tolist(),
+            'y_name': self.y_name,
+            'metadata': {**self.metadata, **(metadata or {})}
+        }
+        
+        def write(directory: Path) -> None:
+            np.save(directory / 'curves.npy', curves)
+            np.save(directory / 'seqns.npy', self.seqns)
+            with open(directory / 'metadata.json', 'w') as f:
+                json.dump(info, f, indent=2, default=str)
+        
+        return write_directory_atomic(write, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'CurveStore':
+        """
+        Load a store saved with save().
+        
+        Args:
+            path: Directory of the saved store.
+            mmap: Memory-map the curve array (read-only) instead of reading it.
+            
+        Returns:
+            CurveStore instance.
+            
+        Raises:
+            FileNotFoundError: If the directory does not hold a saved store.
+            ValueError: If the store was saved in an unsupported format.
+        """
+        path = Path(path)
+        info = read_curve_store_metadata(path)
+        if info is None:
+            raise FileNotFoundError(f"Curve store not found: {path}")
+        if info.get('format_version') != CURVE_STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Curve store {path} has format version {info.get('format_version')}, "
+                f"expected {CURVE_STORE_FORMAT_VERSION}"
+            )
+        
+        curves = np.load(path / 'curves.npy', mmap_mode='r' if mmap else None)
+        seqns = np.load(path / 'seqns.npy')
+        
+        return cls(
+            seqns, curves, np.asarray(info['x_values']), info['ears'],
+            info['x_name'], info['y_name'], scale=info['scale'], metadata=info['metadata']
+        )
+
+
+def read_curve_store_metadata(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """
+    Read the metadata of a saved store.
+    
+    Args:
+        path: Directory of the saved store.
+        
+    Returns:
+        Metadata dictionary, or None if the directory does not hold a store.
+    """
+    metadata_path = Path(path) / 'metadata.json'
+    if not metadata_path.exists():
+        return None
+    
+    with open(metadata_path, 'r') as f:
+        return json.load(f)
+
+
+def load_or_build_curve_store(
+    path: Union[str, Path],
+    source_file: Union[str, Path],
+    build: Callable[[], CurveStore],
+    dtype: str = 'float32',
+    mmap: bool = True,
+    refresh: bool = False,
+    metadata: Optional[Dict[str, Any]] = None
+) -> CurveStore:
+    """
+    Load a saved store of a source file, building and saving it only once.
+    
+    The saved store is reused as long as the source file hash, the dtype
+    and the format version match, and rebuilt otherwise.
+    
+    Args:
+        path: Directory of the saved store.
+        source_file: Source file the store is built from.
+        build: Callable that builds the store from the source file.
+        dtype: 'float32' or 'int16' (see CurveStore.save()).
+        mmap: Memory-map the curve array.
+        refresh: Rebuild the store even if a valid saved store exists.
+        metadata: Optional descriptive metadata saved with the store.
+        
+    Returns:
+        CurveStore instance.
+    """
+    key = {
+        'source_hash': hash_file(source_file),
+        'dtype': dtype,
+        'format_version': CURVE_STORE_FORMAT_VERSION
+    }
+    
+    info = None if refresh else read_curve_store_metadata(path)
+    if info is None or info.get('metadata', {}).get('key') != key:
+        build().save(path, dtype=dtype, metadata={
+            **(metadata or {}),
+            'key': key,
+            'source_file': str(source_file)
+        })
+    
+    return CurveStore.load(path, mmap=mmap)
+
+
+def _quantisation_scale(values: np.ndarray, max_decimals: int = 6) -> float:
+    """
+    Find the coarsest power-of-ten step that represents every value in int16.
+    
+    Raises:
+        ValueError: If no step up to 10**-max_decimals is exact within the int16 range.
+    """
+    finite = values[~np.isnan(values)].astype(np.float64)
+    
+    for decimals in range(max_decimals + 1):
+        scaled = finite * 10 ** decimals
+        if np.abs(scaled).max(initial=0) >= -INT16_MISSING:
+            break
+        # Values are float32, so allow for their rounding error
+        if np.all(np.abs(scaled - np.round(scaled)) <= 1e-6 * np.maximum(np.abs(scaled), 1) + 1e-3):
+            return 10.0 ** -decimals
+    
+    raise ValueError("Curves cannot be quantised to int16 without loss; use dtype='float32'")
+
+
+def _quantise(values: np.ndarray, scale: float) -> np.ndarray:
+    """Encode float values as int16 multiples of scale (INT16_MISSING for NaN)."""
+    missing = np.isnan(values)
+    codes = np.round(np.where(missing, 0, values).astype(np.float64) / scale)
+    if np.abs(codes).max(initial=0) >= -INT16_MISSING:
+        raise ValueError(f"Curves exceed the int16 range with scale {scale}")
+    
+    codes = codes.astype(np.int16)
+    codes[missing] = INT16_MISSING
+    return codes
@@ -10,7 +10,6 @@ from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
-from scipy import stats
 
 
 class NHANESDataCleaner:
@@ -111,7 +110,8 @@ class NHANESDataCleaner:
         self,
         df: pd.DataFrame,
         method: str = 'iqr',
-        threshold: float = 1.5
+        threshold: float = 1.5,
+        bounds: Optional[Dict[str, Tuple[float, float]]] = None
     ) -> Dict[str, pd.DataFrame]:
         """
         Detect statistical outliers in hearing threshold data.
@@ -120,6 +120,9 @@ class NHANESDataCleaner:
             df: DataFrame containing hearing threshold data.
             method: Method for outlier detection ('iqr', 'zscore', or 'modified_zscore').
             threshold: Threshold for outlier detection.
+            bounds: Optional precomputed (lower, upper) IQR bounds per column,
+                   e.g. from a pass over a larger dataset. Used instead of
+                   the quartiles of df when method is 'iqr'.
             
         Returns:
             Dictionary containing outlier information for each PTA column.
@@ -132,15 +135,22 @@ class NHANESDataCleaner:
                 data = df[col].dropna()
                 
                 if method == 'iqr':
-                    Q1 = data.quantile(0.25)
-                    Q3 = data.quantile(0.75)
-                    IQR = Q3 - Q1
-                    lower_bound = Q1 - threshold * IQR
-                    upper_bound = Q3 + threshold * IQR
+                    if bounds is not None:
+                        if col not in bounds:
+                            continue
+                        lower_bound, upper_bound = bounds[col]
+                    else:
+                        Q1 = data.quantile(0.25)
+                        Q3 = data.quantile(0.75)
+                        IQR = Q3 - Q1
+                        lower_bound = Q1 - threshold * IQR
+                        upper_bound = Q3 + threshold * IQR
                     
                     outlier_mask = (data < lower_bound) | (data > upper_bound)
                     
                 elif method == 'zscore':
+                    from scipy import stats  # Deferred: scipy.stats is slow to import
+                    
                     z_scores = np.abs(stats.zscore(data))
                     outlier_mask = z_scores > threshold
                     
@@ -152,7 +162,8 @@ class NHANESDataCleaner:
                 
                 if outlier_mask.any():
                     outlier_indices = data[outlier_mask].index
-                    outliers[col] = df.loc[outlier_indices, ['SEQN', col]].copy()
+                    id_columns = ['SEQN'] if 'SEQN' in df.columns else []
+                    outliers[col] = df.loc[outlier_indices, id_columns + [col]].copy()
         
         return outliers
     
@@ -240,7 +251,8 @@ class NHANESDataCleaner:
         df: pd.DataFrame,
         strategy: str = 'listwise',
         min_valid_frequencies: int = 3,
-        imputation_method: str = 'median'
+        imputation_method: str = 'median',
+        fill_values: Optional[Dict[str, float]] = None
     ) -> pd.DataFrame:
         """
         Handle missing values in the dataset.
@@ -254,6 +266,9 @@ class NHANESDataCleaner:
                      'partial' - require minimum number of valid frequencies
             min_valid_frequencies: Minimum valid frequencies required (for 'partial').
             imputation_method: Method for imputation ('median', 'mean', 'forward_fill').
+            fill_values: Optional precomputed imputation value per column (for
+                        'impute'), e.g. medians of the full dataset when the
+                        data is processed in blocks. Overrides imputation_method.
             
         Returns:
             DataFrame with missing values handled according to strategy.
@@ -273,7 +288,10 @@ class NHANESDataCleaner:
         elif strategy == 'impute':
             for col in pta_columns:
                 if col in df_clean.columns:
-                    if imputation_method == 'median':
+                    if fill_values is not None:
+                        if col in fill_values:
+                            df_clean[col] = df_clean[col].fillna(fill_values[col])
+                    elif imputation_method == 'median':
                         df_clean[col] = df_clean[col].fillna(df_clean[col].median())
                     elif imputation_method == 'mean':
                         df_clean[col] = df_clean[col].fillna(df_clean[col].mean())
@@ -317,8 +335,10 @@ class NHANESDataCleaner:
                         'cases': implausible
                     })
         
-        # Check for unusual audiometric configurations
-        for idx, row in df.iterrows():
+        # Check for unusual audiometric configurations (requires both full audiograms)
+        required_columns = [f'{freq} {ear}' for ear in ['Right', 'Left'] for freq in frequencies]
+        rows = df.iterrows() if all(col in df.columns for col in required_columns) else []
+        for idx, row in rows:
             if pd.notna(row[pta_columns]).all():
                 # Check for "corner audiogram" - sudden drop at high frequencies
                 right_thresholds = [
@@ -377,7 +397,8 @@ def clean_nhanes_data(
     missing_strategy: str = 'listwise',
     round_thresholds: bool = True,
     handle_outliers: str = 'clip',
-    validate_patterns: bool = True
+    validate_patterns: bool = True,
+    fill_values: Optional[Dict[str, float]] = None
 ) -> Tuple[pd.DataFrame, Dict]:
     """
     Convenience function to clean NHANES data with standard parameters.
@@ -388,6 +409,8 @@ def clean_nhanes_data(
         round_thresholds: Whether to round thresholds to nearest 5 dB.
         handle_outliers: How to handle outliers ('clip', 'remove', or 'keep').
         validate_patterns: Whether to validate audiometric patterns.
+        fill_values: Optional precomputed imputation values for the 'impute'
+                    strategy (see NHANESDataCleaner.handle_missing_values).
         
     Returns:
         Tuple of (cleaned_dataframe, quality_report).
@@ -407,7 +430,9 @@ def clean_nhanes_data(
             handle_outliers=handle_outliers
         )
     
-    df_clean = cleaner.handle_missing_values(df_clean, strategy=missing_strategy)
+    df_clean = cleaner.handle_missing_values(
+        df_clean, strategy=missing_strategy, fill_values=fill_values
+    )
     
     # Generate final quality report
     final_report = cleaner.generate_data_quality_report(df_clean)
@@ -8,11 +8,14 @@ acoustic reflex, and tympanometry data.
 
 import os
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+# Column holding the MEC examination survey weight of each participant
+MEC_WEIGHT_COLUMN = 'WTMEC2YR'
+
 
 class NHANESDataLoader:
     """
@@ -46,8 +49,28 @@ class NHANESDataLoader:
         
         self.demo_columns = ['SEQN', 'RIAGENDR', 'RIDAGEYR', 'RIDAGEMN', 'RIDRETH1']
         
+        # MEC exam weights, in order of preference (2017-20 pre-pandemic files use WTMECPRP)
+        self.weight_columns = [MEC_WEIGHT_COLUMN, 'WTMECPRP']
+        
         self.error_codes = [888, 666]  # NHANES error codes to replace with NaN
     
+    def get_cohort_files(self, cohort_suffix: str) -> List[Path]:
+        """
+        Get the raw data file paths for a single cohort.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '1999-2000.csv').
+            
+        Returns:
+            List of (demo, pta, reflex, tymp) file paths.
+        """
+        return [
+            self.data_dir / 'demo' / f'nhanes_demo_{cohort_suffix}',
+            self.data_dir / 'pta' / f'nhanes_aux_{cohort_suffix}',
+            self.data_dir / 'reflex' / f'nhanes_auxr_{cohort_suffix}',
+            self.data_dir / 'tymp' / f'nhanes_auxt_{cohort_suffix}'
+        ]
+    
     def load_cohort_data(self, cohort_suffix: str) -> Tuple[pd.DataFrame, ...]:
         """
         Load NHANES data for a single cohort.
@@ -62,10 +85,11 @@ class NHANESDataLoader:
             FileNotFoundError: If any required data files are not found.
         """
         try:
-            demo_df = pd.read_csv(self.data_dir / 'demo' / f'nhanes_demo_{cohort_suffix}')
-            pta_df = pd.read_csv(self.data_dir / 'pta' / f'nhanes_aux_{cohort_suffix}')
-            auxr_df = pd.read_csv(self.data_dir / 'reflex' / f'nhanes_auxr_{cohort_suffix}')
-            auxt_df = pd.read_csv(self.data_dir / 'tymp' / f'nhanes_auxt_{cohort_suffix}')
+            demo_file, pta_file, auxr_file, auxt_file = self.get_cohort_files(cohort_suffix)
+            demo_df = pd.read_csv(demo_file)
+            pta_df = pd.read_csv(pta_file)
+            auxr_df = pd.read_csv(auxr_file)
+            auxt_df = pd.read_csv(auxt_file)
             
             return demo_df, pta_df, auxr_df, auxt_df
             
@@ -103,11 +127,18 @@ class NHANESDataLoader:
             pta_df: Filtered PTA DataFrame to match patients against.
             
         Returns:
-            Filtered demographic DataFrame.
+            Filtered demographic DataFrame, with the MEC exam weight in the
+            WTMEC2YR column (missing if the file has no exam weights).
         """
         # Select relevant columns
         filtered_df = demo_df[self.demo_columns].copy()
         
+        # Survey weight, under one name for all cohorts
+        weight_source = next((col for col in self.weight_columns if col in demo_df.columns), None)
+        filtered_df[MEC_WEIGHT_COLUMN] = (
+            demo_df[weight_source].astype('float64') if weight_source is not None else np.nan
+        )
+        
         # Match patients in demographic data to patients in PTA data
         filtered_df = filtered_df[filtered_df['SEQN'].isin(pta_df['SEQN'])]
         filtered_df = filtered_df.reset_index(drop=True)
@@ -144,6 +175,71 @@ class NHANESDataLoader:
         
         return cohort_df
     
+    def iter_cohort_blocks(
+        self,
+        cohort_suffix: str,
+        block_rows: int,
+        include_demographics: bool = True
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Load a cohort in row blocks without reading the whole PTA file.
+        
+        Each block matches the corresponding rows of load_and_filter_cohort().
+        Only the selected columns are parsed, and all columns are read as
+        floats so that every block has the same dtypes. Demographic rows are
+        matched against the (error-code filtered) SEQN column of the whole PTA
+        file and paired with PTA rows by position, exactly as in a full load.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '1999-2000.csv').
+            block_rows: Number of PTA rows per block.
+            include_demographics: Whether to join the demographic columns. If
+                                 False, blocks hold the filtered PTA columns only.
+            
+        Yields:
+            Combined cohort DataFrame blocks.
+            
+        Raises:
+            FileNotFoundError: If any required data files are not found.
+        """
+        demo_file, pta_file = self.get_cohort_files(cohort_suffix)[:2]
+        missing_files = [f for f in (demo_file, pta_file) if not f.exists()]
+        if missing_files:
+            raise FileNotFoundError(
+                f"Could not find data for cohort {cohort_suffix}. "
+                f"Please check that data directory contains required files."
+            )
+        
+        cohort = cohort_suffix.replace('.csv', '')
+        
+        if include_demographics:
+            demo_df = self.filter_demo_data(
+                pd.read_csv(
+                    demo_file,
+                    usecols=lambda col: col in self.demo_columns or col in self.weight_columns,
+                    dtype='float64'
+                ),
+                pd.read_csv(pta_file, usecols=['SEQN']).replace(self.error_codes, np.nan)
+            )
+        
+        reader = pd.read_csv(
+            pta_file, usecols=self.pta_columns, dtype='float64', chunksize=block_rows
+        )
+        
+        start = 0
+        for pta_block in reader:
+            filtered_pta_df = self.filter_pta_data(pta_block).reset_index(drop=True)
+            
+            if include_demographics:
+                filtered_demo_df = demo_df.iloc[start:start + len(filtered_pta_df)].reset_index(drop=True)
+                block_df = pd.concat([filtered_demo_df, filtered_pta_df.iloc[:, 1:]], axis=1)
+            else:
+                block_df = filtered_pta_df
+            
+            start += len(filtered_pta_df)
+            block_df['Cohort'] = cohort
+            yield block_df
+    
     def load_all_cohorts(self, cohort_suffixes: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Load and combine data from all NHANES cohorts.
@@ -267,7 +363,7 @@ def load_nhanes_data(
         Dictionary containing processed DataFrames:
         - 'combined': Full combined dataset
         - 'pta': PTA data only  
-        - 'demo_pta': Demographics + PTA data
+        - 'demo_pta': Demographics + PTA data, with the MEC exam weight
     """
     loader = NHANESDataLoader(data_dir)
     
@@ -281,11 +377,13 @@ def load_nhanes_data(
     pta_df = loader.get_pta_subset(combined_df, relabel=True)
     
     # Create demographics + PTA dataset
-    demo_pta_columns = ['SEQN'] + loader.get_standard_pta_columns()
-    if include_clean_labels:
-        demo_pta_columns.extend(['Gender', 'Age (years)', 'Race/ethnicity'])
-    
-    demo_pta_df = combined_df[demo_pta_columns].copy()
+    demo_columns = ['Gender', 'Age (years)', 'Race/ethnicity'] if include_clean_labels else []
+    demo_columns.append(MEC_WEIGHT_COLUMN)
+    demo_pta_df = pd.concat([
+        combined_df[['SEQN']],
+        pta_df,
+        combined_df[demo_columns]
+    ], axis=1)
     
     return {
         'combined': combined_df,
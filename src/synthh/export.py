@@ -0,0 +1,723 @@
+"""
+NHANES Dataset Export Module
+
+This module provides the export engine for processed NHANES datasets.
+Datasets and formats are written concurrently from a thread pool with
+stable file names. Parquet output is partitioned by cohort, dictionary
+encoded and zstd compressed, with thresholds stored as small integers.
+Every file is written atomically and described in an export manifest.
+An asynchronous writer lets datasets be exported while later ones are
+still being computed, and a streaming writer appends datasets that are
+produced block by block.
+"""
+
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from .cache_utils import (
+    replace_directory,
+    set_default_permissions,
+    write_directory_atomic,
+    write_json_atomic
+)
+from .profiling import PipelineProfiler
+
+
+class DatasetExporter:
+    """
+    A concurrent exporter for processed NHANES datasets.
+    
+    Each dataset is converted to an Arrow table once and shared by all of
+    its output formats. File names depend only on the dataset name and
+    format, so repeated exports overwrite their previous outputs.
+    """
+    
+    def __init__(
+        self,
+        output_dir: Union[str, Path],
+        n_threads: int = 4,
+        partition_column: Optional[str] = 'Cohort',
+        compression: str = 'zstd',
+        manifest_name: str = 'export_manifest.json',
+        profile: Optional[PipelineProfiler] = None
+    ):
+        """
+        Initialize the exporter.
+        
+        Args:
+            output_dir: Directory receiving the exported files.
+            n_threads: Number of writer threads.
+            partition_column: Column used to partition Parquet output. Datasets
+                             without the column are written as single files.
+            compression: Parquet compression codec.
+            manifest_name: Name of the export manifest file.
+            profile: Optional profiler; each write is measured as an
+                    'export' stage view.
+        """
+        self.output_dir = Path(output_dir)
+        self.n_threads = n_threads
+        self.partition_column = partition_column
+        self.compression = compression
+        self.manifest_name = manifest_name
+        self.profile = profile or PipelineProfiler()
+        
+        self.supported_formats = ['csv', 'parquet']
+        self.threshold_columns = ['Hearing Threshold (dB HL)']
+        self.max_category_ratio = 0.5  # Dictionary-encode strings below this cardinality ratio
+    
+    def get_filepath(self, dataset_name: str, fmt: str) -> Path:
+        """
+        Get the stable output path of a dataset in a format.
+        
+        Args:
+            dataset_name: Dataset name.
+            fmt: File format.
+        
+        Returns:
+            Output path (a directory for partitioned Parquet).
+        """
+        return self.output_dir / f'nhanes_{dataset_name}.{fmt}'
+    
+    def _is_threshold_column(self, col: str) -> bool:
+        """Check whether a column holds raw hearing thresholds."""
+        parts = col.split(' ')
+        is_pta = len(parts) == 2 and parts[0].endswith('kHz') and parts[1] in ('Right', 'Left')
+        return is_pta or col in self.threshold_columns
+    
+    @staticmethod
+    def _fits_int8(values: pd.Series) -> bool:
+        """Check whether a numeric column holds only integers in the Int8 range."""
+        if not pd.api.types.is_numeric_dtype(values):
+            return False
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        present = array[~np.isnan(array)]
+        return bool((present >= -128).all() and (present <= 127).all() and (np.mod(present, 1) == 0).all())
+    
+    def plan_dtypes(self, df: pd.DataFrame) -> Dict[str, str]:
+        """
+        Choose compact storage types for the columns of a frame.
+        
+        Thresholds on the integer dB grid become nullable Int8, and
+        low-cardinality string columns become categoricals (dictionary
+        encoded in Parquet). Other columns are left unchanged.
+        
+        Args:
+            df: DataFrame to inspect.
+        
+        Returns:
+            Mapping of column name to target dtype for converted columns.
+        """
+        plan = {}
+        
+        for col in df.columns:
+            values = df[col]
+            
+            if self._is_threshold_column(col) and pd.api.types.is_numeric_dtype(values):
+                if self._fits_int8(values):
+                    plan[col] = 'Int8'
+            
+            elif pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+                if values.nunique() <= self.max_category_ratio * max(len(values), 1):
+                    plan[col] = 'category'
+        
+        return plan
+    
+    def optimize_dtypes(self, df: pd.DataFrame, plan: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Convert columns to compact storage types.
+        
+        Args:
+            df: DataFrame to convert.
+            plan: Optional dtype plan from plan_dtypes(), e.g. of the first
+                 block of a streamed dataset. Planned from df if None.
+        
+        Returns:
+            DataFrame with compact dtypes.
+        """
+        plan = self.plan_dtypes(df) if plan is None else plan
+        
+        if not plan:
+            return df
+        
+        return df.assign(**{col: df[col].astype(dtype) for col, dtype in plan.items()})
+    
+    def _write_csv(self, table: pa.Table, filepath: Path) -> Path:
+        """Write an Arrow table to CSV atomically."""
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            pa_csv.write_csv(table, tmp_path)
+            set_default_permissions(tmp_path)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        return filepath
+    
+    def _write_parquet(self, table: pa.Table, filepath: Path) -> Path:
+        """Write an Arrow table to Parquet atomically, partitioned if possible."""
+        options = {'compression': self.compression, 'use_dictionary': True}
+        
+        if self.partition_column and self.partition_column in table.column_names:
+            def write_partitions(tmp_dir: Path):
+                pq.write_to_dataset(
+                    table, root_path=str(tmp_dir), partition_cols=[self.partition_column], **options
+                )
+            return write_directory_atomic(write_partitions, filepath)
+        
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, **options)
+            set_default_permissions(tmp_path)
+            if filepath.is_dir():
+                # A previous partitioned export used the same stable name
+                shutil.rmtree(filepath)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        return filepath
+    
+    def write_table(self, table: pa.Table, dataset_name: str, fmt: str) -> Dict:
+        """
+        Write one dataset in one format.
+        
+        Args:
+            table: Arrow table from to_table().
+            dataset_name: Dataset name.
+            fmt: File format.
+        
+        Returns:
+            Description of the written output.
+        """
+        filepath = self.get_filepath(dataset_name, fmt)
+        start = time.perf_counter()
+        
+        with self.profile.measure('export', dataset_name, rows_in=table.num_rows) as record:
+            if fmt == 'csv':
+                self._write_csv(table, filepath)
+            else:
+                self._write_parquet(table, filepath)
+            record['rows_out'] = table.num_rows
+        
+        return {
+            'path': str(filepath),
+            'partitioned': filepath.is_dir(),
+            'write_time_s': time.perf_counter() - start
+        }
+    
+    def validate_formats(self, formats: Optional[List[str]] = None) -> List[str]:
+        """
+        Validate requested export formats.
+        
+        Args:
+            formats: File formats. Defaults to all supported formats.
+        
+        Returns:
+            List of formats to write.
+        
+        Raises:
+            ValueError: If an unsupported format is requested.
+        """
+        formats = formats or self.supported_formats
+        unsupported = [fmt for fmt in formats if fmt not in self.supported_formats]
+        if unsupported:
+            raise ValueError(f"Unsupported export formats {unsupported}. Use {self.supported_formats}")
+        return formats
+    
+    def to_table(self, df: pd.DataFrame) -> pa.Table:
+        """
+        Convert a DataFrame to an Arrow table with compact dtypes.
+        
+        Args:
+            df: DataFrame to convert.
+        
+        Returns:
+            Arrow table shared by all output formats.
+        """
+        return pa.Table.from_pandas(self.optimize_dtypes(df), preserve_index=False)
+    
+    def describe(self, table: pa.Table, outputs: Dict[str, Dict]) -> Dict:
+        """
+        Describe an exported dataset for the manifest.
+        
+        Args:
+            table: Exported Arrow table.
+            outputs: Mapping of format to output description.
+        
+        Returns:
+            Manifest entry for the dataset.
+        """
+        return {
+            'rows': table.num_rows,
+            'columns': table.num_columns,
+            'schema': {field.name: str(field.type) for field in table.schema},
+            'files': outputs
+        }
+    
+    def write_manifest(self, datasets: Dict[str, Dict]) -> Dict:
+        """
+        Write the export manifest.
+        
+        Args:
+            datasets: Mapping of dataset name to manifest entry.
+        
+        Returns:
+            Export manifest.
+        """
+        manifest = {
+            'created': datetime.now().isoformat(),
+            'compression': self.compression,
+            'partition_column': self.partition_column,
+            'datasets': datasets
+        }
+        write_json_atomic(manifest, self.output_dir / self.manifest_name)
+        
+        return manifest
+    
+    def export(
+        self,
+        datasets: Dict[str, pd.DataFrame],
+        formats: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Export datasets concurrently and write the export manifest.
+        
+        Args:
+            datasets: Dictionary of DataFrames to export.
+            formats: File formats ('csv', 'parquet'). Defaults to both.
+        
+        Returns:
+            Export manifest describing every written file.
+        
+        Raises:
+            ValueError: If an unsupported format is requested.
+        """
+        formats = self.validate_formats(formats)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        tables = {name: self.to_table(df) for name, df in datasets.items()}
+        
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            futures = {
+                (name, fmt): executor.submit(self.write_table, table, name, fmt)
+                for name, table in tables.items()
+                for fmt in formats
+            }
+            outputs = {task: future.result() for task, future in futures.items()}
+        
+        return self.write_manifest({
+            name: self.describe(table, {fmt: outputs[(name, fmt)] for fmt in formats})
+            for name, table in tables.items()
+        })
+        
+
+class AsyncDatasetWriter:
+    """
+    A background writer that exports datasets as soon as they are produced.
+    
+    Producers submit datasets (or JSON documents) to a bounded queue and
+    continue computing; writer threads serialise them concurrently. The
+    bounded queue keeps memory in check if producers outpace the disk.
+    Errors raised by writes are collected and re-raised by close().
+    """
+    
+    def __init__(
+        self,
+        exporter: DatasetExporter,
+        formats: Optional[List[str]] = None,
+        max_queue_size: int = 4
+    ):
+        """
+        Initialize the writer.
+        
+        Args:
+            exporter: Exporter defining the output directory and encodings.
+            formats: File formats to write for every dataset.
+            max_queue_size: Maximum number of pending write jobs.
+        """
+        self.exporter = exporter
+        self.formats = exporter.validate_formats(formats)
+        self.queue = queue.Queue(maxsize=max_queue_size)
+        self.threads = []
+        self.errors = []
+        self.submitted = []
+        self.datasets = {}
+        self.json_files = []
+        self._lock = threading.Lock()
+    
+    def start(self) -> 'AsyncDatasetWriter':
+        """
+        Start the writer threads.
+        
+        Returns:
+            Self for method chaining.
+        """
+        self.exporter.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        for _ in range(max(1, self.exporter.n_threads)):
+            thread = threading.Thread(target=self._run, daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        
+        return self
+    
+    def _run(self):
+        """Process write jobs until the stop sentinel is received."""
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                
+                kind, name, payload = job
+                if kind == 'dataset':
+                    table = self.exporter.to_table(payload)
+                    outputs = {fmt: self.exporter.write_table(table, name, fmt) for fmt in self.formats}
+                    with self._lock:
+                        self.datasets[name] = self.exporter.describe(table, outputs)
+                else:
+                    filepath = write_json_atomic(payload, self.exporter.output_dir / name)
+                    with self._lock:
+                        self.json_files.append(str(filepath))
+            
+            except Exception as e:
+                with self._lock:
+                    self.errors.append((job[1], e))
+            finally:
+                self.queue.task_done()
+    
+    def submit(self, name: str, df: pd.DataFrame):
+        """
+        Queue a dataset for export (blocks while the queue is full).
+        
+        Args:
+            name: Dataset name.
+            df: Dataset to export. It must not be modified afterwards.
+        """
+        self.submitted.append(name)
+        self.queue.put(('dataset', name, df))
+    
+    def submit_json(self, filename: str, data: Dict):
+        """
+        Queue a JSON document for writing to the output directory.
+        
+        Args:
+            filename: Output file name.
+            data: JSON-serializable data.
+        """
+        self.queue.put(('json', filename, data))
+    
+    def close(self, raise_errors: bool = True) -> Dict:
+        """
+        Wait for all pending writes and write the export manifest.
+        
+        Args:
+            raise_errors: Whether to raise if any write failed.
+        
+        Returns:
+            Export manifest for the written datasets.
+        
+        Raises:
+            RuntimeError: If any write failed (chained to the first error).
+        """
+        for _ in self.threads:
+            self.queue.put(None)
+        for thread in self.threads:
+            thread.join()
+        self.threads = []
+        
+        if self.errors:
+            if raise_errors:
+                name, error = self.errors[0]
+                raise RuntimeError(
+                    f"{len(self.errors)} export write(s) failed; first failure on '{name}': {error}"
+                ) from error
+            return {}
+        
+        return self.exporter.write_manifest({name: self.datasets[name] for name in self.submitted})
+
+
+class StreamingDatasetWriter:
+    """
+    An incremental writer for datasets produced in row blocks.
+    
+    Every dataset and format grows in a temporary file (or directory, for
+    partitioned Parquet) as blocks arrive: CSV through an Arrow CSV writer
+    and Parquet with one row group (or one file per partition) per block.
+    Column encodings are fixed by the first non-empty block so all blocks
+    share one schema. If a later block has threshold values the Int8
+    encoding cannot hold (e.g. an unconverted 888 code), the column falls
+    back to float64 and the blocks already written are re-encoded. close()
+    moves the outputs into place under their stable names and writes the
+    export manifest.
+    """
+    
+    def __init__(self, exporter: DatasetExporter, formats: Optional[List[str]] = None):
+        """
+        Initialize the writer.
+        
+        Args:
+            exporter: Exporter defining the output directory and encodings.
+            formats: File formats to write for every dataset.
+        """
+        self.exporter = exporter
+        self.formats = exporter.validate_formats(formats)
+        self.options = {'compression': exporter.compression, 'use_dictionary': True}
+        
+        self.dtype_plans = {}
+        self.schemas = {}
+        self.rows = {}
+        self.blocks = {}
+        self.outputs = {}  # (name, fmt) -> temporary output state
+        self.empty = {}  # Datasets whose blocks have all been empty so far
+    
+    def _is_partitioned(self, name: str, fmt: str) -> bool:
+        """Check whether a dataset's Parquet output is partitioned."""
+        column = self.exporter.partition_column
+        return fmt == 'parquet' and bool(column) and column in self.schemas[name].names
+    
+    def _open(self, name: str, fmt: str) -> Dict:
+        """Open the temporary output of a dataset in a format."""
+        filepath = self.exporter.get_filepath(name, fmt)
+        prefix = f'.{filepath.name}.'
+        schema = self.schemas[name]
+        
+        if self._is_partitioned(name, fmt):
+            tmp_path = Path(tempfile.mkdtemp(dir=filepath.parent, prefix=prefix, suffix='.tmp'))
+            set_default_permissions(tmp_path)
+            writer = None
+        else:
+            fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=prefix, suffix='.tmp')
+            os.close(fd)
+            tmp_path = set_default_permissions(tmp_path)
+            if fmt == 'csv':
+                writer = pa_csv.CSVWriter(str(tmp_path), schema)
+            else:
+                writer = pq.ParquetWriter(str(tmp_path), schema, **self.options)
+        
+        return {'path': filepath, 'tmp_path': tmp_path, 'writer': writer, 'write_time_s': 0.0}
+    
+    def _start(self, name: str, df: pd.DataFrame) -> pa.Table:
+        """Fix the encodings of a dataset from its first block and open its outputs."""
+        self.exporter.output_dir.mkdir(parents=True, exist_ok=True)
+        self.dtype_plans[name] = self.exporter.plan_dtypes(df)
+        table = pa.Table.from_pandas(
+            self.exporter.optimize_dtypes(df, self.dtype_plans[name]), preserve_index=False
+        )
+        self.schemas[name] = table.schema
+        self.rows[name] = 0
+        self.blocks[name] = 0
+        
+        for fmt in self.formats:
+            self.outputs[(name, fmt)] = self._open(name, fmt)
+        
+        return table
+    
+    def _append(self, name: str, table: pa.Table):
+        """Append an Arrow table to every output of a dataset."""
+        for fmt in self.formats:
+            output = self.outputs[(name, fmt)]
+            start = time.perf_counter()
+            
+            with self.exporter.profile.measure('export', name, rows_in=table.num_rows) as record:
+                if output['writer'] is not None:
+                    output['writer'].write_table(table)
+                else:
+                    pq.write_to_dataset(
+                        table, root_path=str(output['tmp_path']),
+                        partition_cols=[self.exporter.partition_column],
+                        basename_template=f'part-{self.blocks[name]}-{{i}}.parquet',
+                        **self.options
+                    )
+                record['rows_out'] = table.num_rows
+            
+            output['write_time_s'] += time.perf_counter() - start
+        
+        self.rows[name] += table.num_rows
+        self.blocks[name] += 1
+    
+    @staticmethod
+    def _close_writer(output: Dict):
+        """Close the writer of an output (and the file it appends to, if any)."""
+        if output['writer'] is not None:
+            output['writer'].close()
+            output['writer'] = None
+        if output.get('sink') is not None:
+            output.pop('sink').close()
+    
+    def _reopen_as(self, name: str, fmt: str, schema: pa.Schema):
+        """Re-encode the blocks already written to an output with a wider schema."""
+        output = self.outputs[(name, fmt)]
+        partitioned = fmt == 'parquet' and output['tmp_path'].is_dir()
+        self._close_writer(output)
+        
+        if fmt == 'csv':
+            # Int8 and float64 values are written alike, so only the writer changes
+            sink = pa.OSFile(str(output['tmp_path']), 'ab')
+            output['writer'] = pa_csv.CSVWriter(
+                sink, schema, write_options=pa_csv.WriteOptions(include_header=False)
+            )
+            output['sink'] = sink
+        
+        elif partitioned:
+            # One file per block and partition, without the partition column
+            file_schema = schema.remove(schema.get_field_index(self.exporter.partition_column))
+            for path in output['tmp_path'].rglob('*.parquet'):
+                pq.write_table(pq.read_table(path).cast(file_schema), path, **self.options)
+        
+        else:
+            old_path = output['tmp_path']
+            reopened = self._open(name, fmt)
+            source = pq.ParquetFile(str(old_path))
+            for i in range(source.num_row_groups):
+                reopened['writer'].write_table(source.read_row_group(i).cast(schema))
+            source.close()
+            os.remove(old_path)
+            output['tmp_path'], output['writer'] = reopened['tmp_path'], reopened['writer']
+    
+    def _widen_plan(self, name: str, df: pd.DataFrame):
+        """Fall back to float64 for planned Int8 columns a block cannot hold."""
+        plan = self.dtype_plans[name]
+        widened = [
+            col for col, dtype in plan.items()
+            if dtype == 'Int8' and col in df.columns and not self.exporter._fits_int8(df[col])
+        ]
+        if not widened:
+            return
+        
+        schema = self.schemas[name]
+        for col in widened:
+            del plan[col]
+            schema = schema.set(schema.get_field_index(col), pa.field(col, pa.float64()))
+        
+        # Read the widened columns back as float64 rather than Int8
+        pandas_metadata = schema.pandas_metadata
+        if pandas_metadata is not None:
+            for column in pandas_metadata['columns']:
+                if column['name'] in widened:
+                    column.update(pandas_type='float64', numpy_type='float64', metadata=None)
+            schema = schema.with_metadata({**schema.metadata, b'pandas': json.dumps(pandas_metadata)})
+        self.schemas[name] = schema
+        
+        for fmt in self.formats:
+            self._reopen_as(name, fmt, schema)
+    
+    def write(self, name: str, df: pd.DataFrame):
+        """
+        Append a block of a dataset.
+        
+        Args:
+            name: Dataset name.
+            df: Next block of the dataset.
+        """
+        if name in self.schemas:
+            self._widen_plan(name, df)
+            table = pa.Table.from_pandas(
+                self.exporter.optimize_dtypes(df, self.dtype_plans[name]),
+                schema=self.schemas[name], preserve_index=False
+            )
+        elif len(df) == 0:
+            # An empty block says nothing about the encodings of later blocks
+            self.empty[name] = df
+            return
+        else:
+            self.empty.pop(name, None)
+            table = self._start(name, df)
+        
+        self._append(name, table)
+    
+    def abort(self):
+        """Close and remove all temporary outputs."""
+        for output in self.outputs.values():
+            self._close_writer(output)
+            if output['tmp_path'].is_dir():
+                shutil.rmtree(output['tmp_path'], ignore_errors=True)
+            elif output['tmp_path'].exists():
+                os.remove(output['tmp_path'])
+        self.outputs = {}
+    
+    def close(self) -> Dict:
+        """
+        Finish all outputs, move them into place and write the manifest.
+        
+        Returns:
+            Export manifest for the written datasets.
+        """
+        try:
+            # Datasets that never received rows are written once, empty
+            for name, df in self.empty.items():
+                self._append(name, self._start(name, df))
+            self.empty = {}
+            
+            for output in self.outputs.values():
+                self._close_writer(output)
+            
+            datasets = {}
+            for name, schema in self.schemas.items():
+                files = {}
+                for fmt in self.formats:
+                    output = self.outputs[(name, fmt)]
+                    replace_directory(output['tmp_path'], output['path'])
+                    files[fmt] = {
+                        'path': str(output['path']),
+                        'partitioned': output['path'].is_dir(),
+                        'write_time_s': output['write_time_s']
+                    }
+                
+                datasets[name] = {
+                    'rows': self.rows[name],
+                    'columns': len(schema.names),
+                    'schema': {field.name: str(field.type) for field in schema},
+                    'files': files
+                }
+        except BaseException:
+            self.abort()
+            raise
+        
+        self.outputs = {}
+        return self.exporter.write_manifest(datasets)
+
+
+def export_datasets(
+    datasets: Dict[str, pd.DataFrame],
+    output_dir: Union[str, Path],
+    formats: Optional[List[str]] = None,
+    n_threads: int = 4,
+    partition_column: Optional[str] = 'Cohort'
+) -> Dict:
+    """
+    Convenience function to export processed datasets.
+    
+    Args:
+        datasets: Dictionary of DataFrames to export.
+        output_dir: Directory receiving the exported files.
+        formats: File formats ('csv', 'parquet'). Defaults to both.
+        n_threads: Number of writer threads.
+        partition_column: Column used to partition Parquet output.
+    
+    Returns:
+        Export manifest.
+    """
+    exporter = DatasetExporter(output_dir, n_threads=n_threads, partition_column=partition_column)
+    return exporter.export(datasets, formats)
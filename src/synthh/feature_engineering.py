@@ -6,11 +6,13 @@ audiometric data, including data format transformations, hearing loss coding,
 aggregated measures, and clinical feature extraction.
 """
 
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .profiling import PipelineProfiler
+
 
 class NHANESFeatureEngineer:
     """
@@ -34,6 +36,53 @@ class NHANESFeatureEngineer:
             'severe': (71, 95),
             'profound': (96, 120)
         }
+        
+        # Ear order of the threshold tensor
+        self.ears = ['Right', 'Left']
+        
+        # Fixed category orders for demographic and time features
+        self.age_group_bins = [0, 18, 30, 50, 65, 100]
+        self.age_group_labels = ['Child', 'Young Adult', 'Middle Age', 'Older Adult', 'Elderly']
+        self.arhl_risk_bins = [50, 65]
+        self.arhl_risk_labels = ['Low', 'Moderate', 'High']
+        self.ethnicity_categories = [
+            'Mexican American', 'Other Hispanic', 'Non-Hispanic White',
+            'Non-Hispanic Black', 'Other Race - Including Multi-Racial'
+        ]
+        self.period_labels = ['Early (1999-2009)', 'Later (2010+)']
+        self.period_start_year = 2010
+        
+        # Cohort -> start year lookup table
+        self.cohort_start_years = {
+            '1999-2000': 1999, '2001-02': 2001, '2003-04': 2003, '2005-06': 2005,
+            '2007-08': 2007, '2009-10': 2009, '2011-12': 2011, '2013-14': 2013,
+            '2015-16': 2015, '2017-18': 2017, '2017-20': 2017
+        }
+    
+    def to_threshold_array(self, df: pd.DataFrame, dtype: type = np.float32) -> np.ndarray:
+        """
+        Pack wide-format PTA columns into a threshold tensor.
+        
+        Args:
+            df: Wide-format DataFrame with PTA data.
+            dtype: Floating point dtype of the returned array.
+        
+        Returns:
+            Array of shape (N, 2, 5) indexed by (record, ear, frequency), with
+            ears ordered as self.ears and frequencies as self.frequency_labels.
+            Missing columns are filled with NaN.
+        """
+        thresholds = np.full(
+            (len(df), len(self.ears), len(self.frequency_labels)), np.nan, dtype=dtype
+        )
+        
+        for ear_idx, ear in enumerate(self.ears):
+            for freq_idx, freq in enumerate(self.frequency_labels):
+                col = f'{freq} {ear}'
+                if col in df.columns:
+                    thresholds[:, ear_idx, freq_idx] = df[col].to_numpy(dtype=dtype, na_value=np.nan)
+        
+        return thresholds
     
     def wide_to_long_format(
         self,
@@ -79,7 +128,7 @@ class NHANESFeatureEngineer:
             
             # Add demographics if requested
             if include_demographics:
-                demo_cols = ['Gender', 'Age (years)', 'Race/ethnicity']
+                demo_cols = ['Gender', 'Age (years)', 'Race/ethnicity', 'Cohort']
                 for demo_col in demo_cols:
                     if demo_col in df.columns:
                         subset_df[demo_col] = df[demo_col]
@@ -191,6 +240,26 @@ class NHANESFeatureEngineer:
         
         return df_categorized
     
+    def create_hearing_loss_grades(
+        self,
+        df: pd.DataFrame,
+        standards: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Create multi-standard hearing loss grades (WHO 2021, PTA, 4FA, HFA).
+        
+        Args:
+            df: DataFrame with PTA data.
+            standards: Grading standards to compute. If None, computes all.
+        
+        Returns:
+            DataFrame with additional grade and average columns.
+        """
+        from .hearing_loss_grading import HearingLossGrader
+        
+        grades = HearingLossGrader(self).grade_dataframe(df, standards=standards)
+        return pd.concat([df, grades], axis=1)
+    
     def create_aggregated_frequencies(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create aggregated frequency measures (average of left and right ears).
@@ -203,19 +272,44 @@ class NHANESFeatureEngineer:
         """
         df_agg = df.copy()
         
-        for freq in self.frequency_labels:
-            right_col = f'{freq} Right'
-            left_col = f'{freq} Left'
+        freqs = [
+            freq for freq in self.frequency_labels
+            if f'{freq} Right' in df.columns and f'{freq} Left' in df.columns
+        ]
+        
+        if freqs:
+            right = df[[f'{freq} Right' for freq in freqs]].to_numpy(dtype=np.float64, na_value=np.nan)
+            left = df[[f'{freq} Left' for freq in freqs]].to_numpy(dtype=np.float64, na_value=np.nan)
             
-            if right_col in df.columns and left_col in df.columns:
-                # Calculate mean of both ears
-                df_agg[freq] = (df[right_col] + df[left_col]) / 2
-                
-                # Calculate absolute difference (asymmetry measure)
-                df_agg[f'{freq} Asymmetry'] = abs(df[right_col] - df[left_col])
+            # Mean of both ears and absolute difference (asymmetry measure) for all frequencies at once
+            ear_mean = (right + left) / 2
+            asymmetry = np.abs(right - left)
+            
+            aggregated = {}
+            for freq_idx, freq in enumerate(freqs):
+                aggregated[freq] = ear_mean[:, freq_idx]
+                aggregated[f'{freq} Asymmetry'] = asymmetry[:, freq_idx]
+            
+            for col, values in aggregated.items():
+                df_agg[col] = values
         
         return df_agg
     
+    def create_shape_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Create audiogram shape features (noise notch, asymmetry, better ear).
+        
+        Args:
+            df: DataFrame with bilateral PTA data.
+            
+        Returns:
+            DataFrame with additional shape feature columns.
+        """
+        from .audiogram_shape import AudiogramShapeAnalyzer
+        
+        shape_features = AudiogramShapeAnalyzer(self).compute_dataframe(df)
+        return pd.concat([df, shape_features], axis=1)
+    
     def create_clinical_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create clinical audiometric features.
@@ -298,6 +392,87 @@ class NHANESFeatureEngineer:
         else:
             return 'Irregular'
     
+    @staticmethod
+    def bin_to_categorical(
+        values: np.ndarray,
+        bins: List[float],
+        labels: List[str],
+        right: bool = False
+    ) -> pd.Categorical:
+        """
+        Bin values into an ordered categorical with a fixed category order.
+        
+        Args:
+            values: Numeric values to bin.
+            bins: Bin edges in increasing order. Values outside the outer edges
+                 are missing when len(bins) == len(labels) + 1; otherwise the
+                 edges are inner edges and the outer bins are open-ended.
+            labels: Category labels in order.
+            right: Whether bins include their upper edge.
+            
+        Returns:
+            Ordered categorical built from integer codes (NaN for missing values).
+        """
+        values = np.asarray(values, dtype=np.float64)
+        side = 'left' if right else 'right'
+        
+        if len(bins) == len(labels) + 1:
+            codes = np.searchsorted(bins, values, side=side) - 1
+            codes = np.where((codes < 0) | (codes >= len(labels)), -1, codes)
+        else:
+            codes = np.searchsorted(bins, values, side=side)
+        
+        codes = np.where(np.isnan(values), -1, codes).astype(np.int8)
+        return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+    
+    @staticmethod
+    def one_hot_from_codes(
+        codes: np.ndarray,
+        n_categories: int,
+        dtype: type = np.int8
+    ) -> np.ndarray:
+        """
+        Build a one-hot matrix from categorical codes without Python loops.
+        
+        Args:
+            codes: Integer category codes (-1 for missing).
+            n_categories: Number of categories.
+            dtype: Integer dtype of the returned matrix.
+            
+        Returns:
+            Array of shape (len(codes), n_categories); missing rows are all zero.
+        """
+        codes = np.asarray(codes)
+        one_hot = np.zeros((len(codes), n_categories), dtype=dtype)
+        valid = (codes >= 0) & (codes < n_categories)
+        one_hot[np.flatnonzero(valid), codes[valid]] = 1
+        return one_hot
+    
+    def one_hot_encode(
+        self,
+        values: pd.Series,
+        categories: List[str],
+        prefix: str
+    ) -> pd.DataFrame:
+        """
+        One-hot encode a column against a fixed category order.
+        
+        Args:
+            values: Column to encode.
+            categories: Fixed category order (unknown values encode as all zeros).
+            prefix: Prefix for the indicator column names.
+            
+        Returns:
+            DataFrame of indicator columns aligned with the input index.
+        """
+        codes = pd.Categorical(values, categories=categories).codes
+        one_hot = self.one_hot_from_codes(codes, len(categories))
+        columns = [
+            f'{prefix}_{category.replace(" ", "_").replace("-", "_")}'
+            for category in categories
+        ]
+        return pd.DataFrame(one_hot, columns=columns, index=values.index)
+    
     def create_demographic_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create additional demographic features.
@@ -311,16 +486,16 @@ class NHANESFeatureEngineer:
         df_demo = df.copy()
         
         if 'Age (years)' in df.columns:
+            ages = df['Age (years)'].to_numpy(dtype=np.float64, na_value=np.nan)
+            
             # Age groups
-            age_bins = [0, 18, 30, 50, 65, 100]
-            age_labels = ['Child', 'Young Adult', 'Middle Age', 'Older Adult', 'Elderly']
-            df_demo['Age Group'] = pd.cut(
-                df['Age (years)'], bins=age_bins, labels=age_labels, right=False
+            df_demo['Age Group'] = self.bin_to_categorical(
+                ages, self.age_group_bins, self.age_group_labels
             )
             
             # Age-related hearing loss risk
-            df_demo['ARHL Risk'] = df['Age (years)'].apply(
-                lambda x: 'Low' if x < 50 else 'Moderate' if x < 65 else 'High'
+            df_demo['ARHL Risk'] = self.bin_to_categorical(
+                ages, self.arhl_risk_bins, self.arhl_risk_labels
             )
         
         if 'Gender' in df.columns:
@@ -328,15 +503,40 @@ class NHANESFeatureEngineer:
             df_demo['Gender_Numeric'] = df['Gender'].map({'Female': 0, 'Male': 1})
         
         if 'Race/ethnicity' in df.columns:
-            # Create binary indicators for each ethnicity
-            ethnicities = df['Race/ethnicity'].unique()
-            for ethnicity in ethnicities:
-                if pd.notna(ethnicity):
-                    col_name = f'Ethnicity_{ethnicity.replace(" ", "_").replace("-", "_")}'
-                    df_demo[col_name] = (df['Race/ethnicity'] == ethnicity).astype(int)
+            # Create binary indicators for each ethnicity (fixed category order)
+            ethnicity_dummies = self.one_hot_encode(
+                df['Race/ethnicity'], self.ethnicity_categories, 'Ethnicity'
+            )
+            for col in ethnicity_dummies.columns:
+                df_demo[col] = ethnicity_dummies[col]
         
         return df_demo
     
+    def get_cohort_start_years(self, cohorts: pd.Series) -> np.ndarray:
+        """
+        Look up the start year of each record's cohort.
+        
+        Cohort labels are factorized so the lookup (and the regex fallback for
+        labels missing from the table) runs once per distinct cohort.
+        
+        Args:
+            cohorts: Series of cohort labels (e.g. '1999-2000').
+            
+        Returns:
+            Float array of start years (NaN for missing or unparseable cohorts).
+        """
+        codes, uniques = pd.factorize(cohorts)
+        
+        unique_years = pd.Series(uniques, dtype=object).map(self.cohort_start_years)
+        unknown = unique_years.isna()
+        if unknown.any():
+            unique_years[unknown] = pd.Series(uniques[unknown.to_numpy()]).astype(str).str.extract(
+                r'(\d{4})', expand=False
+            ).astype(float).to_numpy()
+        
+        lookup = np.append(unique_years.to_numpy(dtype=np.float64), np.nan)
+        return lookup[codes]  # code -1 (missing) indexes the trailing NaN
+    
     def create_time_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Create time-based features from cohort information.
@@ -351,46 +551,49 @@ class NHANESFeatureEngineer:
         
         if 'Cohort' in df.columns:
             # Extract year information
-            df_time['Cohort_Start_Year'] = df['Cohort'].str.extract(r'(\d{4})').astype(float)
+            start_years = self.get_cohort_start_years(df['Cohort'])
+            df_time['Cohort_Start_Year'] = start_years
             
             # Create decade groups
-            df_time['Decade'] = ((df_time['Cohort_Start_Year'] // 10) * 10).astype('Int64')
+            df_time['Decade'] = pd.array((start_years // 10) * 10, dtype='Int64')
             
             # Create early vs late NHANES periods
-            df_time['Period'] = df_time['Cohort_Start_Year'].apply(
-                lambda x: 'Early (1999-2009)' if x < 2010 else 'Later (2010+)'
+            df_time['Period'] = self.bin_to_categorical(
+                start_years, [self.period_start_year], self.period_labels
             )
         
         return df_time
 
 
-def engineer_nhanes_features(
+def engineer_wide_features(
     df: pd.DataFrame,
+    engineer: NHANESFeatureEngineer,
     include_hearing_loss: bool = True,
     include_clinical: bool = True,
     include_aggregated: bool = True,
     include_demographics: bool = True,
-    hearing_loss_method: str = 'any_frequency'
-) -> Dict[str, pd.DataFrame]:
+    hearing_loss_method: str = 'any_frequency',
+    include_shape: bool = False
+) -> pd.DataFrame:
     """
-    Convenience function to engineer comprehensive features from NHANES data.
+    Engineer the wide-format feature dataset.
+    
+    Every feature depends only on its own record, so row blocks can be
+    engineered independently (see engineer_features_parallel()).
     
     Args:
         df: Raw NHANES DataFrame with wide-format PTA data.
+        engineer: Feature engineer with the thresholds to apply.
         include_hearing_loss: Whether to create hearing loss coding.
         include_clinical: Whether to create clinical audiometric features.
         include_aggregated: Whether to create aggregated frequency measures.
         include_demographics: Whether to create demographic features.
         hearing_loss_method: Method for hearing loss classification.
-        
+        include_shape: Whether to create audiogram shape features.
+    
     Returns:
-        Dictionary containing multiple feature-engineered datasets:
-        - 'wide': Wide-format data with all features
-        - 'long': Long-format data for visualization
-        - 'modeling': Data prepared for machine learning
+        Wide-format DataFrame with all features.
     """
-    engineer = NHANESFeatureEngineer()
-    
     # Start with input dataframe
     df_wide = df.copy()
     
@@ -409,18 +612,90 @@ def engineer_nhanes_features(
     if include_aggregated:
         df_wide = engineer.create_aggregated_frequencies(df_wide)
     
+    # Create audiogram shape features
+    if include_shape:
+        df_wide = engineer.create_shape_features(df_wide)
+    
     # Create demographic features
     if include_demographics:
         df_wide = engineer.create_demographic_features(df_wide)
         df_wide = engineer.create_time_features(df_wide)
     
+    return df_wide
+
+
+def engineer_nhanes_features(
+    df: pd.DataFrame,
+    include_hearing_loss: bool = True,
+    include_clinical: bool = True,
+    include_aggregated: bool = True,
+    include_demographics: bool = True,
+    hearing_loss_method: str = 'any_frequency',
+    engineer: Optional[NHANESFeatureEngineer] = None,
+    include_shape: bool = False,
+    on_dataset: Optional[Callable[[str, pd.DataFrame], None]] = None,
+    profile: Optional[PipelineProfiler] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Convenience function to engineer comprehensive features from NHANES data.
+    
+    Args:
+        df: Raw NHANES DataFrame with wide-format PTA data.
+        include_hearing_loss: Whether to create hearing loss coding.
+        include_clinical: Whether to create clinical audiometric features.
+        include_aggregated: Whether to create aggregated frequency measures.
+        include_demographics: Whether to create demographic features.
+        hearing_loss_method: Method for hearing loss classification.
+        engineer: Optional feature engineer with custom thresholds. A default
+                 engineer is created if None.
+        include_shape: Whether to create audiogram shape features.
+        on_dataset: Optional callback invoked with (name, dataset) as soon as
+                   each dataset is complete, e.g. to start exporting it.
+        profile: Optional profiler; each dataset is measured as an
+                'engineer' stage view.
+        
+    Returns:
+        Dictionary containing multiple feature-engineered datasets:
+        - 'wide': Wide-format data with all features
+        - 'long': Long-format data for visualization
+        - 'modeling': Data prepared for machine learning
+    """
+    engineer = engineer or NHANESFeatureEngineer()
+    profile = profile or PipelineProfiler()
+    
+    with profile.measure('engineer', 'wide', rows_in=len(df)) as record:
+        df_wide = engineer_wide_features(
+            df,
+            engineer,
+            include_hearing_loss=include_hearing_loss,
+            include_clinical=include_clinical,
+            include_aggregated=include_aggregated,
+            include_demographics=include_demographics,
+            hearing_loss_method=hearing_loss_method,
+            include_shape=include_shape
+        )
+        record['rows_out'] = len(df_wide)
+    
+    if on_dataset is not None:
+        on_dataset('wide', df_wide)
+    
     # Create long-format dataset
-    df_long = engineer.wide_to_long_format(
-        df, include_demographics=include_demographics
-    )
+    with profile.measure('engineer', 'long', rows_in=len(df)) as record:
+        df_long = engineer.wide_to_long_format(
+            df, include_demographics=include_demographics
+        )
+        record['rows_out'] = len(df_long)
+    
+    if on_dataset is not None:
+        on_dataset('long', df_long)
     
     # Create modeling dataset (numeric only, handle missing values)
-    df_modeling = df_wide.select_dtypes(include=[np.number]).copy()
+    with profile.measure('engineer', 'modeling', rows_in=len(df_wide)) as record:
+        df_modeling = df_wide.select_dtypes(include=[np.number]).copy()
+        record['rows_out'] = len(df_modeling)
+    
+    if on_dataset is not None:
+        on_dataset('modeling', df_modeling)
     
     return {
         'wide': df_wide,
@@ -0,0 +1,326 @@
+"""
+NHANES Feature Store Module
+
+This module provides a persistent, content-addressed store for the outputs
+of NHANES feature engineering. Engineered datasets are keyed by a hash of
+the input data and the feature configuration (including the engineer's
+hearing loss thresholds), persisted as Parquet, and served back on repeat
+requests with column projection.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+import pandas as pd
+
+from .cache_utils import (
+    hash_config,
+    hash_dataframe,
+    read_parquet,
+    write_json_atomic,
+    write_parquet_atomic
+)
+from .feature_engineering import NHANESFeatureEngineer, engineer_nhanes_features
+from .profiling import PipelineProfiler
+
+
+# Bump when feature engineering logic changes so stale entries are not reused
+FEATURE_STORE_VERSION = 2
+
+
+class NHANESFeatureStore:
+    """
+    A persistent store for engineered NHANES feature datasets.
+    
+    Each entry lives in its own directory named after the cache key and holds
+    one Parquet file per engineered dataset ('wide', 'long', 'modeling') plus
+    a manifest describing the configuration that produced it.
+    """
+    
+    def __init__(
+        self,
+        store_dir: Union[str, Path],
+        engineer: Optional[NHANESFeatureEngineer] = None
+    ):
+        """
+        Initialize the feature store.
+        
+        Args:
+            store_dir: Directory in which cached feature datasets are stored.
+            engineer: Feature engineer whose thresholds define the cache key.
+                     A default engineer is used if None.
+        """
+        self.store_dir = Path(store_dir)
+        self.engineer = engineer or NHANESFeatureEngineer()
+        self.manifest_name = 'manifest.json'
+    
+    def get_feature_config(
+        self,
+        include_hearing_loss: bool = True,
+        include_clinical: bool = True,
+        include_aggregated: bool = True,
+        include_demographics: bool = True,
+        hearing_loss_method: str = 'any_frequency',
+        include_shape: bool = False
+    ) -> Dict:
+        """
+        Build the feature configuration that identifies a cache entry.
+        
+        Args:
+            include_hearing_loss: Whether hearing loss coding is created.
+            include_clinical: Whether clinical features are created.
+            include_aggregated: Whether aggregated frequency measures are created.
+            include_demographics: Whether demographic features are created.
+            hearing_loss_method: Method for hearing loss classification.
+            include_shape: Whether audiogram shape features are created.
+        
+        Returns:
+            Dictionary of feature flags and engineer thresholds.
+        """
+        return {
+            'version': FEATURE_STORE_VERSION,
+            'include_hearing_loss': include_hearing_loss,
+            'include_clinical': include_clinical,
+            'include_aggregated': include_aggregated,
+            'include_demographics': include_demographics,
+            'hearing_loss_method': hearing_loss_method,
+            'include_shape': include_shape,
+            'hearing_loss_threshold': self.engineer.hearing_loss_threshold,
+            'hearing_loss_categories': {
+                name: list(bounds)
+                for name, bounds in self.engineer.hearing_loss_categories.items()
+            },
+            'frequency_labels': list(self.engineer.frequency_labels)
+        }
+    
+    def make_key(self, df: pd.DataFrame, feature_config: Dict) -> str:
+        """
+        Compute the cache key for an input frame and feature configuration.
+        
+        Args:
+            df: Cleaned input DataFrame.
+            feature_config: Configuration from get_feature_config().
+        
+        Returns:
+            Hexadecimal cache key.
+        """
+        return hash_config({
+            'data': hash_dataframe(df),
+            'config': feature_config
+        })
+    
+    def _entry_dir(self, key: str) -> Path:
+        """Return the directory holding a cache entry."""
+        return self.store_dir / key
+    
+    def contains(self, key: str, datasets: Optional[List[str]] = None) -> bool:
+        """
+        Check whether a cache entry exists.
+        
+        Args:
+            key: Cache key.
+            datasets: Dataset names that must be present. If None, only the
+                     manifest is checked.
+        
+        Returns:
+            True if the entry (and requested datasets) exists.
+        """
+        entry_dir = self._entry_dir(key)
+        if not (entry_dir / self.manifest_name).exists():
+            return False
+        
+        datasets = datasets or []
+        return all((entry_dir / f'{name}.parquet').exists() for name in datasets)
+    
+    def load(
+        self,
+        key: str,
+        dataset: str = 'wide',
+        columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Load a cached dataset, reading only the requested columns.
+        
+        Args:
+            key: Cache key.
+            dataset: Name of the dataset to load.
+            columns: Optional list of columns to read. If None, reads all.
+        
+        Returns:
+            Cached DataFrame.
+        
+        Raises:
+            KeyError: If the entry or dataset is not in the store.
+        """
+        filepath = self._entry_dir(key) / f'{dataset}.parquet'
+        if not filepath.exists():
+            raise KeyError(f"Dataset '{dataset}' not found in feature store for key {key}")
+        
+        return read_parquet(filepath, columns=columns)
+    
+    def save(
+        self,
+        key: str,
+        datasets: Dict[str, pd.DataFrame],
+        feature_config: Dict
+    ) -> Path:
+        """
+        Persist engineered datasets under a cache key.
+        
+        Args:
+            key: Cache key.
+            datasets: Dictionary of engineered DataFrames.
+            feature_config: Configuration that produced the datasets.
+        
+        Returns:
+            Path to the cache entry directory.
+        """
+        entry_dir = self._entry_dir(key)
+        entry_dir.mkdir(parents=True, exist_ok=True)
+        
+        for name, df in datasets.items():
+            write_parquet_atomic(df, entry_dir / f'{name}.parquet')
+        
+        # Manifest is written last so a partially written entry is never a hit
+        manifest = {
+            'key': key,
+            'created': datetime.now().isoformat(),
+            'config': feature_config,
+            'datasets': {
+                name: {'records': len(df), 'columns': [str(col) for col in df.columns]}
+                for name, df in datasets.items()
+            }
+        }
+        write_json_atomic(manifest, entry_dir / self.manifest_name)
+        
+        return entry_dir
+    
+    def get_manifest(self, key: str) -> Dict:
+        """
+        Get the manifest for a cache entry.
+        
+        Args:
+            key: Cache key.
+        
+        Returns:
+            Manifest dictionary.
+        """
+        with open(self._entry_dir(key) / self.manifest_name) as f:
+            return json.load(f)
+    
+    def get_or_compute(
+        self,
+        df: pd.DataFrame,
+        columns: Optional[Dict[str, List[str]]] = None,
+        datasets: Optional[List[str]] = None,
+        profile: Optional[PipelineProfiler] = None,
+        compute: Optional[Callable[[], Dict[str, pd.DataFrame]]] = None,
+        **feature_kwargs
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Return engineered datasets from the store, computing them on a miss.
+        
+        Args:
+            df: Cleaned input DataFrame.
+            columns: Optional mapping of dataset name to the columns to read.
+            datasets: Dataset names to return. If None, returns all.
+            profile: Optional profiler; each dataset is measured as an
+                    'engineer' stage view, whether computed or loaded.
+            compute: Optional function producing the datasets on a miss (e.g.
+                    a parallel run); it must apply the same feature flags.
+                    Defaults to engineer_nhanes_features().
+            **feature_kwargs: Feature flags passed to engineer_nhanes_features().
+        
+        Returns:
+            Dictionary of engineered DataFrames.
+        """
+        feature_config = self.get_feature_config(**feature_kwargs)
+        key = self.make_key(df, feature_config)
+        columns = columns or {}
+        profile = profile or PipelineProfiler()
+        
+        if not self.contains(key, datasets):
+            if compute is not None:
+                engineered = compute()
+            else:
+                engineered = engineer_nhanes_features(
+                    df, engineer=self.engineer, profile=profile, **feature_kwargs
+                )
+            self.save(key, engineered, feature_config)
+            
+            datasets = datasets or list(engineered.keys())
+            return {
+                name: engineered[name][columns[name]] if name in columns else engineered[name]
+                for name in datasets
+            }
+        
+        datasets = datasets or list(self.get_manifest(key)['datasets'].keys())
+        loaded = {}
+        for name in datasets:
+            with profile.measure('engineer', name, rows_in=len(df)) as record:
+                loaded[name] = self.load(key, name, columns.get(name))
+                record['rows_out'] = len(loaded[name])
+        
+        return loaded
+    
+    def list_entries(self) -> List[str]:
+        """
+        List the cache keys currently in the store.
+        
+        Returns:
+            List of cache keys.
+        """
+        if not self.store_dir.exists():
+            return []
+        
+        return sorted(
+            entry.name for entry in self.store_dir.iterdir()
+            if (entry / self.manifest_name).exists()
+        )
+    
+    def clear(self, keep: Optional[List[str]] = None) -> int:
+        """
+        Remove cache entries from the store.
+        
+        Args:
+            keep: Optional list of cache keys to keep.
+        
+        Returns:
+            Number of entries removed.
+        """
+        keep = set(keep or [])
+        removed = 0
+        
+        for key in self.list_entries():
+            if key not in keep:
+                shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+                removed += 1
+        
+        return removed
+
+
+def engineer_nhanes_features_cached(
+    df: pd.DataFrame,
+    store_dir: Union[str, Path],
+    columns: Optional[Dict[str, List[str]]] = None,
+    engineer: Optional[NHANESFeatureEngineer] = None,
+    **feature_kwargs
+) -> Dict[str, pd.DataFrame]:
+    """
+    Convenience function to engineer NHANES features through a feature store.
+    
+    Args:
+        df: Cleaned NHANES DataFrame with wide-format PTA data.
+        store_dir: Directory of the feature store.
+        columns: Optional mapping of dataset name to the columns to read.
+        engineer: Optional feature engineer with custom thresholds.
+        **feature_kwargs: Feature flags passed to engineer_nhanes_features().
+    
+    Returns:
+        Dictionary containing the engineered datasets.
+    """
+    store = NHANESFeatureStore(store_dir, engineer=engineer)
+    return store.get_or_compute(df, columns=columns, **feature_kwargs)
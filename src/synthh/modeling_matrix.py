@@ -0,0 +1,190 @@
+"""
+NHANES Modeling Matrix Module
+
+This module builds the dense numeric matrix consumed by the synthetic data
+generators and evaluation code. The matrix is a single C-contiguous
+float32/float64 array (optionally a read-only memory-mapped .npy file) with
+a fixed column order, cached against the version of the engineered data so
+repeated requests return zero-copy views instead of fresh copies.
+"""
+
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache_utils import set_default_permissions
+
+
+def get_modeling_columns(df: pd.DataFrame) -> List[str]:
+    """
+    Get the modeling column schema of a frame.
+    
+    Numeric columns are kept in frame order; columns that are entirely
+    missing are dropped.
+    
+    Args:
+        df: Engineered DataFrame.
+    
+    Returns:
+        Ordered list of modeling columns.
+    """
+    numeric_df = df.select_dtypes(include=[np.number])
+    return [col for col in numeric_df.columns if numeric_df[col].notna().any()]
+
+
+def build_modeling_matrix(
+    df: pd.DataFrame,
+    columns: Optional[List[str]] = None,
+    dtype: Union[str, np.dtype] = np.float32,
+    filepath: Optional[Union[str, Path]] = None
+) -> np.ndarray:
+    """
+    Build a read-only C-contiguous modeling matrix.
+    
+    Args:
+        df: Engineered DataFrame.
+        columns: Column order of the matrix. Defaults to get_modeling_columns(df).
+        dtype: Floating point dtype of the matrix.
+        filepath: Optional .npy path. If given, the matrix is written to a
+                 temporary file that then replaces filepath, and is returned
+                 as a read-only memory map. Earlier maps of the same path keep
+                 the previous file's data.
+    
+    Returns:
+        Array of shape (n_records, n_columns) with missing values as NaN.
+    
+    Raises:
+        KeyError: If a schema column is missing from the frame.
+    """
+    columns = columns if columns is not None else get_modeling_columns(df)
+    missing = [col for col in columns if col not in df.columns]
+    if missing:
+        raise KeyError(f"Modeling columns not found in data: {missing}")
+    
+    shape = (len(df), len(columns))
+    if filepath is None:
+        matrix = np.empty(shape, dtype=dtype, order='C')
+        for col_idx, col in enumerate(columns):
+            matrix[:, col_idx] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        
+        matrix.flags.writeable = False
+        return matrix
+    
+    # Never rewrite a file that earlier read-only maps may still use: build
+    # a new file and swap it in, so existing maps keep the old inode
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+    os.close(fd)
+    try:
+        matrix = np.lib.format.open_memmap(tmp_path, mode='w+', dtype=dtype, shape=shape)
+        for col_idx, col in enumerate(columns):
+            matrix[:, col_idx] = df[col].to_numpy(dtype=np.float64, na_value=np.nan)
+        matrix.flush()
+        del matrix
+        
+        set_default_permissions(tmp_path)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    return np.load(filepath, mmap_mode='r')
+
+
+class ModelingMatrixCache:
+    """
+    A cache of modeling matrices keyed by dataset, dtype and schema.
+    
+    Each entry remembers the data version and (through a weak reference)
+    the frame it was built from; a request against the same version and
+    frame returns a view of the cached array, and a new version or another
+    frame rebuilds it. A weak reference never matches a frame created after
+    the original was garbage collected, as a reused id() could.
+    """
+    
+    def __init__(self):
+        """Initialize an empty cache."""
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(
+        self,
+        df: pd.DataFrame,
+        version: int,
+        dataset: str = 'modeling',
+        columns: Optional[List[str]] = None,
+        dtype: Union[str, np.dtype] = np.float32,
+        filepath: Optional[Union[str, Path]] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Get a modeling matrix, building it only if the data has changed.
+        
+        Args:
+            df: Engineered DataFrame for the dataset.
+            version: Version counter of the engineered data.
+            dataset: Dataset name.
+            columns: Optional fixed column order.
+            dtype: Floating point dtype of the matrix.
+            filepath: Optional .npy path for a memory-mapped matrix.
+        
+        Returns:
+            Tuple of (read-only matrix view, column schema).
+        """
+        dtype = np.dtype(dtype)
+        key = (
+            dataset,
+            dtype.str,
+            tuple(columns) if columns is not None else None,
+            str(filepath) if filepath is not None else None
+        )
+        
+        entry = self._entries.get(key)
+        if entry is not None and entry['version'] == version and entry['frame_ref']() is df:
+            self.hits += 1
+            return entry['matrix'].view(), list(entry['columns'])
+        
+        self.misses += 1
+        
+        # Matrices of older data versions can no longer be requested
+        self._entries = {
+            cached_key: cached for cached_key, cached in self._entries.items()
+            if cached['version'] == version
+        }
+        
+        schema = list(columns) if columns is not None else get_modeling_columns(df)
+        matrix = build_modeling_matrix(df, schema, dtype=dtype, filepath=filepath)
+        
+        self._entries[key] = {
+            'version': version,
+            'frame_ref': weakref.ref(df),
+            'matrix': matrix,
+            'columns': schema
+        }
+        
+        return matrix.view(), list(schema)
+    
+    def clear(self) -> None:
+        """Drop all cached matrices."""
+        self._entries = {}
+    
+    def info(self) -> Dict:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with entry count, cached bytes, hits and misses.
+        """
+        return {
+            'entries': len(self._entries),
+            'nbytes': sum(entry['matrix'].nbytes for entry in self._entries.values()),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -0,0 +1,368 @@
+"""
+NHANES Normative Percentile Table Module
+
+This module provides age- and sex-specific normative tables for hearing
+thresholds. Survey-weighted percentile grids are computed once per
+age band x sex x ear x frequency x threshold level, stored compactly, and
+used to convert millions of thresholds to percentiles through binned
+indexing instead of per-call group-bys.
+"""
+
+import warnings
+from pathlib import Path
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .data_loader import MEC_WEIGHT_COLUMN
+from .feature_engineering import NHANESFeatureEngineer
+
+
+class NormativePercentileTable:
+    """
+    A precomputed table of normative hearing threshold percentiles.
+    
+    The table holds, for every (age band, sex, ear, frequency) cell, the
+    weighted mid-rank percentile of each threshold level on the audiometric
+    grid. Scoring a threshold is a single array lookup.
+    """
+    
+    def __init__(
+        self,
+        engineer: Optional[NHANESFeatureEngineer] = None,
+        age_edges: Optional[List[float]] = None,
+        level_min: float = -20,
+        level_max: float = 120,
+        level_step: float = 5
+    ):
+        """
+        Initialize an empty normative table.
+        
+        Args:
+            engineer: Feature engineer defining frequency and ear order. A
+                     default engineer is used if None.
+            age_edges: Lower edges of the age bands in years. The last band
+                      is open-ended.
+            level_min: Lowest threshold level on the grid (dB HL).
+            level_max: Highest threshold level on the grid (dB HL).
+            level_step: Grid spacing in dB (audiometric 5 dB steps).
+        """
+        self.engineer = engineer or NHANESFeatureEngineer()
+        self.age_edges = np.asarray(
+            age_edges if age_edges is not None else [12, 20, 30, 40, 50, 60, 70, 80],
+            dtype=np.float64
+        )
+        self.sex_labels = ['Male', 'Female']
+        self.level_min = level_min
+        self.level_step = level_step
+        self.levels = np.arange(level_min, level_max + level_step, level_step, dtype=np.float32)
+        
+        self.table = None   # (age, sex, ear, frequency, level) percentiles, float32
+        self.counts = None  # (age, sex, ear, frequency) unweighted sample sizes
+        self.weight_column = None
+    
+    @property
+    def shape(self) -> tuple:
+        """Shape of the percentile grid."""
+        return (
+            len(self.age_edges), len(self.sex_labels), len(self.engineer.ears),
+            len(self.engineer.frequency_labels), len(self.levels)
+        )
+    
+    def age_band_index(self, ages: np.ndarray) -> np.ndarray:
+        """
+        Map ages to age band indices.
+        
+        Args:
+            ages: Array of ages in years.
+        
+        Returns:
+            Integer array of band indices (-1 for missing or below the first band).
+        """
+        ages = np.asarray(ages, dtype=np.float64)
+        band = np.searchsorted(self.age_edges, ages, side='right') - 1
+        return np.where(np.isnan(ages), -1, band)
+    
+    def sex_index(self, sexes: Union[np.ndarray, pd.Series]) -> np.ndarray:
+        """
+        Map sex labels ('Male'/'Female') or NHANES RIAGENDR codes (1/2) to indices.
+        
+        Args:
+            sexes: Array of sex labels or codes.
+        
+        Returns:
+            Integer array of sex indices (-1 for missing or unknown).
+        """
+        sexes = pd.Series(np.asarray(sexes))
+        
+        if pd.api.types.is_numeric_dtype(sexes):
+            codes = sexes.to_numpy(dtype=np.float64) - 1
+            valid = np.isin(codes, [0, 1])
+            return np.where(valid, np.nan_to_num(codes), -1).astype(np.int64)
+        
+        categorical = pd.Categorical(sexes, categories=self.sex_labels)
+        return categorical.codes.astype(np.int64)
+    
+    def level_index(self, thresholds: np.ndarray) -> np.ndarray:
+        """
+        Map thresholds to the nearest level on the audiometric grid.
+        
+        Args:
+            thresholds: Array of thresholds in dB HL.
+        
+        Returns:
+            Integer array of level indices (clipped to the grid).
+        """
+        idx = np.rint((np.nan_to_num(thresholds) - self.level_min) / self.level_step)
+        return np.clip(idx, 0, len(self.levels) - 1).astype(np.int64)
+    
+    def build(
+        self,
+        df: pd.DataFrame,
+        weight_column: Optional[str] = 'auto',
+        age_column: str = 'Age (years)',
+        sex_column: str = 'Gender'
+    ) -> 'NormativePercentileTable':
+        """
+        Build the percentile grid from cleaned NHANES data.
+        
+        All cells are filled with one weighted histogram (np.bincount) over
+        the flattened (age, sex, ear, frequency, level) index, followed by a
+        cumulative sum along the level axis.
+        
+        Args:
+            df: Cleaned wide-format DataFrame with PTA and demographic data.
+            weight_column: Survey weight column. 'auto' uses the MEC exam
+                          weight (WTMEC2YR, loaded by NHANESDataLoader) when
+                          every record has one, and otherwise weights records
+                          equally with a warning. None weights records
+                          equally. Records without a weight in an explicitly
+                          named column are left out.
+            age_column: Name of the age column.
+            sex_column: Name of the sex column (labels or RIAGENDR codes).
+        
+        Returns:
+            Self for method chaining.
+        
+        Raises:
+            KeyError: If a named weight column is not in the frame.
+        """
+        if weight_column == 'auto':
+            weight_column = self._resolve_weight_column(df)
+        elif weight_column is not None and weight_column not in df.columns:
+            raise KeyError(f"Weight column {weight_column} not found in data")
+        
+        n_age, n_sex, n_ear, n_freq, n_level = self.shape
+        
+        thresholds = self.engineer.to_threshold_array(df, dtype=np.float64)
+        age_idx = self.age_band_index(df[age_column].to_numpy(dtype=np.float64, na_value=np.nan))
+        sex_idx = self.sex_index(df[sex_column])
+        
+        if weight_column is not None:
+            weights = df[weight_column].to_numpy(dtype=np.float64, na_value=np.nan)
+        else:
+            weights = np.ones(len(df), dtype=np.float64)
+        
+        # Broadcast record-level indices over ears and frequencies
+        ear_idx = np.arange(n_ear)[None, :, None]
+        freq_idx = np.arange(n_freq)[None, None, :]
+        cell_idx = ((age_idx[:, None, None] * n_sex + sex_idx[:, None, None]) * n_ear + ear_idx) * n_freq + freq_idx
+        flat_idx = cell_idx * n_level + self.level_index(thresholds)
+        
+        valid = (
+            ~np.isnan(thresholds)
+            & (age_idx >= 0)[:, None, None]
+            & (sex_idx >= 0)[:, None, None]
+            & ~np.isnan(weights)[:, None, None]
+        )
+        record_weights = np.broadcast_to(weights[:, None, None], thresholds.shape)
+        
+        size = n_age * n_sex * n_ear * n_freq * n_level
+        histogram = np.bincount(flat_idx[valid], weights=record_weights[valid], minlength=size)
+        histogram = histogram.reshape(self.shape)
+        
+        counts = np.bincount(cell_idx[valid], minlength=size // n_level)
+        self.counts = counts.reshape(self.shape[:-1]).astype(np.int32)
+        
+        # Weighted mid-rank percentile of each level
+        total = histogram.sum(axis=-1, keepdims=True)
+        below = np.cumsum(histogram, axis=-1) - histogram
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table = 100 * (below + 0.5 * histogram) / total
+        
+        self.table = table.astype(np.float32)
+        self.weight_column = weight_column
+        
+        return self
+    
+    @staticmethod
+    def _resolve_weight_column(df: pd.DataFrame) -> Optional[str]:
+        """Get the MEC weight column if every record has a weight, else None."""
+        if MEC_WEIGHT_COLUMN not in df.columns:
+            return None
+        
+        n_missing = int(df[MEC_WEIGHT_COLUMN].isna().sum())
+        if n_missing:
+            warnings.warn(
+                f"{n_missing} of {len(df)} records have no {MEC_WEIGHT_COLUMN} survey weight; "
+                f"building an unweighted table"
+            )
+            return None
+        
+        return MEC_WEIGHT_COLUMN
+    
+    def lookup(
+        self,
+        thresholds: np.ndarray,
+        ages: np.ndarray,
+        sexes: Union[np.ndarray, pd.Series]
+    ) -> np.ndarray:
+        """
+        Convert thresholds to normative percentiles.
+        
+        Args:
+            thresholds: Threshold tensor of shape (N, 2, 5).
+            ages: Array of N ages in years.
+            sexes: Array of N sex labels or RIAGENDR codes.
+        
+        Returns:
+            Float32 array of shape (N, 2, 5) with percentiles (NaN where the
+            threshold, age or sex is missing).
+        
+        Raises:
+            RuntimeError: If the table has not been built or loaded.
+        """
+        if self.table is None:
+            raise RuntimeError("Normative table not available. Call build() or load() first.")
+        
+        thresholds = np.asarray(thresholds)
+        n_ear, n_freq = self.shape[2:4]
+        
+        age_idx = self.age_band_index(ages)[:, None, None]
+        sex_idx = self.sex_index(sexes)[:, None, None]
+        
+        percentiles = self.table[
+            np.maximum(age_idx, 0),
+            np.maximum(sex_idx, 0),
+            np.arange(n_ear)[None, :, None],
+            np.arange(n_freq)[None, None, :],
+            self.level_index(thresholds)
+        ]
+        
+        invalid = np.isnan(thresholds) | (age_idx < 0) | (sex_idx < 0)
+        percentiles[invalid] = np.nan
+        
+        return percentiles
+    
+    def score_dataframe(
+        self,
+        df: pd.DataFrame,
+        age_column: str = 'Age (years)',
+        sex_column: str = 'Gender'
+    ) -> pd.DataFrame:
+        """
+        Score a wide-format PTA DataFrame against the normative table.
+        
+        Args:
+            df: Wide-format DataFrame with PTA and demographic data.
+            age_column: Name of the age column.
+            sex_column: Name of the sex column.
+        
+        Returns:
+            DataFrame with one percentile column per ear and frequency.
+        """
+        percentiles = self.lookup(
+            self.engineer.to_threshold_array(df),
+            df[age_column].to_numpy(dtype=np.float64, na_value=np.nan),
+            df[sex_column]
+        )
+        
+        scores = {}
+        for ear_idx, ear in enumerate(self.engineer.ears):
+            for freq_idx, freq in enumerate(self.engineer.frequency_labels):
+                scores[f'{freq} {ear} Percentile'] = percentiles[:, ear_idx, freq_idx]
+        
+        return pd.DataFrame(scores, index=df.index)
+    
+    def save(self, filepath: Union[str, Path]) -> Path:
+        """
+        Save the table to a compressed .npz file.
+        
+        Args:
+            filepath: Destination file path.
+        
+        Returns:
+            Path of the written file.
+        
+        Raises:
+            RuntimeError: If the table has not been built or loaded.
+        """
+        if self.table is None:
+            raise RuntimeError("Normative table not available. Call build() or load() first.")
+        
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        
+        np.savez_compressed(
+            filepath,
+            table=self.table,
+            counts=self.counts,
+            age_edges=self.age_edges,
+            levels=self.levels,
+            level_step=np.float32(self.level_step),
+            sex_labels=np.array(self.sex_labels),
+            ears=np.array(self.engineer.ears),
+            frequency_labels=np.array(self.engineer.frequency_labels),
+            weight_column=np.array(self.weight_column or '')
+        )
+        
+        return filepath
+    
+    @classmethod
+    def load(cls, filepath: Union[str, Path]) -> 'NormativePercentileTable':
+        """
+        Load a table saved with save().
+        
+        Args:
+            filepath: Path to the .npz file.
+        
+        Returns:
+            Loaded NormativePercentileTable.
+        """
+        with np.load(filepath) as data:
+            levels = data['levels']
+            table = cls(
+                age_edges=data['age_edges'].tolist(),
+                level_min=float(levels[0]),
+                level_max=float(levels[-1]),
+                level_step=float(data['level_step'])
+            )
+            table.engineer.ears = data['ears'].tolist()
+            table.engineer.frequency_labels = data['frequency_labels'].tolist()
+            table.sex_labels = data['sex_labels'].tolist()
+            table.table = data['table']
+            table.counts = data['counts']
+            table.weight_column = str(data['weight_column']) or None
+        
+        return table
+
+
+def build_normative_table(
+    df: pd.DataFrame,
+    weight_column: Optional[str] = 'auto',
+    age_edges: Optional[List[float]] = None
+) -> NormativePercentileTable:
+    """
+    Convenience function to build a normative percentile table.
+    
+    Args:
+        df: Cleaned wide-format NHANES DataFrame with PTA and demographics.
+        weight_column: Survey weight column; 'auto' uses the MEC exam weight
+                      when present (see NormativePercentileTable.build()).
+        age_edges: Optional lower edges of the age bands.
+    
+    Returns:
+        Built NormativePercentileTable.
+    """
+    return NormativePercentileTable(age_edges=age_edges).build(df, weight_column=weight_column)
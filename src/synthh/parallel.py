@@ -0,0 +1,330 @@
+"""
+NHANES Parallel Execution Module
+
+This module provides process-parallel execution of the cleaning and feature
+engineering stages. Records are split into contiguous shards (one per
+cohort or fixed row blocks), each shard is processed in a worker process,
+and results are merged back in shard order so the output matches a serial
+run. Quality reports are merged from per-shard partial statistics.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_cleaner import NHANESDataCleaner, clean_nhanes_data
+from .feature_engineering import NHANESFeatureEngineer, engineer_wide_features
+from .profiling import PipelineProfiler
+
+
+def get_shard_bounds(
+    df: pd.DataFrame,
+    shard_by: str = 'cohort',
+    n_shards: int = 1,
+    cohort_column: str = 'Cohort'
+) -> List[Tuple[int, int]]:
+    """
+    Split a frame into contiguous row ranges.
+    
+    Args:
+        df: DataFrame to shard.
+        shard_by: 'cohort' for one shard per contiguous run of the cohort
+                 column, or 'rows' for n_shards equally sized blocks. Falls
+                 back to 'rows' if the cohort column is missing.
+        n_shards: Number of row blocks (for 'rows').
+        cohort_column: Name of the cohort column.
+    
+    Returns:
+        List of (start, stop) positional row ranges covering the frame.
+    
+    Raises:
+        ValueError: If shard_by is not recognised.
+    """
+    if shard_by not in ('cohort', 'rows'):
+        raise ValueError(f"Unknown shard_by '{shard_by}'. Use 'cohort' or 'rows'")
+    
+    n_rows = len(df)
+    if n_rows == 0:
+        return [(0, 0)]
+    
+    if shard_by == 'cohort' and cohort_column in df.columns:
+        codes = pd.factorize(df[cohort_column])[0]
+        starts = np.concatenate([[0], np.flatnonzero(np.diff(codes)) + 1])
+    else:
+        starts = np.linspace(0, n_rows, max(1, min(n_shards, n_rows)) + 1).astype(int)[:-1]
+    
+    stops = np.append(starts[1:], n_rows)
+    return [(int(start), int(stop)) for start, stop in zip(starts, stops)]
+
+
+def _clean_shard(args: Tuple[pd.DataFrame, Dict]) -> Tuple[pd.DataFrame, Dict]:
+    """Clean one shard in a worker process."""
+    df, clean_kwargs = args
+    return clean_nhanes_data(df, **clean_kwargs)
+
+
+def _engineer_shard(args: Tuple[pd.DataFrame, NHANESFeatureEngineer, Dict]) -> pd.DataFrame:
+    """Engineer wide-format features for one shard in a worker process."""
+    df, engineer, feature_kwargs = args
+    return engineer_wide_features(df, engineer, **feature_kwargs)
+
+
+def _offset_indices(indices: List, offset: int) -> List:
+    """Shift positional record indices by a shard offset."""
+    return [idx + offset for idx in indices]
+
+
+def _merge_range_validation(validations: List[Dict], offsets: List[int], columns: List[str]) -> Dict:
+    """Merge range validation results from shards."""
+    merged = {key: [] for key in validations[0]}
+    threshold_outliers = {}
+    
+    for validation, offset in zip(validations, offsets):
+        for issue in validation['threshold_outliers']:
+            column_issue = threshold_outliers.setdefault(
+                issue['column'], {'column': issue['column'], 'count': 0, 'values': []}
+            )
+            column_issue['count'] += issue['count']
+            column_issue['values'].extend(issue['values'])
+        
+        merged['age_outliers'].extend(validation['age_outliers'])
+        merged['missing_seqn'].extend(_offset_indices(validation['missing_seqn'], offset))
+        merged['invalid_gender'].extend(validation['invalid_gender'])
+        merged['invalid_ethnicity'].extend(validation['invalid_ethnicity'])
+    
+    # Report columns in frame order, as a serial run does
+    merged['threshold_outliers'] = [threshold_outliers[col] for col in columns if col in threshold_outliers]
+    return merged
+
+
+def _merge_missing_data(missing: List[Dict], df: pd.DataFrame) -> Dict:
+    """Merge missing data assessments from shards."""
+    missing_by_column = sum(stats['missing_by_column'] for stats in missing)
+    
+    merged = {
+        'total_missing': sum(stats['total_missing'] for stats in missing),
+        'missing_by_column': missing_by_column,
+        'missing_percentage': (missing_by_column / len(df) * 100).round(2),
+        'complete_cases': sum(stats['complete_cases'] for stats in missing),
+        'incomplete_cases': sum(stats['incomplete_cases'] for stats in missing)
+    }
+    
+    # Pattern frequencies are truncated per shard, so rank them on the merged frame
+    if merged['total_missing'] > 0:
+        merged['missing_patterns'] = df.isnull().value_counts().head(10)
+    
+    return merged
+
+
+def _merge_audiometric_validation(
+    validations: List[Dict],
+    offsets: List[int],
+    frequencies: List[str]
+) -> Dict:
+    """Merge audiometric pattern validation results from shards."""
+    asymmetry = {}
+    unusual_configurations = []
+    
+    for validation, offset in zip(validations, offsets):
+        for issue in validation['implausible_asymmetry']:
+            freq_issue = asymmetry.setdefault(
+                issue['frequency'], {'frequency': issue['frequency'], 'cases': []}
+            )
+            freq_issue['cases'].extend(_offset_indices(issue['cases'], offset))
+        
+        for issue in validation['unusual_configurations']:
+            unusual_configurations.append({**issue, 'index': issue['index'] + offset})
+    
+    return {
+        'implausible_asymmetry': [asymmetry[freq] for freq in frequencies if freq in asymmetry],
+        'unusual_configurations': unusual_configurations,
+        'inconsistent_thresholds': [
+            issue for validation in validations for issue in validation['inconsistent_thresholds']
+        ]
+    }
+
+
+def merge_data_quality_reports(
+    reports: List[Dict],
+    offsets: List[int],
+    df: pd.DataFrame,
+    cleaner: Optional[NHANESDataCleaner] = None
+) -> Dict:
+    """
+    Merge per-shard data quality reports into the report of the whole frame.
+    
+    Counts and issue lists are combined from the shard reports, with record
+    indices shifted by each shard's offset. Order statistics (IQR outliers,
+    summary statistics, top missingness patterns) cannot be combined from
+    shard summaries and are recomputed on the merged frame.
+    
+    Args:
+        reports: Reports from NHANESDataCleaner.generate_data_quality_report(),
+                in shard order.
+        offsets: Offset added to each shard's record indices.
+        df: The merged frame the reports describe.
+        cleaner: Data cleaner used for the recomputed statistics.
+    
+    Returns:
+        Merged quality report with the same structure as a serial report.
+    """
+    cleaner = cleaner or NHANESDataCleaner()
+    pta_columns = [col for col in df.columns if 'kHz' in col]
+    
+    merged = {
+        'dataset_info': {
+            'total_records': sum(report['dataset_info']['total_records'] for report in reports),
+            'total_columns': reports[0]['dataset_info']['total_columns'],
+            'pta_columns': reports[0]['dataset_info']['pta_columns']
+        },
+        'range_validation': _merge_range_validation(
+            [report['range_validation'] for report in reports], offsets, pta_columns
+        ),
+        'missing_data': _merge_missing_data([report['missing_data'] for report in reports], df),
+        'statistical_outliers': cleaner.detect_statistical_outliers(df),
+        'audiometric_validation': _merge_audiometric_validation(
+            [report['audiometric_validation'] for report in reports], offsets,
+            NHANESFeatureEngineer().frequency_labels
+        )
+    }
+    
+    if pta_columns:
+        merged['summary_statistics'] = df[pta_columns].describe()
+    
+    return merged
+
+
+def clean_datasets_parallel(
+    datasets: Dict[str, pd.DataFrame],
+    shard_bounds: List[Tuple[int, int]],
+    n_workers: int,
+    **clean_kwargs
+) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Dict]]:
+    """
+    Clean several row-aligned dataset views in a process pool.
+    
+    All views are sharded with the same row ranges and their shards are
+    submitted to a single pool, so every worker stays busy across views.
+    
+    Args:
+        datasets: Dictionary of row-aligned DataFrames to clean.
+        shard_bounds: Positional (start, stop) row ranges from get_shard_bounds().
+        n_workers: Number of worker processes.
+        **clean_kwargs: Arguments passed to clean_nhanes_data().
+    
+    Returns:
+        Tuple of (cleaned datasets, quality reports) matching a serial run.
+    
+    Raises:
+        ValueError: If the 'impute' strategy is requested, since imputed
+                   values depend on statistics of the whole frame.
+    """
+    if clean_kwargs.get('missing_strategy') == 'impute':
+        raise ValueError("The 'impute' missing strategy cannot be run per shard")
+    
+    tasks = [
+        (df.iloc[start:stop], clean_kwargs)
+        for df in datasets.values()
+        for start, stop in shard_bounds
+    ]
+    
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        results = list(executor.map(_clean_shard, tasks))
+    
+    cleaner = NHANESDataCleaner()
+    cleaned_datasets = {}
+    quality_reports = {}
+    n_shards = len(shard_bounds)
+    
+    for view_idx, (dataset_name, df) in enumerate(datasets.items()):
+        shard_results = results[view_idx * n_shards:(view_idx + 1) * n_shards]
+        cleaned_shards = [cleaned_df for cleaned_df, _ in shard_results]
+        shard_reports = [report for _, report in shard_results]
+        
+        cleaned_df = pd.concat(cleaned_shards, ignore_index=True)
+        
+        # Initial reports index the input frame by label; cleaned shards are renumbered
+        initial_offsets = [0] * n_shards
+        final_offsets = np.concatenate([[0], np.cumsum([len(shard) for shard in cleaned_shards])[:-1]])
+        
+        records_before = len(df)
+        records_after = len(cleaned_df)
+        
+        cleaned_datasets[dataset_name] = cleaned_df
+        quality_reports[dataset_name] = {
+            'initial': merge_data_quality_reports(
+                [report['initial'] for report in shard_reports], initial_offsets, df, cleaner
+            ),
+            'final': merge_data_quality_reports(
+                [report['final'] for report in shard_reports],
+                [int(offset) for offset in final_offsets], cleaned_df, cleaner
+            ),
+            'cleaning_summary': {
+                'records_before': records_before,
+                'records_after': records_after,
+                'records_removed': records_before - records_after,
+                'removal_rate': (records_before - records_after) / records_before * 100
+            }
+        }
+    
+    return cleaned_datasets, quality_reports
+
+
+def engineer_features_parallel(
+    df: pd.DataFrame,
+    n_workers: int,
+    engineer: Optional[NHANESFeatureEngineer] = None,
+    shard_by: str = 'rows',
+    profile: Optional[PipelineProfiler] = None,
+    **feature_kwargs
+) -> Dict[str, pd.DataFrame]:
+    """
+    Engineer features in a process pool over shards.
+    
+    Wide-format features are computed per record, so workers run only the
+    wide-feature steps on their shard; the long-format and modeling datasets
+    are derived once in the parent process so their row order matches a
+    serial run.
+    
+    Args:
+        df: Cleaned wide-format DataFrame.
+        n_workers: Number of worker processes.
+        engineer: Optional feature engineer with custom thresholds.
+        shard_by: 'cohort' or 'rows' (see get_shard_bounds()).
+        profile: Optional profiler; each dataset is measured as an
+                'engineer' stage view.
+        **feature_kwargs: Arguments passed to engineer_wide_features().
+    
+    Returns:
+        Dictionary with 'wide', 'long' and 'modeling' datasets.
+    """
+    engineer = engineer or NHANESFeatureEngineer()
+    profile = profile or PipelineProfiler()
+    shard_bounds = get_shard_bounds(df, shard_by=shard_by, n_shards=n_workers)
+    
+    tasks = [(df.iloc[start:stop], engineer, feature_kwargs) for start, stop in shard_bounds]
+    
+    with profile.measure('engineer', 'wide', rows_in=len(df)) as record:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            wide_shards = list(executor.map(_engineer_shard, tasks))
+        
+        df_wide = pd.concat(wide_shards)
+        record['rows_out'] = len(df_wide)
+    
+    with profile.measure('engineer', 'long', rows_in=len(df)) as record:
+        df_long = engineer.wide_to_long_format(
+            df, include_demographics=feature_kwargs.get('include_demographics', True)
+        )
+        record['rows_out'] = len(df_long)
+    
+    with profile.measure('engineer', 'modeling', rows_in=len(df_wide)) as record:
+        df_modeling = df_wide.select_dtypes(include=[np.number]).copy()
+        record['rows_out'] = len(df_modeling)
+    
+    return {
+        'wide': df_wide,
+        'long': df_long,
+        'modeling': df_modeling
+    }
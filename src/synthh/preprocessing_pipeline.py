@@ -8,6 +8,7 @@ for synthetic data generation models.
 """
 
 import os
+import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
@@ -15,9 +16,17 @@ from typing import Dict, List, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
-from .data_loader import NHANESDataLoader, load_nhanes_data
+from .data_loader import MEC_WEIGHT_COLUMN, NHANESDataLoader, load_nhanes_data
 from .data_cleaner import NHANESDataCleaner, clean_nhanes_data  
 from .feature_engineering import NHANESFeatureEngineer, engineer_nhanes_features
+from .feature_store import NHANESFeatureStore
+from .cache_utils import hash_config, hash_dataframe, hash_file, to_json_safe, write_json_atomic
+from .checkpointing import CHECKPOINT_VERSION, PipelineCheckpointStore
+from .profiling import PipelineProfiler, profiling_requested
+from .export import AsyncDatasetWriter, DatasetExporter, StreamingDatasetWriter
+from .modeling_matrix import ModelingMatrixCache, get_modeling_columns
+from .parallel import clean_datasets_parallel, engineer_features_parallel, get_shard_bounds
+from .streaming import QualityReportAccumulator, compute_global_statistics, estimate_block_rows
 
 
 class NHANESPreprocessingPipeline:
@@ -49,6 +58,7 @@ class NHANESPreprocessingPipeline:
         self.loader = NHANESDataLoader(data_dir)
         self.cleaner = NHANESDataCleaner()
         self.engineer = NHANESFeatureEngineer()
+        self.exporter = DatasetExporter(self.output_dir)
         
         # Setup logging
         self._setup_logging(log_level)
@@ -58,6 +68,13 @@ class NHANESPreprocessingPipeline:
         self.cleaned_data = {}
         self.engineered_data = {}
         self.quality_reports = {}
+        self.stage_keys = {}
+        self.resumed_stages = []
+        self.exported_files = []
+        self.writer = None  # Background writer while an overlapped export runs
+        self.engineered_version = 0  # Bumped whenever engineered_data is replaced
+        self.stream_summary = {}  # Summary of the last streaming run
+        self.modeling_cache = ModelingMatrixCache()
         
         # Default pipeline configuration
         self.config = {
@@ -68,8 +85,40 @@ class NHANESPreprocessingPipeline:
             'hearing_loss_method': 'any_frequency',
             'include_clinical_features': True,
             'include_demographic_features': True,
+            'include_shape_features': False,
             'validate_patterns': True,
-            'export_formats': ['csv', 'parquet']
+            'export_formats': ['csv', 'parquet'],
+            'export_threads': 4,
+            'export_partition_by': 'Cohort',  # Parquet partition column (None to disable)
+            'async_export': False,  # Overlap export with feature engineering
+            'export_queue_size': 4,
+            'feature_store_dir': None,  # Feature store disabled by default
+            'checkpoint_dir': None,  # Stage checkpointing disabled by default
+            'profile': profiling_requested(),  # Or set SYNTHH_PROFILE=1
+            'profile_memory': True,
+            'n_workers': 1,  # Worker processes for cleaning and feature engineering
+            'shard_by': 'cohort',  # 'cohort' or 'rows'
+            'streaming': False,  # Process and export row blocks end to end
+            'memory_budget_mb': 256,  # Target memory per streamed block
+            'stream_block_rows': None  # Fixed block size (derived from the budget if None)
+        }
+        
+        # Per-stage instrumentation (records nothing unless enabled)
+        self.profile = PipelineProfiler(
+            enabled=self.config['profile'],
+            trace_memory=self.config['profile_memory']
+        )
+        
+        # Stage order and the configuration keys each stage depends on
+        self.stages = ['load', 'clean', 'engineer', 'export']
+        self.stage_config_keys = {
+            'load': [],
+            'clean': ['missing_strategy', 'round_thresholds', 'handle_outliers', 'validate_patterns'],
+            'engineer': [
+                'hearing_loss_method', 'include_clinical_features',
+                'include_demographic_features', 'include_shape_features'
+            ],
+            'export': ['export_formats', 'export_partition_by']
         }
     
     def _setup_logging(self, level: str):
@@ -91,9 +140,132 @@ class NHANESPreprocessingPipeline:
             Self for method chaining.
         """
         self.config.update(kwargs)
+        self.profile.enabled = self.config['profile']
+        self.profile.trace_memory = self.config['profile_memory']
         self.logger.info(f"Pipeline configured with: {kwargs}")
         return self
     
+    def _get_checkpoint_store(self) -> Optional[PipelineCheckpointStore]:
+        """Return the checkpoint store, or None if checkpointing is disabled."""
+        if not self.config['checkpoint_dir']:
+            return None
+        return PipelineCheckpointStore(self.config['checkpoint_dir'])
+    
+    def _hash_datasets(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+        """Hash in-memory datasets when no upstream stage key is available."""
+        return {name: hash_dataframe(df) for name, df in datasets.items()}
+    
+    def get_stage_key(self, stage: str, cohorts: Optional[List[str]] = None) -> str:
+        """
+        Compute the checkpoint key of a pipeline stage.
+        
+        The key combines the stage inputs with the subset of the configuration
+        the stage depends on. The load stage is keyed by the content of the
+        raw cohort files; later stages are keyed by the key of the stage that
+        produced their input (or by a hash of that input if it was not
+        produced by a keyed stage).
+        
+        Args:
+            stage: Stage name ('load', 'clean', 'engineer', 'export').
+            cohorts: Optional list of cohort suffixes (load stage only).
+            
+        Returns:
+            Hexadecimal stage key.
+        """
+        if stage not in self.stages:
+            raise ValueError(f"Unknown stage '{stage}'. Use one of {self.stages}")
+        
+        inputs = {
+            'version': CHECKPOINT_VERSION,
+            'stage': stage,
+            'config': {key: self.config[key] for key in self.stage_config_keys[stage]}
+        }
+        
+        if stage == 'load':
+            cohorts = cohorts or self.config['cohorts'] or self.loader.cohort_suffixes
+            inputs['cohorts'] = list(cohorts)
+            inputs['files'] = {
+                str(path): hash_file(path) if path.exists() else None
+                for cohort in cohorts
+                for path in self.loader.get_cohort_files(cohort)
+            }
+        else:
+            upstream = self.stages[self.stages.index(stage) - 1]
+            if upstream in self.stage_keys:
+                inputs['upstream'] = self.stage_keys[upstream]
+            else:
+                upstream_data = {
+                    'load': self.raw_data,
+                    'clean': self.cleaned_data,
+                    'engineer': self.engineered_data
+                }[upstream]
+                inputs['upstream'] = self._hash_datasets(upstream_data)
+        
+        if stage == 'engineer':
+            inputs['engineer'] = {
+                'hearing_loss_threshold': self.engineer.hearing_loss_threshold,
+                'hearing_loss_categories': {
+                    name: list(bounds)
+                    for name, bounds in self.engineer.hearing_loss_categories.items()
+                },
+                'frequency_labels': list(self.engineer.frequency_labels)
+            }
+        elif stage == 'export':
+            inputs['output_dir'] = str(self.output_dir.resolve())
+        
+        return hash_config(inputs)
+    
+    def _restore_stage(self, stage: str, key: str) -> Optional[Tuple[Dict, object]]:
+        """Load a stage checkpoint if one exists for the key."""
+        store = self._get_checkpoint_store()
+        if store is None or not store.has(stage, key):
+            return None
+        
+        self.logger.info(f"Resuming {stage} stage from checkpoint {key[:12]}")
+        self.resumed_stages.append(stage)
+        return store.load(stage, key)
+    
+    def _save_stage(
+        self,
+        stage: str,
+        key: str,
+        datasets: Optional[Dict[str, pd.DataFrame]] = None,
+        extras: Optional[object] = None,
+        metadata: Optional[Dict] = None
+    ):
+        """Write a stage checkpoint if checkpointing is enabled."""
+        store = self._get_checkpoint_store()
+        if store is not None:
+            store.save(stage, key, datasets, extras=extras, metadata=metadata)
+            self.logger.info(f"Saved {stage} checkpoint {key[:12]}")
+    
+    def clear_checkpoints(self, stage: Optional[str] = None) -> 'NHANESPreprocessingPipeline':
+        """
+        Remove stored stage checkpoints.
+        
+        Args:
+            stage: Stage whose checkpoints to remove. If None, removes all.
+            
+        Returns:
+            Self for method chaining.
+        """
+        store = self._get_checkpoint_store()
+        if store is not None:
+            store.clear(stage)
+        return self
+    
+    def _use_parallel(self, stage: str) -> bool:
+        """Check whether a stage should run in the process pool."""
+        if self.config['n_workers'] <= 1:
+            return False
+        
+        if stage == 'clean' and self.config['missing_strategy'] == 'impute':
+            # Imputed values depend on whole-frame statistics
+            self.logger.warning("The 'impute' missing strategy runs serially")
+            return False
+        
+        return True
+    
     def load_data(self, cohorts: Optional[List[str]] = None) -> 'NHANESPreprocessingPipeline':
         """
         Load raw NHANES data.
@@ -108,29 +280,69 @@ class NHANESPreprocessingPipeline:
         
         cohorts = cohorts or self.config['cohorts']
         
-        try:
-            # Load combined dataset
-            combined_df = self.loader.load_all_cohorts(cohorts)
-            combined_df = self.loader.create_clean_labels(combined_df)
-            
-            # Create different views of the data
-            self.raw_data = {
-                'combined': combined_df,
-                'pta': self.loader.get_pta_subset(combined_df, relabel=True),
-                'demo_pta': combined_df[
-                    ['SEQN'] + self.loader.get_standard_pta_columns() + 
-                    ['Gender', 'Age (years)', 'Race/ethnicity']
-                ].copy()
-            }
+        with self.profile.measure('load') as record:
+            if self.config['checkpoint_dir']:
+                key = self.get_stage_key('load', cohorts)
+                self.stage_keys['load'] = key
+                restored = self._restore_stage('load', key)
+                if restored is not None:
+                    self.raw_data = restored[0]
+                    record['rows_out'] = len(self.raw_data['combined'])
+                    return self
+        
+            try:
+                # Load combined dataset
+                combined_df = self.loader.load_all_cohorts(cohorts)
+                combined_df = self.loader.create_clean_labels(combined_df)
             
-            self.logger.info(f"Loaded {len(combined_df)} records from NHANES data")
+                # Create different views of the data
+                self.raw_data = self._build_views(combined_df)
+                record['rows_out'] = len(combined_df)
             
-        except Exception as e:
-            self.logger.error(f"Failed to load data: {e}")
-            raise
+                self.logger.info(f"Loaded {len(combined_df)} records from NHANES data")
+            
+                if self.config['checkpoint_dir']:
+                    self._save_stage('load', self.stage_keys['load'], self.raw_data)
+            
+            except Exception as e:
+                self.logger.error(f"Failed to load data: {e}")
+                raise
             
         return self
     
+    def _build_views(self, combined_df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """Create the combined, PTA-only and demographics+PTA views of the data."""
+        pta_df = self.loader.get_pta_subset(combined_df, relabel=True)
+        return {
+            'combined': combined_df,
+            'pta': pta_df,
+            'demo_pta': pd.concat([
+                combined_df[['SEQN']],
+                pta_df,
+                combined_df[['Gender', 'Age (years)', 'Race/ethnicity', MEC_WEIGHT_COLUMN, 'Cohort']]
+            ], axis=1)
+        }
+    
+    def _get_clean_kwargs(self) -> Dict:
+        """Get the clean_nhanes_data() arguments from the configuration."""
+        return {
+            'missing_strategy': self.config['missing_strategy'],
+            'round_thresholds': self.config['round_thresholds'],
+            'handle_outliers': self.config['handle_outliers'],
+            'validate_patterns': self.config['validate_patterns']
+        }
+    
+    def _get_feature_kwargs(self) -> Dict:
+        """Get the engineer_nhanes_features() arguments from the configuration."""
+        return {
+            'include_hearing_loss': True,
+            'include_clinical': self.config['include_clinical_features'],
+            'include_aggregated': True,
+            'include_demographics': self.config['include_demographic_features'],
+            'hearing_loss_method': self.config['hearing_loss_method'],
+            'include_shape': self.config['include_shape_features']
+        }
+    
     def clean_data(self) -> 'NHANESPreprocessingPipeline':
         """
         Clean and validate the loaded data.
@@ -143,32 +355,66 @@ class NHANESPreprocessingPipeline:
         if not self.raw_data:
             raise RuntimeError("No data loaded. Call load_data() first.")
         
-        try:
-            for dataset_name, df in self.raw_data.items():
-                self.logger.info(f"Cleaning {dataset_name} dataset...")
+        rows_in = len(self.raw_data['combined']) if 'combined' in self.raw_data else None
+        
+        with self.profile.measure('clean', rows_in=rows_in) as record:
+            if self.config['checkpoint_dir']:
+                key = self.get_stage_key('clean')
+                self.stage_keys['clean'] = key
+                restored = self._restore_stage('clean', key)
+                if restored is not None:
+                    self.cleaned_data, self.quality_reports = restored
+                    record['rows_out'] = len(self.cleaned_data.get('combined', []))
+                    return self
+        
+            try:
+                clean_kwargs = self._get_clean_kwargs()
                 
-                cleaned_df, quality_report = clean_nhanes_data(
-                    df,
-                    missing_strategy=self.config['missing_strategy'],
-                    round_thresholds=self.config['round_thresholds'],
-                    handle_outliers=self.config['handle_outliers'],
-                    validate_patterns=self.config['validate_patterns']
-                )
+                if self._use_parallel('clean'):
+                    # All views are row-aligned with the combined frame, which carries the cohort
+                    reference_df = self.raw_data.get('combined', next(iter(self.raw_data.values())))
+                    shard_bounds = get_shard_bounds(
+                        reference_df,
+                        shard_by=self.config['shard_by'],
+                        n_shards=self.config['n_workers']
+                    )
+                    self.logger.info(
+                        f"Cleaning {len(self.raw_data)} datasets in {len(shard_bounds)} shards "
+                        f"across {self.config['n_workers']} workers..."
+                    )
+                    self.cleaned_data, self.quality_reports = clean_datasets_parallel(
+                        self.raw_data, shard_bounds, self.config['n_workers'], **clean_kwargs
+                    )
+                else:
+                    for dataset_name, df in self.raw_data.items():
+                        self.logger.info(f"Cleaning {dataset_name} dataset...")
+                        
+                        with self.profile.measure('clean', dataset_name, rows_in=len(df)) as dataset_record:
+                            cleaned_df, quality_report = clean_nhanes_data(df, **clean_kwargs)
+                            dataset_record['rows_out'] = len(cleaned_df)
+                        
+                        self.cleaned_data[dataset_name] = cleaned_df
+                        self.quality_reports[dataset_name] = quality_report
                 
-                self.cleaned_data[dataset_name] = cleaned_df
-                self.quality_reports[dataset_name] = quality_report
+                for dataset_name, quality_report in self.quality_reports.items():
+                    # Log cleaning results
+                    summary = quality_report['cleaning_summary']
+                    self.logger.info(
+                        f"{dataset_name}: {summary['records_before']} -> "
+                        f"{summary['records_after']} records "
+                        f"({summary['removal_rate']:.1f}% removed)"
+                    )
                 
-                # Log cleaning results
-                summary = quality_report['cleaning_summary']
-                self.logger.info(
-                    f"{dataset_name}: {summary['records_before']} -> "
-                    f"{summary['records_after']} records "
-                    f"({summary['removal_rate']:.1f}% removed)"
-                )
+                record['rows_out'] = len(self.cleaned_data.get('combined', []))
+            
+                if self.config['checkpoint_dir']:
+                    self._save_stage(
+                        'clean', self.stage_keys['clean'], self.cleaned_data, extras=self.quality_reports
+                    )
                 
-        except Exception as e:
-            self.logger.error(f"Failed to clean data: {e}")
-            raise
+            except Exception as e:
+                self.logger.error(f"Failed to clean data: {e}")
+                raise
             
         return self
     
@@ -184,34 +430,83 @@ class NHANESPreprocessingPipeline:
         if not self.cleaned_data:
             raise RuntimeError("No cleaned data available. Call clean_data() first.")
         
-        try:
-            # Use the demo_pta dataset as primary for feature engineering
-            primary_df = self.cleaned_data['demo_pta']
-            
-            engineered_datasets = engineer_nhanes_features(
-                primary_df,
-                include_hearing_loss=True,
-                include_clinical=self.config['include_clinical_features'],
-                include_aggregated=True,
-                include_demographics=self.config['include_demographic_features'],
-                hearing_loss_method=self.config['hearing_loss_method']
-            )
+        # Use the demo_pta dataset as primary for feature engineering
+        primary_df = self.cleaned_data['demo_pta']
+        
+        with self.profile.measure('engineer', rows_in=len(primary_df)) as record:
+            if self.config['checkpoint_dir']:
+                key = self.get_stage_key('engineer')
+                self.stage_keys['engineer'] = key
+                restored = self._restore_stage('engineer', key)
+                if restored is not None:
+                    self.engineered_data = restored[0]
+                    self.engineered_version += 1
+                    record['rows_out'] = len(self.engineered_data['wide'])
+                    if self.writer is not None:
+                        for dataset_name, df in self.engineered_data.items():
+                            self.writer.submit(dataset_name, df)
+                    return self
+        
+            try:
+                feature_kwargs = self._get_feature_kwargs()
+            
+                streamed = False
+                
+                def engineer_parallel() -> Dict[str, pd.DataFrame]:
+                    return engineer_features_parallel(
+                        primary_df,
+                        self.config['n_workers'],
+                        engineer=self.engineer,
+                        shard_by=self.config['shard_by'],
+                        profile=self.profile,
+                        **feature_kwargs
+                    )
+                
+                if self.config['feature_store_dir']:
+                    # Serve repeat requests from the persistent feature store; misses
+                    # are computed in the worker pool when one is configured
+                    store = NHANESFeatureStore(self.config['feature_store_dir'], engineer=self.engineer)
+                    engineered_datasets = store.get_or_compute(
+                        primary_df,
+                        profile=self.profile,
+                        compute=engineer_parallel if self._use_parallel('engineer') else None,
+                        **feature_kwargs
+                    )
+                elif self._use_parallel('engineer'):
+                    engineered_datasets = engineer_parallel()
+                else:
+                    # Hand each dataset to the background writer as soon as it is complete
+                    on_dataset = self.writer.submit if self.writer is not None else None
+                    engineered_datasets = engineer_nhanes_features(
+                        primary_df, engineer=self.engineer, on_dataset=on_dataset,
+                        profile=self.profile, **feature_kwargs
+                    )
+                    streamed = on_dataset is not None
+                
+                if self.writer is not None and not streamed:
+                    for dataset_name, df in engineered_datasets.items():
+                        self.writer.submit(dataset_name, df)
             
-            self.engineered_data = engineered_datasets
+                self.engineered_data = engineered_datasets
+                self.engineered_version += 1
             
-            # Log feature engineering results
-            wide_df = engineered_datasets['wide']
-            self.logger.info(f"Created {wide_df.shape[1]} features for {len(wide_df)} records")
+                # Log feature engineering results
+                wide_df = engineered_datasets['wide']
+                record['rows_out'] = len(wide_df)
+                self.logger.info(f"Created {wide_df.shape[1]} features for {len(wide_df)} records")
             
-            # Log hearing loss statistics if available
-            if 'Hearing Loss' in wide_df.columns:
-                hl_count = wide_df['Hearing Loss'].sum()
-                hl_pct = (hl_count / len(wide_df)) * 100
-                self.logger.info(f"Hearing loss prevalence: {hl_count}/{len(wide_df)} ({hl_pct:.1f}%)")
+                # Log hearing loss statistics if available
+                if 'Hearing Loss' in wide_df.columns:
+                    hl_count = wide_df['Hearing Loss'].sum()
+                    hl_pct = (hl_count / len(wide_df)) * 100
+                    self.logger.info(f"Hearing loss prevalence: {hl_count}/{len(wide_df)} ({hl_pct:.1f}%)")
+            
+                if self.config['checkpoint_dir']:
+                    self._save_stage('engineer', self.stage_keys['engineer'], self.engineered_data)
                 
-        except Exception as e:
-            self.logger.error(f"Failed to engineer features: {e}")
-            raise
+            except Exception as e:
+                self.logger.error(f"Failed to engineer features: {e}")
+                raise
             
         return self
     
@@ -241,34 +536,52 @@ class NHANESPreprocessingPipeline:
         datasets = datasets or list(self.engineered_data.keys())
         formats = formats or self.config['export_formats']
         
-        try:
-            for dataset_name in datasets:
-                if dataset_name not in self.engineered_data:
+        with self.profile.measure('export') as record:
+            try:
+                missing = [name for name in datasets if name not in self.engineered_data]
+                for dataset_name in missing:
                     self.logger.warning(f"Dataset '{dataset_name}' not found, skipping...")
-                    continue
                 
-                df = self.engineered_data[dataset_name]
+                export_datasets = {
+                    name: self.engineered_data[name] for name in datasets if name not in missing
+                }
                 
-                for fmt in formats:
-                    filename = f"nhanes_{dataset_name}_{len(df)}records.{fmt}"
-                    filepath = self.output_dir / filename
-                    
-                    if fmt == 'csv':
-                        df.to_csv(filepath, index=False)
-                    elif fmt == 'parquet':
-                        df.to_parquet(filepath, index=False)
-                    else:
-                        self.logger.warning(f"Unsupported format '{fmt}', skipping...")
-                        continue
-                    
-                    self.logger.info(f"Exported {dataset_name} to {filepath}")
-                    
-        except Exception as e:
-            self.logger.error(f"Failed to export data: {e}")
-            raise
+                manifest = self._configure_exporter().export(
+                    export_datasets, self._get_export_formats(formats)
+                )
+                self._record_exported_files(manifest)
+                
+                rows_exported = sum(len(df) for df in export_datasets.values())
+                record['rows_in'] = record['rows_out'] = rows_exported
+            
+            except Exception as e:
+                self.logger.error(f"Failed to export data: {e}")
+                raise
             
         return self
     
+    def _configure_exporter(self) -> DatasetExporter:
+        """Apply the current output directory and export settings to the exporter."""
+        self.exporter.output_dir = self.output_dir
+        self.exporter.n_threads = self.config['export_threads']
+        self.exporter.partition_column = self.config['export_partition_by']
+        self.exporter.profile = self.profile
+        return self.exporter
+    
+    def _get_export_formats(self, formats: List[str]) -> List[str]:
+        """Drop unsupported export formats with a warning."""
+        for fmt in formats:
+            if fmt not in self.exporter.supported_formats:
+                self.logger.warning(f"Unsupported format '{fmt}', skipping...")
+        return [fmt for fmt in formats if fmt in self.exporter.supported_formats]
+    
+    def _record_exported_files(self, manifest: Dict):
+        """Log and record the files listed in an export manifest."""
+        for dataset_name, dataset_info in manifest['datasets'].items():
+            for file_info in dataset_info['files'].values():
+                self.exported_files.append(Path(file_info['path']))
+                self.logger.info(f"Exported {dataset_name} to {file_info['path']}")
+    
     def export_quality_report(self, filename: str = 'quality_report.json') -> 'NHANESPreprocessingPipeline':
         """
         Export data quality reports to file.
@@ -279,35 +592,25 @@ class NHANESPreprocessingPipeline:
         Returns:
             Self for method chaining.
         """
-        import json
-        
         if not self.quality_reports:
             self.logger.warning("No quality reports available")
             return self
         
         try:
             # Convert numpy types to native Python types for JSON serialization
-            def convert_numpy_types(obj):
-                if isinstance(obj, np.integer):
-                    return int(obj)
-                elif isinstance(obj, np.floating):
-                    return float(obj)
-                elif isinstance(obj, np.ndarray):
-                    return obj.tolist()
-                elif isinstance(obj, pd.DataFrame):
-                    return obj.to_dict()
-                elif isinstance(obj, dict):
-                    return {k: convert_numpy_types(v) for k, v in obj.items()}
-                elif isinstance(obj, list):
-                    return [convert_numpy_types(item) for item in obj]
-                return obj
-            
-            serializable_reports = convert_numpy_types(self.quality_reports)
+            serializable_reports = to_json_safe(self.quality_reports)
             
             filepath = self.output_dir / filename
-            with open(filepath, 'w') as f:
-                json.dump(serializable_reports, f, indent=2)
             
+            if self.writer is not None:
+                # Serialise in the background while the pipeline continues
+                self.writer.submit_json(filename, serializable_reports)
+                self.logger.info(f"Queued quality report for {filepath}")
+                return self
+            
+            write_json_atomic(serializable_reports, filepath)
+            
+            self.exported_files.append(filepath)
             self.logger.info(f"Exported quality report to {filepath}")
             
         except Exception as e:
@@ -329,20 +632,51 @@ class NHANESPreprocessingPipeline:
         if dataset not in self.engineered_data:
             raise ValueError(f"Dataset '{dataset}' not available")
         
-        df = self.engineered_data[dataset].copy()
+        df = self.engineered_data[dataset]
         
-        # Additional modeling preparations
-        # Remove non-numeric columns that aren't useful for modeling
-        exclude_columns = ['SEQN', 'Gender', 'Race/ethnicity', 'Cohort']
-        numeric_df = df.select_dtypes(include=[np.number]).copy()
-        
-        # Remove completely NaN columns
-        numeric_df = numeric_df.dropna(axis=1, how='all')
+        # Keep numeric columns that are not completely NaN
+        numeric_df = df[get_modeling_columns(df)]
         
         self.logger.info(f"Modeling dataset prepared with {numeric_df.shape[1]} features")
         
         return numeric_df
     
+    def get_modeling_matrix(
+        self,
+        dataset: str = 'modeling',
+        dtype: Union[str, np.dtype] = np.float32,
+        columns: Optional[List[str]] = None,
+        memmap_path: Optional[Union[str, Path]] = None
+    ) -> Tuple[np.ndarray, List[str]]:
+        """
+        Get the modeling data as a dense C-contiguous matrix.
+        
+        The matrix is built once per version of the engineered data and
+        cached; repeated calls return read-only zero-copy views of it.
+        
+        Args:
+            dataset: Name of the dataset to retrieve.
+            dtype: Floating point dtype of the matrix (float32 or float64).
+            columns: Optional fixed column order. Defaults to the columns of
+                    get_modeling_data().
+            memmap_path: Optional .npy path to back the matrix with a
+                        read-only memory-mapped file.
+            
+        Returns:
+            Tuple of (matrix of shape (n_records, n_columns), column names).
+        """
+        if dataset not in self.engineered_data:
+            raise ValueError(f"Dataset '{dataset}' not available")
+        
+        return self.modeling_cache.get(
+            self.engineered_data[dataset],
+            self.engineered_version,
+            dataset=dataset,
+            columns=columns,
+            dtype=dtype,
+            filepath=memmap_path
+        )
+    
     def run_full_pipeline(
         self,
         cohorts: Optional[List[str]] = None,
@@ -356,23 +690,293 @@ class NHANESPreprocessingPipeline:
             export: Whether to export results to files.
             
         Returns:
-            Dictionary containing all processed datasets.
+            Dictionary containing all processed datasets (empty in streaming
+            mode, whose datasets are only written to the output directory).
         """
         self.logger.info("Starting full preprocessing pipeline...")
         
         # Run pipeline steps
-        self.load_data(cohorts)
-        self.clean_data()
-        self.engineer_features()
+        with self.profile.measure('pipeline') as record:
+            if self.config['streaming']:
+                self._run_streaming(cohorts, export)
+                record['rows_in'] = self.stream_summary['raw_data_records']
+                record['rows_out'] = self.stream_summary['cleaned_data_records']
+            else:
+                self.load_data(cohorts)
+                self.clean_data()
+            
+                if export and self.config['async_export']:
+                    self._run_overlapped_export()
+                else:
+                    self.engineer_features()
+                
+                    if export:
+                        self._run_export_stage()
+                
+                record['rows_in'] = len(self.raw_data.get('combined', []))
+                record['rows_out'] = len(self.engineered_data['wide'])
         
-        if export:
-            self.export_data()
-            self.export_quality_report()
+        if self.profile.enabled:
+            self.logger.info(f"Pipeline profile:\n{self.profile.summary().to_string(index=False)}")
         
         self.logger.info("Preprocessing pipeline completed successfully!")
         
         return self.engineered_data
     
+    def _run_export_stage(self):
+        """Export datasets and quality report, skipping unchanged exports."""
+        if not self.config['checkpoint_dir']:
+            self.export_data()
+            self.export_quality_report()
+            return
+        
+        key = self.get_stage_key('export')
+        self.stage_keys['export'] = key
+        if self._export_up_to_date(key):
+            return
+        
+        self.exported_files = []
+        self.export_data()
+        self.export_quality_report()
+        self._save_export_checkpoint(key)
+    
+    def _get_export_fingerprint(self) -> Optional[str]:
+        """Hash the export manifest in the output directory, ignoring timings."""
+        filepath = self.output_dir / self.exporter.manifest_name
+        try:
+            with open(filepath) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        manifest.pop('created', None)
+        for dataset_info in manifest.get('datasets', {}).values():
+            for file_info in dataset_info.get('files', {}).values():
+                file_info.pop('write_time_s', None)
+        return hash_config(manifest)
+    
+    def _export_up_to_date(self, key: str) -> bool:
+        """
+        Check whether the output directory already holds the export for a key.
+        
+        The export is skipped only if it was checkpointed under the same key,
+        every recorded file still exists and the export manifest on disk is
+        the one that export wrote.
+        """
+        store = self._get_checkpoint_store()
+        if store is None or not store.has('export', key):
+            return False
+        
+        metadata = store.get_manifest('export', key)['metadata']
+        exported_files = metadata.get('files', [])
+        if not all(Path(filepath).exists() for filepath in exported_files):
+            return False
+        if metadata.get('export_manifest') != self._get_export_fingerprint():
+            return False
+        
+        self.logger.info(f"Export outputs up to date (checkpoint {key[:12]})")
+        self.resumed_stages.append('export')
+        self.exported_files = [Path(filepath) for filepath in exported_files]
+        return True
+    
+    def _save_export_checkpoint(self, key: str):
+        """Record the exported files and export manifest under the export key."""
+        self._save_stage('export', key, metadata={
+            'files': [str(filepath) for filepath in self.exported_files],
+            'export_manifest': self._get_export_fingerprint()
+        })
+    
+    def _run_overlapped_export(self):
+        """Engineer features while a background writer exports each dataset."""
+        if self.config['checkpoint_dir']:
+            # The export key follows from the engineer key, known before engineering
+            self.stage_keys['engineer'] = self.get_stage_key('engineer')
+            key = self.get_stage_key('export')
+            self.stage_keys['export'] = key
+            if self._export_up_to_date(key):
+                self.engineer_features()
+                return
+        
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.exported_files = []
+        
+        writer = AsyncDatasetWriter(
+            self._configure_exporter(),
+            self._get_export_formats(self.config['export_formats']),
+            max_queue_size=self.config['export_queue_size']
+        ).start()
+        self.writer = writer
+        
+        try:
+            self.engineer_features()
+            self.export_quality_report()
+        except Exception:
+            writer.close(raise_errors=False)
+            raise
+        finally:
+            self.writer = None
+        
+        # Wait for outstanding writes; any write error is raised here
+        with self.profile.measure('export') as record:
+            try:
+                manifest = writer.close()
+            except Exception as e:
+                self.logger.error(f"Failed to export data: {e}")
+                raise
+            
+            self._record_exported_files(manifest)
+            self.exported_files.extend(Path(filepath) for filepath in writer.json_files)
+            record['rows_out'] = sum(info['rows'] for info in manifest['datasets'].values())
+        
+        if self.config['checkpoint_dir']:
+            self._save_export_checkpoint(self.stage_keys['export'])
+    
+    def _estimate_block_rows(self, cohort: str) -> int:
+        """Derive the streaming block size from the memory budget and a sample block."""
+        sample_block = next(self.loader.iter_cohort_blocks(cohort, 512))
+        sample_views = self._build_views(self.loader.create_clean_labels(sample_block))
+        return estimate_block_rows(sample_views, self.config['memory_budget_mb'])
+    
+    def _run_streaming(self, cohorts: Optional[List[str]], export: bool):
+        """
+        Run the pipeline block by block within the configured memory budget.
+        
+        A first pass over the projected threshold columns computes the global
+        statistics (IQR bounds, imputation medians, summary statistics). The
+        second pass loads, cleans, engineers and exports one block at a time,
+        so only one block of each view is in memory. Engineered datasets are
+        written to disk rather than kept, long-format rows are ordered block
+        by block, and checkpoints and worker processes are not used.
+        """
+        if not export:
+            raise ValueError("Streaming mode writes its results to disk and requires export=True")
+        if self.config['checkpoint_dir'] or self.config['n_workers'] > 1:
+            self.logger.warning("Checkpointing and worker processes are not used in streaming mode")
+        
+        cohorts = cohorts or self.config['cohorts'] or self.loader.cohort_suffixes
+        block_rows = self.config['stream_block_rows'] or self._estimate_block_rows(cohorts[0])
+        clean_kwargs = self._get_clean_kwargs()
+        self.logger.info(f"Streaming {len(cohorts)} cohorts in blocks of {block_rows} rows...")
+        
+        with self.profile.measure('statistics') as record:
+            statistics = compute_global_statistics(
+                self.loader, cohorts, block_rows,
+                missing_strategy=clean_kwargs['missing_strategy'],
+                round_thresholds=clean_kwargs['round_thresholds'],
+                handle_outliers=clean_kwargs['handle_outliers'],
+                cleaner=self.cleaner
+            )
+            record['rows_in'] = statistics['rows']
+        
+        pta_columns = self.loader.get_standard_pta_columns()
+        bounds = {stage: statistics[stage].iqr_bounds(pta_columns) for stage in ['initial', 'final']}
+        feature_kwargs = self._get_feature_kwargs()
+        
+        reports = {}
+        record_counts = {}
+        hl_count = 0
+        n_features = 0
+        
+        self.raw_data, self.cleaned_data, self.engineered_data = {}, {}, {}
+        self.quality_reports = {}
+        self.exported_files = []
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        
+        writer = StreamingDatasetWriter(
+            self._configure_exporter(), self._get_export_formats(self.config['export_formats'])
+        )
+        
+        try:
+            with self.profile.measure('stream', rows_in=statistics['rows']) as record:
+                raw_rows = 0
+                n_blocks = 0
+                
+                for cohort in cohorts:
+                    for block in self.loader.iter_cohort_blocks(cohort, block_rows):
+                        block_name = f'block_{n_blocks}'
+                        n_blocks += 1
+                        
+                        with self.profile.measure('stream', block_name, rows_in=len(block)) as block_record:
+                            # Index blocks by position in the combined frame, as a full load does
+                            block.index = pd.RangeIndex(raw_rows, raw_rows + len(block))
+                            raw_rows += len(block)
+                            views = self._build_views(self.loader.create_clean_labels(block))
+                            
+                            for dataset_name, df in views.items():
+                                if dataset_name not in reports:
+                                    reports[dataset_name] = {
+                                        stage: QualityReportAccumulator(bounds[stage], self.cleaner)
+                                        for stage in ['initial', 'final']
+                                    }
+                                    record_counts[dataset_name] = [0, 0]
+                                
+                                cleaned_df = df.copy()
+                                if clean_kwargs['round_thresholds']:
+                                    cleaned_df = self.cleaner.clean_hearing_thresholds(
+                                        cleaned_df, round_to_nearest=5,
+                                        handle_outliers=clean_kwargs['handle_outliers']
+                                    )
+                                cleaned_df = self.cleaner.handle_missing_values(
+                                    cleaned_df, strategy=clean_kwargs['missing_strategy'],
+                                    fill_values=statistics['fill_values']
+                                )
+                                
+                                counts = record_counts[dataset_name]
+                                reports[dataset_name]['initial'].add(df)
+                                reports[dataset_name]['final'].add(cleaned_df, offset=counts[1])
+                                counts[0] += len(df)
+                                counts[1] += len(cleaned_df)
+                                views[dataset_name] = cleaned_df
+                            
+                            engineered_datasets = engineer_nhanes_features(
+                                views['demo_pta'], engineer=self.engineer,
+                                profile=self.profile, **feature_kwargs
+                            )
+                            for dataset_name, df in engineered_datasets.items():
+                                writer.write(dataset_name, df)
+                            
+                            wide_df = engineered_datasets['wide']
+                            n_features = wide_df.shape[1]
+                            if 'Hearing Loss' in wide_df.columns:
+                                hl_count += wide_df['Hearing Loss'].sum()
+                            block_record['rows_out'] = len(wide_df)
+                
+                record['rows_out'] = record_counts.get('demo_pta', [0, 0])[1]
+            
+            frequencies = self.engineer.frequency_labels
+            for dataset_name, (records_before, records_after) in record_counts.items():
+                self.quality_reports[dataset_name] = {
+                    'initial': reports[dataset_name]['initial'].merge(statistics['initial'], frequencies),
+                    'final': reports[dataset_name]['final'].merge(statistics['final'], frequencies),
+                    'cleaning_summary': {
+                        'records_before': records_before,
+                        'records_after': records_after,
+                        'records_removed': records_before - records_after,
+                        'removal_rate': (records_before - records_after) / records_before * 100
+                    }
+                }
+            
+            with self.profile.measure('export') as record:
+                manifest = writer.close()
+                self._record_exported_files(manifest)
+                record['rows_out'] = sum(info['rows'] for info in manifest['datasets'].values())
+        
+        except Exception as e:
+            writer.abort()
+            self.logger.error(f"Failed to run streaming pipeline: {e}")
+            raise
+        
+        self.export_quality_report()
+        
+        cleaned_records = record_counts.get('demo_pta', [0, 0])[1]
+        self.stream_summary = {
+            'raw_data_records': raw_rows,
+            'cleaned_data_records': cleaned_records,
+            'final_features': n_features,
+            'hearing_loss_prevalence': (hl_count / cleaned_records) * 100 if cleaned_records else None
+        }
+        self.logger.info(f"Streamed {raw_rows} records ({cleaned_records} after cleaning)")
+    
     def get_summary_statistics(self) -> Dict:
         """
         Get summary statistics for the processed datasets.
@@ -380,6 +984,9 @@ class NHANESPreprocessingPipeline:
         Returns:
             Dictionary containing summary statistics.
         """
+        if self.stream_summary and not self.raw_data:
+            return dict(self.stream_summary)
+        
         summary = {
             'raw_data_records': len(self.raw_data.get('combined', [])),
             'cleaned_data_records': len(self.cleaned_data.get('demo_pta', [])),
@@ -0,0 +1,213 @@
+"""
+NHANES Pipeline Profiling Module
+
+This module provides lightweight instrumentation for the preprocessing
+pipeline. It records wall time, CPU time, peak resident memory, peak
+Python allocations and row counts for each stage and dataset view, and
+exports the measurements as a DataFrame, JSON or CSV. When disabled it
+does no measurement at all.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+import pandas as pd
+
+from .cache_utils import write_json_atomic
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+
+# Environment variable that switches profiling on for every pipeline
+PROFILE_ENV_VAR = 'SYNTHH_PROFILE'
+
+
+def profiling_requested() -> bool:
+    """
+    Check whether profiling is switched on through the environment.
+    
+    Returns:
+        True if SYNTHH_PROFILE is set to a truthy value.
+    """
+    return os.environ.get(PROFILE_ENV_VAR, '').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Return the peak resident set size of the process in MB."""
+    if resource is None:
+        return None
+    
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes elsewhere
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return peak / divisor
+
+
+class PipelineProfiler:
+    """
+    A profiler recording per-stage and per-dataset resource usage.
+    
+    Measurements are taken with the measure() context manager, which yields
+    a record dictionary the caller can annotate (e.g. with 'rows_out').
+    Nested measurements are supported: a dataset-level measurement inside a
+    stage contributes its allocation peak to the enclosing stage.
+    
+    Measurements may also be taken from writer threads. Each thread nests its
+    own measurements; outside the main thread CPU time is the thread's own
+    and Python allocations are not traced, as tracemalloc peaks are shared
+    by the whole process.
+    """
+    
+    def __init__(self, enabled: bool = False, trace_memory: bool = True):
+        """
+        Initialize the profiler.
+        
+        Args:
+            enabled: Whether measurements are recorded.
+            trace_memory: Whether to track peak Python allocations with
+                         tracemalloc (adds overhead to timed code).
+        """
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self.records = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+    
+    @property
+    def _stack(self) -> list:
+        """Open measurements of the calling thread, innermost last."""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+    
+    @contextmanager
+    def measure(
+        self,
+        stage: str,
+        dataset: Optional[str] = None,
+        rows_in: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Measure a block of pipeline work.
+        
+        Args:
+            stage: Stage name (e.g. 'load', 'clean').
+            dataset: Optional dataset view name. None for the whole stage.
+            rows_in: Optional number of input rows.
+        
+        Yields:
+            Record dictionary; set 'rows_out' (or other fields) on it.
+        """
+        record = {'stage': stage, 'dataset': dataset, 'rows_in': rows_in, 'rows_out': None}
+        
+        if not self.enabled:
+            yield record
+            return
+        
+        in_main_thread = threading.current_thread() is threading.main_thread()
+        trace_memory = self.trace_memory and in_main_thread
+        cpu_clock = time.process_time if in_main_thread else time.thread_time
+        started_tracing = False
+        if trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif self._stack:
+                # Keep the enclosing measurement's peak before resetting it
+                parent = self._stack[-1]
+                parent['_child_peak'] = max(parent['_child_peak'], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        
+        record['_child_peak'] = 0
+        self._stack.append(record)
+        record['started'] = datetime.now().isoformat()
+        wall_start = time.perf_counter()
+        cpu_start = cpu_clock()
+        
+        try:
+            yield record
+        finally:
+            record['wall_time_s'] = time.perf_counter() - wall_start
+            record['cpu_time_s'] = cpu_clock() - cpu_start
+            record['peak_rss_mb'] = _peak_rss_mb()
+            
+            self._stack.pop()
+            child_peak = record.pop('_child_peak')
+            if trace_memory:
+                peak = max(tracemalloc.get_traced_memory()[1], child_peak)
+                record['peak_traced_mb'] = peak / 1024 ** 2
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent['_child_peak'] = max(parent['_child_peak'], peak)
+                if started_tracing:
+                    tracemalloc.stop()
+            else:
+                record['peak_traced_mb'] = None
+            
+            with self._lock:
+                self.records.append(record)
+    
+    def reset(self) -> None:
+        """Discard all recorded measurements."""
+        with self._lock:
+            self.records = []
+    
+    def to_frame(self) -> pd.DataFrame:
+        """
+        Get the measurements as a DataFrame.
+        
+        Returns:
+            DataFrame with one row per measured block, in completion order.
+        """
+        columns = [
+            'stage', 'dataset', 'wall_time_s', 'cpu_time_s', 'peak_rss_mb',
+            'peak_traced_mb', 'rows_in', 'rows_out', 'started'
+        ]
+        return pd.DataFrame(self.records, columns=columns)
+    
+    def summary(self) -> pd.DataFrame:
+        """
+        Get stage-level measurements only.
+        
+        Returns:
+            DataFrame with one row per stage measurement.
+        """
+        df = self.to_frame()
+        return df[df['dataset'].isna()].reset_index(drop=True)
+    
+    def to_json(self, filepath: Union[str, Path]) -> Path:
+        """
+        Export the measurements to a JSON file.
+        
+        Args:
+            filepath: Destination file path.
+        
+        Returns:
+            Path of the written file.
+        """
+        return write_json_atomic(self.records, filepath)
+    
+    def to_csv(self, filepath: Union[str, Path]) -> Path:
+        """
+        Export the measurements to a CSV file.
+        
+        Args:
+            filepath: Destination file path.
+        
+        Returns:
+            Path of the written file.
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        self.to_frame().to_csv(filepath, index=False)
+        return filepath
@@ -0,0 +1,189 @@
+"""
+NHANES Batched Acoustic Reflex Analysis Module
+
+This module computes acoustic reflex parameters for many curves at once.
+Every step of NHANESAcousticReflexLoader.calculate_reflex_parameters()
+(baseline mean and stability, peak of the absolute baseline-corrected
+change, decay window after the peak, time above half the peak) becomes a
+masked array operation over a tensor of curves of any leading shape, such
+as (participants, ears, frequencies, 84). Response classification is
+vectorised in the same way and returns categorical response types.
+"""
+
+from typing import Dict, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+REFLEX_PARAMETER_NAMES = [
+    'reflex_present',
+    'reflex_magnitude',
+    'reflex_latency',
+    'reflex_decay',
+    'reflex_duration',
+    'baseline_stability'
+]
+
+# Response types of NHANESAcousticReflexLoader.classify_reflex_response()
+REFLEX_RESPONSE_TYPES = ['Normal', 'Absent', 'Elevated', 'Pathological']
+
+
+def _masked_sum(values: np.ndarray, mask: np.ndarray) -> np.ndarray:
+    """Sum the masked values of each row, left to right."""
+    total = np.zeros(values.shape[0])
+    for col in range(values.shape[1]):
+        total += np.where(mask[:, col], values[:, col], 0.0)
+    return total
+
+
+def calculate_reflex_parameters_batch(
+    time_values: np.ndarray,
+    compliance_changes: np.ndarray,
+    min_reflex_magnitude: float = 0.1
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate acoustic reflex parameters for every curve of a tensor.
+    
+    Results match NHANESAcousticReflexLoader.calculate_reflex_parameters()
+    applied to each curve.
+    
+    Args:
+        time_values: Time values in milliseconds shared by all curves.
+        compliance_changes: Array of shape (..., n_points) of compliance
+                           changes in ml, e.g. (participants, ears,
+                           frequencies, 84).
+        min_reflex_magnitude: Minimum change (ml) for a reflex to be present.
+    
+    Returns:
+        Dictionary of parameter arrays of shape compliance_changes.shape[:-1],
+        with the keys of the scalar function.
+    
+    Raises:
+        ValueError: If the shapes of time and compliance do not match.
+    """
+    time_values = np.asarray(time_values, dtype=np.float64)
+    compliance_changes = np.asarray(compliance_changes, dtype=np.float64)
+    if compliance_changes.shape[-1] != len(time_values):
+        raise ValueError(
+            f"Compliance tensor has {compliance_changes.shape[-1]} points but "
+            f"{len(time_values)} time values were given"
+        )
+    
+    leading_shape = compliance_changes.shape[:-1]
+    compliance = compliance_changes.reshape(-1, len(time_values))
+    n_curves = compliance.shape[0]
+    rows = np.arange(n_curves)
+    
+    valid = ~np.isnan(compliance)
+    n_valid = valid.sum(axis=1)
+    
+    # Baseline (first 100 ms should be pre-stimulus)
+    baseline_columns = np.flatnonzero(time_values <= 100)
+    baseline_values = compliance[:, baseline_columns]
+    baseline_valid = valid[:, baseline_columns]
+    n_baseline = baseline_valid.sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        baseline_mean = _masked_sum(baseline_values, baseline_valid) / n_baseline
+        squared_deviation = (baseline_values - baseline_mean[:, None]) ** 2
+        baseline_stability = np.sqrt(_masked_sum(squared_deviation, baseline_valid) / n_baseline)
+    
+    baseline_mean = np.where(n_baseline > 0, baseline_mean, 0.0)
+    baseline_stability = np.where(n_baseline > 0, baseline_stability, np.nan)
+    
+    # Reflex magnitude: first maximum of the absolute baseline-corrected change
+    abs_compliance = np.abs(compliance - baseline_mean[:, None])
+    max_idx = np.where(valid, abs_compliance, -np.inf).argmax(axis=1)
+    reflex_magnitude = abs_compliance[rows, max_idx]
+    peak_time = time_values[max_idx]
+    
+    reflex_present = reflex_magnitude >= min_reflex_magnitude
+    
+    # Decay: mean of the last 3 valid points 100-600 ms after the peak
+    decay_mask = (
+        valid
+        & (time_values[None, :] >= (peak_time + 100)[:, None])
+        & (time_values[None, :] <= (peak_time + 600)[:, None])
+    )
+    from_end = np.cumsum(decay_mask[:, ::-1], axis=1)[:, ::-1]
+    last_three = decay_mask & (from_end <= 3)
+    n_last = last_three.sum(axis=1)
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        final_magnitude = _masked_sum(abs_compliance, last_three) / n_last
+        reflex_decay = ((reflex_magnitude - final_magnitude) / reflex_magnitude) * 100
+    
+    # Duration: time between the first and last points at or above half the peak
+    above_half_peak = valid & (abs_compliance >= (reflex_magnitude * 0.5)[:, None])
+    first_above = above_half_peak.argmax(axis=1)
+    last_above = len(time_values) - 1 - above_half_peak[:, ::-1].argmax(axis=1)
+    reflex_duration = time_values[last_above] - time_values[first_above]
+    
+    results = {
+        'reflex_present': reflex_present.astype(np.float64),
+        'reflex_magnitude': reflex_magnitude,
+        'reflex_latency': np.where(reflex_present, peak_time, np.nan),
+        'reflex_decay': np.where(reflex_present & (n_last > 0), reflex_decay, np.nan),
+        'reflex_duration': np.where(reflex_present, reflex_duration, 0.0),
+        'baseline_stability': baseline_stability
+    }
+    
+    # Curves with fewer than 10 valid points
+    too_short = n_valid < 10
+    for name, values in results.items():
+        values[too_short] = 0.0 if name == 'reflex_present' else np.nan
+    
+    return {name: values.reshape(leading_shape) for name, values in results.items()}
+
+
+def classify_reflex_responses_batch(
+    reflex_params: Union[Mapping[str, np.ndarray], pd.DataFrame],
+    stimulus_intensity_db: Optional[Union[float, np.ndarray]] = None,
+    abnormal_threshold_db: float = 100,
+    decay_threshold_percent: float = 50
+) -> pd.Categorical:
+    """
+    Classify acoustic reflex responses from their parameters.
+    
+    Rules (applied in order, as in
+    NHANESAcousticReflexLoader.classify_reflex_response()):
+    - Absent: no reflex present
+    - Elevated: stimulus intensity above the abnormal threshold
+    - Pathological: decay above the decay threshold, or latency above 200 ms
+    - Normal: otherwise
+    
+    Args:
+        reflex_params: Parameter arrays (e.g. from
+                      calculate_reflex_parameters_batch()) or a parameter table.
+        stimulus_intensity_db: Optional stimulus intensity in dB SPL, scalar
+                              or one value per curve.
+        abnormal_threshold_db: Intensity above which a reflex is elevated.
+        decay_threshold_percent: Decay above which a reflex is pathological.
+    
+    Returns:
+        Flat Categorical with the categories REFLEX_RESPONSE_TYPES, one value
+        per curve.
+    """
+    reflex_present = np.asarray(reflex_params['reflex_present'], dtype=np.float64).reshape(-1)
+    reflex_decay = np.asarray(reflex_params['reflex_decay'], dtype=np.float64).reshape(-1)
+    reflex_latency = np.asarray(reflex_params['reflex_latency'], dtype=np.float64).reshape(-1)
+    
+    stimulus = np.asarray(np.nan if stimulus_intensity_db is None else stimulus_intensity_db, dtype=np.float64)
+    stimulus = np.broadcast_to(stimulus.reshape(-1) if stimulus.ndim else stimulus, reflex_present.shape)
+    
+    # NaN comparisons are False, as the scalar checks for missing values
+    codes = np.select(
+        [
+            reflex_present == 0,
+            stimulus > abnormal_threshold_db,
+            (reflex_decay > decay_threshold_percent) | (reflex_latency > 200)
+        ],
+        [
+            REFLEX_RESPONSE_TYPES.index('Absent'),
+            REFLEX_RESPONSE_TYPES.index('Elevated'),
+            REFLEX_RESPONSE_TYPES.index('Pathological')
+        ],
+        default=REFLEX_RESPONSE_TYPES.index('Normal')
+    )
+    
+    return pd.Categorical.from_codes(codes, categories=REFLEX_RESPONSE_TYPES)
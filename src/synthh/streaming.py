@@ -0,0 +1,341 @@
+"""
+NHANES Streaming Execution Module
+
+This module provides the building blocks of the bounded-memory streaming
+mode of the preprocessing pipeline. A cheap first pass over the projected
+threshold columns accumulates exact value histograms, from which the global
+statistics that a block cannot see on its own (IQR outlier bounds, imputation
+medians, summary statistics) are derived. The second pass then cleans,
+engineers and exports one row block at a time, and per-block quality reports
+are accumulated and merged into reports of the whole dataset.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .data_cleaner import NHANESDataCleaner
+from .data_loader import NHANESDataLoader
+from .parallel import _merge_audiometric_validation, _merge_range_validation
+
+
+class ValueHistogram:
+    """
+    Exact per-column value counts accumulated over row blocks.
+    
+    Hearing thresholds take few distinct values (the 5 dB grid), so the
+    counts stay small however many rows are streamed, and order statistics
+    such as medians and quartiles can be computed exactly from them.
+    """
+    
+    def __init__(self):
+        """Initialize empty histograms."""
+        self.counts = {}
+    
+    def update(self, df: pd.DataFrame, columns: Optional[List[str]] = None) -> None:
+        """
+        Add the non-missing values of a block.
+        
+        Args:
+            df: Block of data.
+            columns: Columns to count. Defaults to all columns of df.
+        """
+        for col in columns if columns is not None else df.columns:
+            counts = df[col].dropna().value_counts()
+            if col in self.counts:
+                counts = self.counts[col].add(counts, fill_value=0)
+            self.counts[col] = counts
+    
+    def add(self, col: str, value: float, count: int) -> None:
+        """
+        Add repeated occurrences of a value (e.g. imputed values).
+        
+        Args:
+            col: Column name.
+            value: Value to add.
+            count: Number of occurrences.
+        """
+        if count > 0 and not pd.isna(value):
+            self.update(pd.DataFrame({col: np.full(count, value)}))
+    
+    def _sorted_counts(self, col: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the sorted distinct values of a column and their counts."""
+        counts = self.counts.get(col, pd.Series(dtype=np.float64)).sort_index()
+        return counts.index.to_numpy(dtype=np.float64), counts.to_numpy(dtype=np.float64)
+    
+    def quantile(self, col: str, q: float) -> float:
+        """
+        Compute a quantile with linear interpolation (as pandas does).
+        
+        Args:
+            col: Column name.
+            q: Quantile in [0, 1].
+        
+        Returns:
+            Quantile value, or NaN if the column has no values.
+        """
+        values, counts = self._sorted_counts(col)
+        n = counts.sum()
+        if n == 0:
+            return np.nan
+        
+        position = (n - 1) * q
+        cumulative = np.cumsum(counts)
+        lower = values[np.searchsorted(cumulative, np.floor(position), side='right')]
+        upper = values[np.searchsorted(cumulative, np.ceil(position), side='right')]
+        
+        return lower + (upper - lower) * (position - np.floor(position))
+    
+    def iqr_bounds(self, columns: List[str], threshold: float = 1.5) -> Dict[str, Tuple[float, float]]:
+        """
+        Compute IQR outlier bounds.
+        
+        Args:
+            columns: Columns to compute bounds for.
+            threshold: IQR multiplier.
+        
+        Returns:
+            Mapping of column to (lower, upper) bounds.
+        """
+        bounds = {}
+        for col in columns:
+            q1 = self.quantile(col, 0.25)
+            q3 = self.quantile(col, 0.75)
+            bounds[col] = (q1 - threshold * (q3 - q1), q3 + threshold * (q3 - q1))
+        return bounds
+    
+    def describe(self, columns: List[str]) -> pd.DataFrame:
+        """
+        Compute the statistics of DataFrame.describe() from the counts.
+        
+        Args:
+            columns: Columns to describe.
+        
+        Returns:
+            DataFrame indexed by statistic with one column per input column.
+        """
+        stats = {}
+        
+        for col in columns:
+            values, counts = self._sorted_counts(col)
+            n = counts.sum()
+            mean = (values * counts).sum() / n if n > 0 else np.nan
+            std = np.sqrt((counts * (values - mean) ** 2).sum() / (n - 1)) if n > 1 else np.nan
+            
+            stats[col] = [
+                n, mean, std,
+                values[0] if n > 0 else np.nan,
+                self.quantile(col, 0.25), self.quantile(col, 0.5), self.quantile(col, 0.75),
+                values[-1] if n > 0 else np.nan
+            ]
+        
+        return pd.DataFrame(stats, index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'])
+
+
+def compute_global_statistics(
+    loader: NHANESDataLoader,
+    cohorts: List[str],
+    block_rows: int,
+    missing_strategy: str = 'listwise',
+    round_thresholds: bool = True,
+    handle_outliers: str = 'clip',
+    cleaner: Optional[NHANESDataCleaner] = None
+) -> Dict:
+    """
+    First streaming pass: accumulate threshold histograms.
+    
+    Only the PTA file of each cohort is read, projected to the threshold
+    columns, and each block is cleaned exactly as the second pass will
+    clean it, so the histograms describe both the raw and the cleaned data.
+    
+    Args:
+        loader: Data loader.
+        cohorts: Cohort suffixes to read.
+        block_rows: Rows per block.
+        missing_strategy: Strategy for handling missing values.
+        round_thresholds: Whether thresholds are rounded to the nearest 5 dB.
+        handle_outliers: How physiological outliers are handled.
+        cleaner: Data cleaner. A default cleaner is used if None.
+    
+    Returns:
+        Dictionary with 'initial' and 'final' histograms of the threshold
+        columns (before and after cleaning), 'fill_values' (global medians
+        for the 'impute' strategy, otherwise None) and the raw row count.
+    """
+    cleaner = cleaner or NHANESDataCleaner()
+    initial = ValueHistogram()
+    final = ValueHistogram()
+    missing_counts = {}
+    total_rows = 0
+    
+    for cohort in cohorts:
+        for block in loader.iter_cohort_blocks(cohort, block_rows, include_demographics=False):
+            pta_df = loader.get_pta_subset(block, relabel=True)
+            total_rows += len(pta_df)
+            initial.update(pta_df)
+            
+            if round_thresholds:
+                pta_df = cleaner.clean_hearing_thresholds(
+                    pta_df, round_to_nearest=5, handle_outliers=handle_outliers
+                )
+            
+            if missing_strategy == 'impute':
+                # Imputed values are added once the global medians are known
+                final.update(pta_df)
+                for col, count in pta_df.isna().sum().items():
+                    missing_counts[col] = missing_counts.get(col, 0) + int(count)
+            else:
+                final.update(cleaner.handle_missing_values(pta_df, strategy=missing_strategy))
+    
+    fill_values = None
+    if missing_strategy == 'impute':
+        fill_values = {col: final.quantile(col, 0.5) for col in missing_counts}
+        for col, count in missing_counts.items():
+            final.add(col, fill_values[col], count)
+    
+    return {
+        'initial': initial,
+        'final': final,
+        'fill_values': fill_values,
+        'rows': total_rows
+    }
+
+
+def estimate_block_rows(
+    sample_views: Dict[str, pd.DataFrame],
+    memory_budget_mb: float,
+    amplification: float = 8.0,
+    min_rows: int = 256
+) -> int:
+    """
+    Estimate how many rows fit in a memory budget.
+    
+    Args:
+        sample_views: Dataset views built from a sample block.
+        memory_budget_mb: Memory budget for one block in MB.
+        amplification: Ratio of peak block memory (cleaning copies and
+                      engineered datasets) to the memory of the views.
+        min_rows: Lower limit on the block size.
+    
+    Returns:
+        Number of rows per block.
+    """
+    n_rows = max(len(next(iter(sample_views.values()))), 1)
+    view_bytes = sum(df.memory_usage(deep=True).sum() for df in sample_views.values())
+    bytes_per_row = amplification * view_bytes / n_rows
+    
+    return max(min_rows, int(memory_budget_mb * 1024 ** 2 / max(bytes_per_row, 1)))
+
+
+class QualityReportAccumulator:
+    """
+    Accumulates partial quality statistics of the blocks of one dataset.
+    
+    Block reports keep only what can be merged exactly: counts, issue lists
+    with record indices, missingness pattern counts and outliers detected
+    against global IQR bounds. The merged report has the structure of
+    NHANESDataCleaner.generate_data_quality_report().
+    """
+    
+    def __init__(self, bounds: Dict[str, Tuple[float, float]], cleaner: Optional[NHANESDataCleaner] = None):
+        """
+        Initialize the accumulator.
+        
+        Args:
+            bounds: Global IQR bounds per threshold column.
+            cleaner: Data cleaner. A default cleaner is used if None.
+        """
+        self.bounds = bounds
+        self.cleaner = cleaner or NHANESDataCleaner()
+        self.blocks = []
+        self.offsets = []
+        self.columns = None
+    
+    def add(self, df: pd.DataFrame, offset: int = 0) -> None:
+        """
+        Add the partial statistics of a block.
+        
+        Args:
+            df: Block of the dataset.
+            offset: Offset added to the block's record indices.
+        """
+        self.columns = list(df.columns)
+        missing = df.isnull()
+        complete_cases = int((~missing.any(axis=1)).sum())
+        
+        self.blocks.append({
+            'total_records': len(df),
+            'range_validation': self.cleaner.validate_data_ranges(df),
+            'missing_by_column': missing.sum(),
+            'complete_cases': complete_cases,
+            'incomplete_cases': len(df) - complete_cases,
+            'missing_patterns': missing.value_counts(),
+            'statistical_outliers': self.cleaner.detect_statistical_outliers(df, bounds=self.bounds),
+            'audiometric_validation': self.cleaner.validate_audiometric_patterns(df)
+        })
+        self.offsets.append(offset)
+    
+    def merge(self, histogram: ValueHistogram, frequencies: List[str]) -> Dict:
+        """
+        Merge the block statistics into a report of the whole dataset.
+        
+        Args:
+            histogram: Value histogram of the dataset's threshold columns.
+            frequencies: Frequency labels in report order.
+        
+        Returns:
+            Merged data quality report.
+        """
+        pta_columns = [col for col in self.columns if 'kHz' in col]
+        total_records = sum(block['total_records'] for block in self.blocks)
+        missing_by_column = sum(block['missing_by_column'] for block in self.blocks)
+        
+        missing_data = {
+            'total_missing': missing_by_column.sum(),
+            'missing_by_column': missing_by_column,
+            'missing_percentage': (missing_by_column / total_records * 100).round(2),
+            'complete_cases': sum(block['complete_cases'] for block in self.blocks),
+            'incomplete_cases': sum(block['incomplete_cases'] for block in self.blocks)
+        }
+        
+        if missing_data['total_missing'] > 0:
+            patterns = self.blocks[0]['missing_patterns']
+            for block in self.blocks[1:]:
+                patterns = patterns.add(block['missing_patterns'], fill_value=0)
+            missing_data['missing_patterns'] = (
+                patterns.sort_values(ascending=False, kind='stable').head(10).astype(np.int64)
+            )
+        
+        statistical_outliers = {}
+        for col in pta_columns:
+            outliers = [
+                block['statistical_outliers'][col].set_axis(
+                    block['statistical_outliers'][col].index + offset
+                )
+                for block, offset in zip(self.blocks, self.offsets)
+                if col in block['statistical_outliers']
+            ]
+            if outliers:
+                statistical_outliers[col] = pd.concat(outliers)
+        
+        report = {
+            'dataset_info': {
+                'total_records': total_records,
+                'total_columns': len(self.columns),
+                'pta_columns': len(pta_columns)
+            },
+            'range_validation': _merge_range_validation(
+                [block['range_validation'] for block in self.blocks], self.offsets, pta_columns
+            ),
+            'missing_data': missing_data,
+            'statistical_outliers': statistical_outliers,
+            'audiometric_validation': _merge_audiometric_validation(
+                [block['audiometric_validation'] for block in self.blocks], self.offsets, frequencies
+            )
+        }
+        
+        if pta_columns:
+            report['summary_statistics'] = histogram.describe(pta_columns)
+        
+        return report
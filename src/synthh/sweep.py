@@ -0,0 +1,189 @@
+"""
+NHANES Configuration Sweep Module
+
+This module runs the preprocessing pipeline over a grid of configurations
+while loading the raw NHANES data only once. Configurations are fanned out
+across worker processes that inherit the loaded data copy-on-write (or
+receive a pickled copy under other start methods), and the
+per-configuration summary statistics are returned as a tidy table.
+"""
+
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+
+from .preprocessing_pipeline import NHANESPreprocessingPipeline
+
+
+# Loaded raw data and base configuration held by each sweep worker (read-only)
+_SWEEP_STATE = None
+
+
+def _init_worker(state: Optional[Dict]):
+    """Install the loaded raw data and base configuration in a sweep worker."""
+    global _SWEEP_STATE
+    _SWEEP_STATE = state
+
+
+def expand_config_grid(grid: Dict[str, List]) -> List[Dict]:
+    """
+    Expand a parameter grid into a list of configurations.
+    
+    Args:
+        grid: Mapping of configuration key to the values to sweep.
+    
+    Returns:
+        List of configuration dictionaries (Cartesian product of the grid).
+    """
+    keys = list(grid.keys())
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def _run_config(config: Dict) -> Dict:
+    """Run the post-load pipeline stages for one configuration."""
+    base = _SWEEP_STATE
+    
+    # The raw frames are shared, not copied; cleaning never modifies its input
+    pipeline = NHANESPreprocessingPipeline(base['data_dir'], base['output_dir'], log_level='WARNING')
+    pipeline.configure(**{**base['config'], **config})
+    pipeline.raw_data = base['raw_data']
+    pipeline.stage_keys = dict(base['stage_keys'])
+    
+    pipeline.clean_data()
+    pipeline.engineer_features()
+    
+    return {**config, **pipeline.get_summary_statistics()}
+
+
+class ConfigurationSweep:
+    """
+    A runner for preprocessing configuration sweeps.
+    
+    The raw data is loaded once by a template pipeline. Each configuration
+    then runs the clean and engineer stages on that data, either serially
+    or in worker processes. Workers receive only the raw frames and the
+    base configuration, not the template pipeline; forked workers share
+    the frames through copy-on-write memory instead of reloading the CSV
+    files.
+    """
+    
+    def __init__(
+        self,
+        data_dir: Union[str, Path],
+        cohorts: Optional[List[str]] = None,
+        n_workers: int = 1,
+        mp_context: Optional[str] = None,
+        **base_config
+    ):
+        """
+        Initialize the sweep runner.
+        
+        Args:
+            data_dir: Path to NHANES data directory.
+            cohorts: Optional list of cohort suffixes to load.
+            n_workers: Number of worker processes (1 runs serially).
+            mp_context: Optional multiprocessing start method ('fork',
+                       'spawn', 'forkserver'). Defaults to 'fork' where
+                       available.
+            **base_config: Configuration shared by every run of the sweep.
+        """
+        self.pipeline = NHANESPreprocessingPipeline(data_dir, log_level='WARNING')
+        self.pipeline.configure(cohorts=cohorts, **base_config)
+        self.n_workers = n_workers
+        self.mp_context = mp_context
+    
+    def load(self) -> 'ConfigurationSweep':
+        """
+        Load the raw data once for all configurations.
+        
+        Returns:
+            Self for method chaining.
+        """
+        if not self.pipeline.raw_data:
+            self.pipeline.load_data()
+        return self
+    
+    def run(self, configs: Union[List[Dict], Dict[str, List]]) -> pd.DataFrame:
+        """
+        Run the sweep.
+        
+        Args:
+            configs: Either a list of configuration dictionaries or a grid
+                    mapping configuration keys to lists of values.
+        
+        Returns:
+            Tidy DataFrame with one row per configuration: the swept
+            parameters followed by the pipeline summary statistics.
+        """
+        if isinstance(configs, dict):
+            configs = expand_config_grid(configs)
+        
+        self.load()
+        
+        state = {
+            'data_dir': self.pipeline.data_dir,
+            'output_dir': self.pipeline.output_dir,
+            'config': dict(self.pipeline.config),
+            'raw_data': self.pipeline.raw_data,
+            'stage_keys': {
+                stage: key for stage, key in self.pipeline.stage_keys.items() if stage == 'load'
+            }
+        }
+        
+        if self.n_workers > 1:
+            # Forked workers inherit the loaded frames copy-on-write; other
+            # start methods receive one pickled copy per worker
+            start_method = self.mp_context
+            if start_method is None and 'fork' in multiprocessing.get_all_start_methods():
+                start_method = 'fork'
+            context = multiprocessing.get_context(start_method) if start_method else None
+            
+            with ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                mp_context=context,
+                initializer=_init_worker,
+                initargs=(state,)
+            ) as executor:
+                results = list(executor.map(_run_config, configs))
+        else:
+            _init_worker(state)
+            try:
+                results = [_run_config(config) for config in configs]
+            finally:
+                _init_worker(None)
+        
+        return pd.DataFrame(results)
+
+
+def sweep_nhanes_configs(
+    data_dir: Union[str, Path],
+    configs: Union[List[Dict], Dict[str, List]],
+    cohorts: Optional[List[str]] = None,
+    n_workers: int = 1,
+    mp_context: Optional[str] = None,
+    **base_config
+) -> pd.DataFrame:
+    """
+    Convenience function to run a preprocessing configuration sweep.
+    
+    Args:
+        data_dir: Path to NHANES data directory.
+        configs: List of configurations or a grid of values to sweep, e.g.
+                {'missing_strategy': ['listwise', 'partial'],
+                 'hearing_loss_method': ['any_frequency', 'pta_average']}.
+        cohorts: Optional list of cohort suffixes.
+        n_workers: Number of worker processes.
+        mp_context: Optional multiprocessing start method.
+        **base_config: Configuration shared by every run.
+    
+    Returns:
+        Tidy DataFrame of per-configuration summary statistics.
+    """
+    sweep = ConfigurationSweep(
+        data_dir, cohorts=cohorts, n_workers=n_workers, mp_context=mp_context, **base_config
+    )
+    return sweep.run(configs)
@@ -0,0 +1,546 @@
+"""
+NHANES Batched Tympanometry Analysis Module
+
+This module computes tympanometric parameters for many curves at once. The
+curves of an (N, 84) compliance matrix are grouped by their number of valid
+points, so that every step of the scalar algorithm in
+NHANESTympanometryLoader.calculate_tympanometric_parameters() (baseline
+percentile, moving-average smoothing, peak and half-peak search, quality
+score) becomes a regular array operation on each group, and row blocks can
+be processed in worker processes. It also fits parametric peak models
+(Gaussian or Lorentzian plus baseline) to whole curve matrices with a
+batched Levenberg-Marquardt solver, and classifies whole parameter tables
+into Jerger tympanogram types.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Bump when the parameter or classification logic changes so cached tables are rebuilt
+TYMPANOMETRY_ALGORITHM_VERSION = 2
+
+PARAMETER_NAMES = [
+    'peak_pressure',
+    'peak_compliance',
+    'gradient',
+    'equivalent_volume',
+    'baseline_compliance',
+    'curve_quality'
+]
+
+
+# Jerger tympanogram types, in the order of their categorical codes
+TYMPANOGRAM_TYPES = ['Type A', 'Type As', 'Type Ad', 'Type B', 'Type C']
+
+
+def _smooth_rows(compliance: np.ndarray, window: int) -> np.ndarray:
+    """
+    Moving-average smoothing of each row, as np.convolve(mode='same').
+    
+    The rows are convolved in one call with zero separators between them.
+    Interior points are computed exactly as in a per-row convolution; edge
+    points (whose window is truncated) may differ in the last bit, so rows
+    where an edge point could be the maximum are recomputed row by row.
+    
+    Args:
+        compliance: Array of shape (n_curves, n_points) without NaN.
+        window: Moving-average window.
+    
+    Returns:
+        Smoothed array of the same shape.
+    """
+    n_curves, n_points = compliance.shape
+    kernel = np.ones(window) / window
+    
+    padded = np.zeros((n_curves, n_points + window - 1))
+    padded[:, :n_points] = compliance
+    smoothed = np.convolve(padded.reshape(-1), kernel, mode='same').reshape(padded.shape)[:, :n_points]
+    smoothed = np.ascontiguousarray(smoothed)
+    
+    # Alignment of np.convolve(mode='same'): window // 2 points on the left
+    n_left = window // 2
+    n_right = window - n_left - 1
+    edges = np.zeros(n_points, dtype=bool)
+    edges[:n_left] = True
+    edges[n_points - n_right:] = True
+    
+    interior_max = smoothed[:, ~edges].max(axis=1)
+    edge_max = smoothed[:, edges].max(axis=1)
+    tolerance = 1e-9 * (1.0 + np.abs(interior_max))
+    
+    for row in np.flatnonzero(edge_max >= interior_max - tolerance):
+        smoothed[row] = np.convolve(compliance[row], kernel, mode='same')
+    
+    return smoothed
+
+
+def _group_parameters(
+    pressure: np.ndarray,
+    compliance: np.ndarray,
+    use_curve_fitting: bool
+) -> Dict[str, np.ndarray]:
+    """
+    Compute parameters for curves with the same number of valid points.
+    
+    Args:
+        pressure: Sorted valid pressures, shape (n_curves, n_valid).
+        compliance: Corresponding compliance values, shape (n_curves, n_valid).
+        use_curve_fitting: Whether to find the peak on the smoothed curve.
+    
+    Returns:
+        Dictionary of parameter arrays of length n_curves.
+    """
+    n_curves, n_valid = compliance.shape
+    rows = np.arange(n_curves)
+    
+    # Baseline: mean compliance over the highest 10% of pressures (a suffix of each row)
+    high_pressure_threshold = np.percentile(pressure, 90, axis=1, keepdims=True)
+    n_high = (pressure >= high_pressure_threshold).sum(axis=1)
+    baseline_compliance = np.empty(n_curves)
+    for count in np.unique(n_high):
+        selected = n_high == count
+        baseline_compliance[selected] = compliance[selected, n_valid - count:].mean(axis=1)
+    
+    # Peak on the smoothed or raw curve
+    if use_curve_fitting and n_valid > 10:
+        peak_curve = _smooth_rows(compliance, min(5, n_valid // 3))
+    else:
+        peak_curve = compliance
+    
+    peak_idx = np.argmax(peak_curve, axis=1)
+    peak_compliance = peak_curve[rows, peak_idx]
+    peak_pressure = pressure[rows, peak_idx]
+    
+    # Gradient: width between the half-peak points either side of the peak
+    peak_height = peak_compliance - baseline_compliance
+    half_peak_height = baseline_compliance + (peak_height / 2)
+    distance = np.abs(compliance - half_peak_height[:, None])
+    columns = np.arange(n_valid)
+    
+    left_idx = np.where(columns <= peak_idx[:, None], distance, np.inf).argmin(axis=1)
+    right_idx = np.where(columns >= peak_idx[:, None], distance, np.inf).argmin(axis=1)
+    has_width = (peak_height > 0.05) & (peak_idx >= 1) & (peak_idx <= n_valid - 2)
+    gradient = np.where(
+        has_width, pressure[rows, right_idx] - pressure[rows, left_idx], np.nan
+    )
+    
+    # Equivalent volume estimate from the baseline
+    equivalent_volume = np.select(
+        [baseline_compliance < 0.2, baseline_compliance > 2.0],
+        [0.5, baseline_compliance * 0.4],
+        default=baseline_compliance
+    )
+    
+    # Curve quality (see NHANESTympanometryLoader._assess_curve_quality)
+    quality_score = np.ones(n_curves)
+    quality_score *= np.select(
+        [peak_height < 0.1, peak_height < 0.3, peak_height > 3.0], [0.3, 0.6, 0.7], default=1.0
+    )
+    
+    compliance_diff = np.diff(compliance, axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        noise_level = np.std(compliance_diff, axis=1) / np.mean(np.abs(compliance_diff), axis=1)
+    quality_score *= np.select([noise_level > 2.0, noise_level > 1.0], [0.5, 0.8], default=1.0)
+    
+    implausible = (peak_compliance > 5.0) | (peak_compliance < 0.01)
+    quality_score *= np.where(implausible, 0.4, 1.0)
+    quality_score *= min(1.0, n_valid / 84)  # Should have 84 points
+    
+    return {
+        'peak_pressure': peak_pressure,
+        'peak_compliance': peak_compliance,
+        'gradient': gradient,
+        'equivalent_volume': equivalent_volume,
+        'baseline_compliance': baseline_compliance,
+        'curve_quality': np.clip(quality_score, 0.0, 1.0)
+    }
+
+
+def _parameters_block(args: Tuple[np.ndarray, np.ndarray, bool]) -> Dict[str, np.ndarray]:
+    """Compute parameters for a block of curves (runs in a worker process)."""
+    pressure_values, compliance, use_curve_fitting = args
+    n_curves = compliance.shape[0]
+    
+    # Scalar defaults for curves with fewer than 5 valid points
+    results = {name: np.full(n_curves, np.nan) for name in PARAMETER_NAMES}
+    results['curve_quality'] = np.zeros(n_curves)
+    
+    # Sort points by pressure, then move each curve's valid points to the front
+    order = np.argsort(pressure_values)
+    sorted_pressure = np.asarray(pressure_values, dtype=np.float64)[order]
+    sorted_compliance = np.asarray(compliance, dtype=np.float64)[:, order]
+    
+    valid = ~np.isnan(sorted_compliance) & (sorted_compliance >= 0)
+    n_valid = valid.sum(axis=1)
+    compact = np.argsort(~valid, axis=1, kind='stable')
+    packed_pressure = sorted_pressure[compact]
+    packed_compliance = np.take_along_axis(sorted_compliance, compact, axis=1)
+    
+    for count in np.unique(n_valid[n_valid >= 5]):
+        selected = np.flatnonzero(n_valid == count)
+        group_results = _group_parameters(
+            packed_pressure[selected, :count],
+            packed_compliance[selected, :count],
+            use_curve_fitting
+        )
+        for name, values in group_results.items():
+            results[name][selected] = values
+    
+    return results
+
+
+def classify_tympanograms_batch(
+    peak_pressure: np.ndarray,
+    peak_compliance: np.ndarray
+) -> pd.Categorical:
+    """
+    Classify tympanograms into Jerger types from their peak parameters.
+    
+    Rules (applied in order):
+    - Type B: no peak (missing peak pressure or compliance)
+    - Type C: peak pressure below -150 daPa
+    - Type As: peak compliance below 0.3 ml
+    - Type Ad: peak compliance above 1.7 ml
+    - Type A: otherwise
+    
+    Args:
+        peak_pressure: Peak pressures in daPa.
+        peak_compliance: Peak compliances in ml.
+        
+    Returns:
+        Categorical with the categories TYMPANOGRAM_TYPES, one value per curve.
+    """
+    peak_pressure = np.asarray(peak_pressure, dtype=np.float64)
+    peak_compliance = np.asarray(peak_compliance, dtype=np.float64)
+    
+    codes = np.select(
+        [
+            np.isnan(peak_pressure) | np.isnan(peak_compliance),
+            peak_pressure < -150,
+            peak_compliance < 0.3,
+            peak_compliance > 1.7
+        ],
+        [
+            TYMPANOGRAM_TYPES.index('Type B'),
+            TYMPANOGRAM_TYPES.index('Type C'),
+            TYMPANOGRAM_TYPES.index('Type As'),
+            TYMPANOGRAM_TYPES.index('Type Ad')
+        ],
+        default=TYMPANOGRAM_TYPES.index('Type A')
+    )
+    
+    return pd.Categorical.from_codes(codes, categories=TYMPANOGRAM_TYPES)
+
+
+def _run_blocks(
+    func: Callable[[Tuple], Dict[str, np.ndarray]],
+    blocks: List[Tuple],
+    n_workers: int,
+    names: List[str]
+) -> Dict[str, np.ndarray]:
+    """Run a block function serially or in worker processes and concatenate the results."""
+    if n_workers > 1 and len(blocks) > 1:
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            block_results = list(executor.map(func, blocks))
+    else:
+        block_results = [func(block) for block in blocks]
+    
+    if not block_results:
+        return {name: np.empty(0) for name in names}
+    
+    return {
+        name: np.concatenate([results[name] for results in block_results])
+        for name in names
+    }
+
+
+def calculate_tympanometric_parameters_batch(
+    pressure_values: np.ndarray,
+    compliance: np.ndarray,
+    use_curve_fitting: bool = True,
+    n_workers: int = 1,
+    block_rows: int = 8192
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate tympanometric parameters for every curve of a matrix.
+    
+    Results match NHANESTympanometryLoader.calculate_tympanometric_parameters()
+    applied to each row.
+    
+    Args:
+        pressure_values: Pressure values in daPa shared by all curves.
+        compliance: Compliance matrix of shape (n_curves, n_points) in ml.
+        use_curve_fitting: Whether to find the peak on the smoothed curve.
+        n_workers: Number of worker processes (1 runs in-process).
+        block_rows: Curves per block.
+    
+    Returns:
+        Dictionary of parameter arrays of length n_curves, with the keys of
+        the scalar function.
+    
+    Raises:
+        ValueError: If the shapes of pressure and compliance do not match.
+    """
+    compliance = np.atleast_2d(compliance)
+    if compliance.shape[1] != len(pressure_values):
+        raise ValueError(
+            f"Compliance matrix has {compliance.shape[1]} points but "
+            f"{len(pressure_values)} pressure values were given"
+        )
+    
+    blocks = [
+        (pressure_values, compliance[start:start + block_rows], use_curve_fitting)
+        for start in range(0, len(compliance), block_rows)
+    ]
+    
+    return _run_blocks(_parameters_block, blocks, n_workers, PARAMETER_NAMES)
+
+
+FIT_MODELS = ('gaussian', 'lorentzian')
+
+FIT_RESULT_NAMES = [
+    'peak_pressure',
+    'peak_compliance',
+    'width',
+    'baseline',
+    'amplitude',
+    'rmse',
+    'r_squared',
+    'n_iterations',
+    'converged'
+]
+
+
+def _peak_model(
+    theta: np.ndarray,
+    pressure: np.ndarray,
+    model: str
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Evaluate a peaked model and its Jacobian for a batch of curves.
+    
+    The parameters of each curve are (baseline, amplitude, centre,
+    log width), with width the Gaussian sigma or the Lorentzian half width.
+    
+    Args:
+        theta: Parameters of shape (n_curves, 4).
+        pressure: Pressure values of shape (n_points,).
+        model: 'gaussian' or 'lorentzian'.
+    
+    Returns:
+        Tuple of (model values (n_curves, n_points), Jacobian (n_curves, n_points, 4)).
+    """
+    baseline, amplitude, centre, log_width = theta.T
+    width = np.exp(log_width)[:, None]
+    u = (pressure[None, :] - centre[:, None]) / width
+    
+    if model == 'gaussian':
+        shape = np.exp(-0.5 * u ** 2)
+        d_centre = amplitude[:, None] * shape * u / width
+        d_log_width = amplitude[:, None] * shape * u ** 2
+    else:
+        shape = 1.0 / (1.0 + u ** 2)
+        d_centre = amplitude[:, None] * 2.0 * u * shape ** 2 / width
+        d_log_width = amplitude[:, None] * 2.0 * u ** 2 * shape ** 2
+    
+    values = baseline[:, None] + amplitude[:, None] * shape
+    jacobian = np.stack([np.ones_like(shape), shape, d_centre, d_log_width], axis=2)
+    
+    return values, jacobian
+
+
+def _initial_fit_parameters(
+    pressure: np.ndarray,
+    compliance: np.ndarray,
+    valid: np.ndarray,
+    model: str
+) -> np.ndarray:
+    """
+    Initial parameters from the raw curves: minimum as baseline, maximum as
+    peak, and the width of the points above half the peak height.
+    """
+    masked_low = np.where(valid, compliance, np.inf)
+    masked_high = np.where(valid, compliance, -np.inf)
+    baseline = masked_low.min(axis=1)
+    peak_idx = masked_high.argmax(axis=1)
+    amplitude = masked_high.max(axis=1) - baseline
+    
+    step = np.abs(np.diff(pressure)).min() if len(pressure) > 1 else 1.0
+    above_half = valid & (compliance >= (baseline + amplitude / 2)[:, None])
+    full_width = np.maximum(above_half.sum(axis=1), 1) * step
+    
+    # Full width at half maximum -> sigma (Gaussian) or half width (Lorentzian)
+    width = full_width / (2 * np.sqrt(2 * np.log(2))) if model == 'gaussian' else full_width / 2
+    
+    return np.column_stack([baseline, amplitude, pressure[peak_idx], np.log(width)])
+
+
+def _fit_block(args: Tuple[np.ndarray, np.ndarray, str, int, float, float]) -> Dict[str, np.ndarray]:
+    """Fit a block of curves with Levenberg-Marquardt (runs in a worker process)."""
+    pressure_values, compliance, model, max_iter, tol, min_amplitude = args
+    pressure = np.asarray(pressure_values, dtype=np.float64)
+    compliance = np.asarray(compliance, dtype=np.float64)
+    n_curves = compliance.shape[0]
+    
+    valid = ~np.isnan(compliance) & (compliance >= 0)
+    n_valid = valid.sum(axis=1)
+    weights = valid.astype(np.float64)
+    observed = np.where(valid, compliance, 0.0)
+    
+    results = {name: np.full(n_curves, np.nan) for name in FIT_RESULT_NAMES}
+    results['n_iterations'] = np.zeros(n_curves, dtype=np.int64)
+    results['converged'] = np.zeros(n_curves, dtype=bool)
+    
+    # Four parameters need at least five points
+    fit_rows = np.flatnonzero(n_valid >= 5)
+    if len(fit_rows) == 0:
+        return results
+    
+    y = observed[fit_rows]
+    w = weights[fit_rows]
+    theta = _initial_fit_parameters(pressure, y, valid[fit_rows], model)
+    
+    # Keep the centre near the pressure range and the width between a
+    # fraction of a pressure step and a multiple of the range, so that flat
+    # curves cannot drive either to infinity
+    step_size = np.abs(np.diff(pressure)).min() if len(pressure) > 1 else 1.0
+    span = max(np.ptp(pressure), step_size)
+    lower = np.array([-np.inf, -np.inf, pressure.min() - span, np.log(step_size / 4)])
+    upper = np.array([np.inf, np.inf, pressure.max() + span, np.log(10 * span)])
+    theta = np.clip(theta, lower, upper)
+    damping = np.full(len(fit_rows), 1e-3)
+    iterations = np.zeros(len(fit_rows), dtype=np.int64)
+    converged = np.zeros(len(fit_rows), dtype=bool)
+    
+    values, jacobian = _peak_model(theta, pressure, model)
+    residuals = w * (y - values)
+    cost = (residuals ** 2).sum(axis=1)
+    
+    active = np.arange(len(fit_rows))
+    for _ in range(max_iter):
+        if len(active) == 0:
+            break
+        
+        # Damped normal equations (Marquardt scaling of the diagonal)
+        J = jacobian[active] * w[active, :, None]
+        JtJ = np.einsum('nmi,nmj->nij', J, J)
+        Jtr = np.einsum('nmi,nm->ni', J, residuals[active])
+        diagonal = np.einsum('nii->ni', JtJ)
+        scale = damping[active, None] * (diagonal + 1e-12 * (1.0 + diagonal.max(axis=1, keepdims=True)))
+        system = JtJ + scale[:, :, None] * np.eye(4)
+        step = np.linalg.solve(system, Jtr[:, :, None])[:, :, 0]
+        step[~np.isfinite(step)] = 0.0
+        
+        trial = np.clip(theta[active] + step, lower, upper)
+        trial_values, trial_jacobian = _peak_model(trial, pressure, model)
+        trial_residuals = w[active] * (y[active] - trial_values)
+        trial_cost = (trial_residuals ** 2).sum(axis=1)
+        
+        improved = np.isfinite(trial_cost) & (trial_cost < cost[active])
+        accepted = active[improved]
+        theta[accepted] = trial[improved]
+        jacobian[accepted] = trial_jacobian[improved]
+        residuals[accepted] = trial_residuals[improved]
+        
+        decrease = cost[active] - np.where(improved, trial_cost, cost[active])
+        cost[accepted] = trial_cost[improved]
+        damping[active] = np.where(improved, damping[active] / 10, damping[active] * 10)
+        iterations[active] += 1
+        
+        # Converged when an accepted step barely reduces the cost, or when
+        # the damping has grown so large that no step can be taken
+        done = (improved & (decrease <= tol * (cost[active] + tol))) | (damping[active] > 1e10)
+        converged[active[done]] = True
+        active = active[~done]
+    
+    baseline, amplitude, centre, log_width = theta.T
+    width = np.exp(log_width)
+    full_width = width * 2 * np.sqrt(2 * np.log(2)) if model == 'gaussian' else width * 2
+    
+    observed_mean = (y * w).sum(axis=1) / n_valid[fit_rows]
+    total = (w * (y - observed_mean[:, None]) ** 2).sum(axis=1)
+    
+    results['peak_pressure'][fit_rows] = centre
+    results['peak_compliance'][fit_rows] = baseline + amplitude
+    results['width'][fit_rows] = full_width
+    results['baseline'][fit_rows] = baseline
+    results['amplitude'][fit_rows] = amplitude
+    results['rmse'][fit_rows] = np.sqrt(cost / n_valid[fit_rows])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        results['r_squared'][fit_rows] = np.where(total > 0, 1 - cost / total, np.nan)
+    results['n_iterations'][fit_rows] = iterations
+    results['converged'][fit_rows] = converged
+    
+    # A flat (Type B) curve has no peak: the fitted centre and width only
+    # reflect where the solver stopped, so they are not reported
+    flat_rows = fit_rows[~(amplitude > min_amplitude)]
+    for name in ['peak_pressure', 'peak_compliance', 'width']:
+        results[name][flat_rows] = np.nan
+    results['converged'][flat_rows] = False
+    
+    return results
+
+
+def fit_tympanograms_batch(
+    pressure_values: np.ndarray,
+    compliance: np.ndarray,
+    model: str = 'gaussian',
+    max_iter: int = 100,
+    tol: float = 1e-8,
+    n_workers: int = 1,
+    block_rows: int = 4096,
+    min_amplitude: float = 0.01
+) -> Dict[str, np.ndarray]:
+    """
+    Fit a peaked model plus baseline to every curve of a matrix.
+    
+    All curves of a block are fitted together: each Levenberg-Marquardt
+    iteration evaluates the model and Jacobian of every curve as arrays
+    and solves the batch of 4x4 damped normal equations at once, with
+    per-curve damping and convergence.
+    
+    Args:
+        pressure_values: Pressure values in daPa shared by all curves.
+        compliance: Compliance matrix of shape (n_curves, n_points) in ml.
+                   Missing and negative values are ignored.
+        model: 'gaussian' or 'lorentzian'.
+        max_iter: Maximum number of iterations.
+        tol: Relative cost decrease below which a curve has converged.
+        n_workers: Number of worker processes (1 runs in-process).
+        block_rows: Curves per block.
+        min_amplitude: Fitted amplitude (ml) at or below which a curve is
+                      treated as flat: its peak pressure, peak compliance
+                      and width are NaN and it is not marked converged.
+    
+    Returns:
+        Dictionary of arrays of length n_curves:
+        - peak_pressure: Fitted (sub-sample) peak pressure (daPa)
+        - peak_compliance: Fitted peak compliance, baseline + amplitude (ml)
+        - width: Full width at half maximum of the peak (daPa)
+        - baseline, amplitude: Fitted baseline and peak height (ml)
+        - rmse, r_squared: Fit residual measures
+        - n_iterations, converged: Solver diagnostics
+    
+    Raises:
+        ValueError: If the model is unknown or the shapes do not match.
+    """
+    if model not in FIT_MODELS:
+        raise ValueError(f"Unknown model '{model}'. Use {list(FIT_MODELS)}")
+    
+    compliance = np.atleast_2d(compliance)
+    if compliance.shape[1] != len(pressure_values):
+        raise ValueError(
+            f"Compliance matrix has {compliance.shape[1]} points but "
+            f"{len(pressure_values)} pressure values were given"
+        )
+    
+    blocks = [
+        (pressure_values, compliance[start:start + block_rows], model, max_iter, tol, min_amplitude)
+        for start in range(0, len(compliance), block_rows)
+    ]
+    
+    return _run_blocks(_fit_block, blocks, n_workers, FIT_RESULT_NAMES)
@@ -6,12 +6,27 @@ including parsing raw tympanogram curves and creating pressure-compliance datase
 for visualization and analysis.
 """
 
+import json
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
 
+from .cache_utils import hash_file, write_json_atomic, write_parquet_atomic
+from .curve_cache import CurveCache, get_curve_cache
+from .curve_index import CurveSimilarityIndex
+from .curve_store import CurveStore, load_or_build_curve_store
+from .tympanometry_batch import (
+    PARAMETER_NAMES,
+    TYMPANOGRAM_TYPES,
+    TYMPANOMETRY_ALGORITHM_VERSION,
+    calculate_tympanometric_parameters_batch,
+    classify_tympanograms_batch,
+    fit_tympanograms_batch
+)
+
 
 class NHANESTympanometryLoader:
     """
@@ -21,14 +36,26 @@ class NHANESTympanometryLoader:
     which contains 84 measurement points per ear across different pressure levels.
     """
     
-    def __init__(self, data_dir: Union[str, Path]):
+    def __init__(
+        self,
+        data_dir: Union[str, Path],
+        derived_dir: Optional[Union[str, Path]] = None,
+        curve_cache: Optional[CurveCache] = None
+    ):
         """
         Initialize the tympanometry data loader.
         
         Args:
             data_dir: Path to the NHANES data directory containing tympanometry files.
+            derived_dir: Optional directory for cached parameter tables and curve
+                        stores. Defaults to a 'derived' directory next to the
+                        tympanometry files.
+            curve_cache: Optional cache of per-participant curves and parameters.
+                        Defaults to the cache shared by all loaders.
         """
         self.data_dir = Path(data_dir)
+        self.tymp_dir = self.data_dir / 'nhanes' / 'tymp'
+        self.derived_dir = Path(derived_dir) if derived_dir else self.tymp_dir / 'derived'
         
         # NHANES tympanometry specifications
         self.n_measurements = 84
@@ -49,6 +76,10 @@ class NHANESTympanometryLoader:
             '2007-08.csv', '2009-10.csv', '2011-12.csv', '2015-16.csv',
             '2017-18.csv', '2017-20.csv'
         ]
+        
+        # Curve store of the most recently queried frame
+        self._curve_store = None
+        self.curve_cache = curve_cache if curve_cache is not None else get_curve_cache()
     
     def _generate_pressure_values(self) -> np.ndarray:
         """
@@ -67,6 +98,10 @@ class NHANESTympanometryLoader:
             self.pressure_increment
         )
     
+    def get_cohort_file(self, cohort_suffix: str) -> Path:
+        """Get the path of a cohort's tympanometry file."""
+        return self.tymp_dir / f'nhanes_auxt_{cohort_suffix}'
+    
     def load_cohort_data(self, cohort_suffix: str) -> pd.DataFrame:
         """
         Load tympanometry data for a single cohort.
@@ -80,7 +115,7 @@ class NHANESTympanometryLoader:
         Raises:
             FileNotFoundError: If the tympanometry file is not found.
         """
-        filepath = self.data_dir / 'nhanes' / 'tymp' / f'nhanes_auxt_{cohort_suffix}'
+        filepath = self.get_cohort_file(cohort_suffix)
         
         try:
             df = pd.read_csv(filepath)
@@ -91,6 +126,93 @@ class NHANESTympanometryLoader:
                 f"Please ensure data directory structure is correct."
             )
     
+    def build_curve_store(self, df: pd.DataFrame) -> CurveStore:
+        """
+        Pack the tympanograms of a frame into a SEQN-indexed curve store.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            
+        Returns:
+            CurveStore of shape (participants, 2 ears, 84 points).
+        """
+        return CurveStore.from_frame(
+            df,
+            {'Right': self.right_ear_columns, 'Left': self.left_ear_columns},
+            self.pressure_values,
+            x_name='Pressure_daPa',
+            y_name='Compliance_ml'
+        )
+    
+    def get_curve_store_path(self, cohort_suffix: str) -> Path:
+        """Get the directory of a cohort's saved curve store."""
+        cohort = cohort_suffix.replace('.csv', '')
+        return self.derived_dir / f'nhanes_auxt_{cohort}_curves'
+    
+    def load_curve_store(
+        self,
+        cohort_suffix: str,
+        dtype: str = 'float32',
+        mmap: bool = True,
+        refresh: bool = False
+    ) -> CurveStore:
+        """
+        Load a cohort's tympanograms as a memory-mapped curve store.
+        
+        The CSV is parsed only the first time (or when it changes); the
+        store is then saved in binary form and memory-mapped on later loads.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '1999-2000.csv').
+            dtype: 'float32', or 'int16' for curves quantised to the
+                  0.001 ml precision of the NHANES files.
+            mmap: Memory-map the curve array instead of reading it.
+            refresh: Rebuild the store even if a valid saved store exists.
+            
+        Returns:
+            CurveStore of shape (participants, 2 ears, 84 points).
+            
+        Raises:
+            FileNotFoundError: If the tympanometry file is not found.
+        """
+        source_file = self.get_cohort_file(cohort_suffix)
+        if not source_file.exists():
+            raise FileNotFoundError(
+                f"Tympanometry file not found: {source_file}. "
+                f"Please ensure data directory structure is correct."
+            )
+        
+        return load_or_build_curve_store(
+            self.get_curve_store_path(cohort_suffix),
+            source_file,
+            lambda: self.build_curve_store(self.load_cohort_data(cohort_suffix)),
+            dtype=dtype,
+            mmap=mmap,
+            refresh=refresh,
+            metadata={'cohort': cohort_suffix.replace('.csv', ''), 'measurement': 'tympanometry'}
+        )
+    
+    def get_curve_store(self, df: pd.DataFrame, refresh: bool = False) -> CurveStore:
+        """
+        Get the curve store of a frame, building it on first use.
+        
+        The store of the most recently queried frame is kept, so repeated
+        lookups against the same frame are O(1). The store is matched by
+        frame identity, so pass refresh=True after modifying a frame in
+        place. The rebuilt store has a new token, so curves cached from the
+        old store are not served again.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            refresh: Rebuild the store even if the frame was queried before.
+            
+        Returns:
+            CurveStore for the frame.
+        """
+        if refresh or self._curve_store is None or self._curve_store[0] is not df:
+            self._curve_store = (df, self.build_curve_store(df))
+        return self._curve_store[1]
+    
     def extract_tympanogram_data(
         self, 
         df: pd.DataFrame, 
@@ -111,31 +233,23 @@ class NHANESTympanometryLoader:
         Raises:
             ValueError: If participant SEQN is not found in the dataset.
         """
-        # Find participant data
-        participant_data = df[df['SEQN'] == seqn]
-        
-        if participant_data.empty:
-            raise ValueError(f"Participant SEQN {seqn} not found in dataset")
-        
-        participant_data = participant_data.iloc[0]  # Get first (should be only) row
-        
-        # Extract right ear data
-        right_ear_data = pd.DataFrame({
-            'Pressure_daPa': self.pressure_values,
-            'Compliance_ml': [participant_data[col] for col in self.right_ear_columns],
-            'Ear': 'Right'
-        })
-        
-        # Extract left ear data  
-        left_ear_data = pd.DataFrame({
-            'Pressure_daPa': self.pressure_values,
-            'Compliance_ml': [participant_data[col] for col in self.left_ear_columns],
-            'Ear': 'Left'
-        })
+        # O(1) lookup of the participant's row, through the curve cache
+        store = self.get_curve_store(df)
+        
+        def build_ear_data(ear: str) -> pd.DataFrame:
+            # The frame's own values (the curve store holds float32)
+            columns = self.right_ear_columns if ear == 'Right' else self.left_ear_columns
+            return pd.DataFrame({
+                'Pressure_daPa': self.pressure_values,
+                'Compliance_ml': self._get_frame_curves(df, [store.get_row(seqn)], columns)[0],
+                'Ear': ear
+            })
         
         return {
-            'right': right_ear_data,
-            'left': left_ear_data
+            ear.lower(): self.curve_cache.get_or_compute(
+                ('tympanometry', store.token, seqn, ear, 'curve'), lambda: build_ear_data(ear)
+            ).copy()
+            for ear in ['Right', 'Left']
         }
     
     def extract_multiple_participants(
@@ -153,26 +267,54 @@ class NHANESTympanometryLoader:
         Returns:
             Long-format DataFrame with columns: SEQN, Pressure_daPa, Compliance_ml, Ear.
         """
-        all_data = []
+        # One vectorised lookup; participants not found are skipped
+        store = self.get_curve_store(df)
+        combined_df = store.to_long(seqn_list, missing='skip')
         
-        for seqn in seqn_list:
-            try:
-                participant_curves = self.extract_tympanogram_data(df, seqn)
-                
-                # Add SEQN to each ear's data
-                for ear_data in participant_curves.values():
-                    ear_data['SEQN'] = seqn
-                    all_data.append(ear_data)
-                    
-            except ValueError:
-                # Skip participants not found
-                continue
-        
-        if not all_data:
+        if combined_df.empty:
             return pd.DataFrame()
         
-        combined_df = pd.concat(all_data, ignore_index=True)
-        return combined_df[['SEQN', 'Pressure_daPa', 'Compliance_ml', 'Ear']]
+        # The frame's own values (the curve store holds float32), in the same order
+        _, rows = store.lookup(seqn_list, missing='skip')
+        columns = self.right_ear_columns + self.left_ear_columns
+        combined_df['Compliance_ml'] = self._get_frame_curves(df, rows, columns).reshape(-1)
+        
+        return combined_df
+    
+    @staticmethod
+    def _get_frame_curves(df: pd.DataFrame, rows: np.ndarray, columns: List[str]) -> np.ndarray:
+        """Read curve columns of frame rows as float64, with NaN for missing columns."""
+        values = df.iloc[rows].reindex(columns=columns)
+        return values.apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    
+    def build_similarity_index(
+        self,
+        df: pd.DataFrame,
+        n_components: int = 10,
+        min_valid: int = 42
+    ) -> CurveSimilarityIndex:
+        """
+        Build a nearest-neighbour index over the tympanograms of every ear.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            n_components: Number of principal components to keep.
+            min_valid: Minimum number of valid points for a curve to be indexed.
+            
+        Returns:
+            CurveSimilarityIndex of the frame's curves.
+        """
+        store = self.get_curve_store(df)
+        seqns, curves = store.gather()
+        
+        return CurveSimilarityIndex.fit(
+            curves.reshape(-1, self.n_measurements),
+            np.repeat(seqns, len(store.ears)),
+            np.tile(store.ears, len(seqns)),
+            self.pressure_values,
+            n_components=n_components,
+            min_valid=min_valid
+        )
     
     def get_participant_list(self, df: pd.DataFrame) -> List[float]:
         """
@@ -357,6 +499,355 @@ class NHANESTympanometryLoader:
             'curve_quality': curve_quality
         }
     
+    def _gather_curve_matrix(
+        self,
+        df: pd.DataFrame,
+        seqn_list: Optional[List[Union[int, float]]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the curves of many participants into one matrix.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            seqn_list: Optional participant sequence numbers. If None, all rows
+                      of the frame are used. Participants not found are skipped.
+            
+        Returns:
+            Tuple of (found SEQNs, float64 matrix of shape (2 * n_found, 84)
+            with the right and left ear curves of each participant in turn).
+        """
+        if seqn_list is None:
+            seqns = df['SEQN'].to_numpy(dtype=np.float64)
+            rows = np.arange(len(df))
+        else:
+            seqns, rows = self.get_curve_store(df).lookup(seqn_list, missing='skip')
+        
+        # Curves from the frame's own values (the curve store holds float32)
+        curves = np.stack([
+            df[self.right_ear_columns].to_numpy(dtype=np.float64)[rows],
+            df[self.left_ear_columns].to_numpy(dtype=np.float64)[rows]
+        ], axis=1)
+        
+        return seqns, curves.reshape(-1, self.n_measurements)
+    
+    def get_participant_parameters(
+        self,
+        df: pd.DataFrame,
+        seqn: Union[int, float],
+        use_curve_fitting: bool = True
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Get the tympanometric parameters of both ears of a participant.
+        
+        Parameters are computed with calculate_tympanometric_parameters() on
+        the participant's row of the frame and kept in the curve cache.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            seqn: Participant sequence number (SEQN).
+            use_curve_fitting: Whether to use curve fitting for peak detection.
+            
+        Returns:
+            Dictionary with 'right' and 'left' parameter dictionaries.
+            
+        Raises:
+            ValueError: If participant SEQN is not found in the dataset.
+        """
+        store = self.get_curve_store(df)
+        
+        def compute(ear: str) -> Dict[str, float]:
+            # The frame's own values (the curve store holds float32)
+            columns = self.right_ear_columns if ear == 'Right' else self.left_ear_columns
+            compliance = pd.to_numeric(df.iloc[store.get_row(seqn)].reindex(columns), errors='coerce')
+            return self.calculate_tympanometric_parameters(
+                self.pressure_values, compliance.to_numpy(dtype=np.float64), use_curve_fitting
+            )
+        
+        return {
+            ear.lower(): dict(self.curve_cache.get_or_compute(
+                ('tympanometry', store.token, seqn, ear, 'parameters', use_curve_fitting), lambda: compute(ear)
+            ))
+            for ear in ['Right', 'Left']
+        }
+    
+    def calculate_parameter_table(
+        self,
+        df: pd.DataFrame,
+        seqn_list: Optional[List[Union[int, float]]] = None,
+        use_curve_fitting: bool = True,
+        n_workers: int = 1
+    ) -> pd.DataFrame:
+        """
+        Calculate tympanometric parameters for every ear of many participants.
+        
+        Uses the batched engine, whose results match
+        calculate_tympanometric_parameters() applied to each curve.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            seqn_list: Optional participant sequence numbers. If None, all rows
+                      of the frame are used. Participants not found are skipped.
+            use_curve_fitting: Whether to use curve fitting for peak detection.
+            n_workers: Number of worker processes.
+            
+        Returns:
+            DataFrame with one row per participant and ear (right, then left),
+            the parameter columns, SEQN and Ear.
+        """
+        seqns, curves = self._gather_curve_matrix(df, seqn_list)
+        
+        params = calculate_tympanometric_parameters_batch(
+            self.pressure_values,
+            curves,
+            use_curve_fitting=use_curve_fitting,
+            n_workers=n_workers
+        )
+        
+        params_df = pd.DataFrame(params)
+        params_df['SEQN'] = np.repeat(seqns, 2)
+        params_df['Ear'] = np.tile(['Right', 'Left'], len(seqns))
+        
+        return params_df
+    
+    def fit_tympanogram_table(
+        self,
+        df: pd.DataFrame,
+        seqn_list: Optional[List[Union[int, float]]] = None,
+        model: str = 'gaussian',
+        n_workers: int = 1
+    ) -> pd.DataFrame:
+        """
+        Fit a peak model plus baseline to every ear of many participants.
+        
+        Unlike calculate_parameter_table(), whose peak pressure lies on the
+        6 daPa measurement grid, the fitted peak pressure and width are
+        continuous, and the residuals show how well each curve fits the model.
+        
+        Args:
+            df: DataFrame containing tympanometry data.
+            seqn_list: Optional participant sequence numbers. If None, all rows
+                      of the frame are used. Participants not found are skipped.
+            model: 'gaussian' or 'lorentzian'.
+            n_workers: Number of worker processes.
+            
+        Returns:
+            DataFrame with one row per participant and ear (right, then left),
+            the fit result columns, SEQN and Ear.
+        """
+        seqns, curves = self._gather_curve_matrix(df, seqn_list)
+        
+        fits = fit_tympanograms_batch(
+            self.pressure_values, curves, model=model, n_workers=n_workers
+        )
+        
+        fits_df = pd.DataFrame(fits)
+        fits_df['SEQN'] = np.repeat(seqns, 2)
+        fits_df['Ear'] = np.tile(['Right', 'Left'], len(seqns))
+        
+        return fits_df
+    
+    @staticmethod
+    def classify_tympanogram_type(params: Dict[str, float]) -> str:
+        """
+        Classify tympanogram type (Jerger) based on calculated parameters.
+        
+        Args:
+            params: Dictionary of tympanometric parameters.
+            
+        Returns:
+            String describing the tympanogram type.
+        """
+        types = classify_tympanograms_batch(
+            [params.get('peak_pressure', np.nan)], [params.get('peak_compliance', np.nan)]
+        )
+        return str(types[0])
+    
+    @staticmethod
+    def classify_parameter_table(table: pd.DataFrame) -> pd.Series:
+        """
+        Classify every ear of a parameter table into a Jerger tympanogram type.
+        
+        Args:
+            table: Parameter table with peak_pressure and peak_compliance columns.
+            
+        Returns:
+            Categorical Series of tympanogram types, aligned with the table.
+        """
+        types = classify_tympanograms_batch(table['peak_pressure'], table['peak_compliance'])
+        return pd.Series(types, index=table.index, name='tympanogram_type')
+    
+    def count_tympanogram_types(
+        self,
+        table: pd.DataFrame,
+        by: Optional[List[str]] = None,
+        normalize: bool = False
+    ) -> pd.DataFrame:
+        """
+        Count tympanogram types per group, e.g. the type prevalence of each
+        cohort or of a synthetic batch.
+        
+        Args:
+            table: Parameter table from load_parameter_table() or
+                  calculate_parameter_table(). Tables without a
+                  tympanogram_type column are classified first.
+            by: Grouping columns. Defaults to ['Cohort'] if present.
+            normalize: Return proportions per group instead of counts.
+            
+        Returns:
+            DataFrame with one row per group and one column per type
+            (every type is present, with zero counts where not observed).
+        """
+        if 'tympanogram_type' in table.columns:
+            types = table['tympanogram_type'].astype(pd.CategoricalDtype(TYMPANOGRAM_TYPES))
+        else:
+            types = self.classify_parameter_table(table)
+        
+        if by is None:
+            by = [col for col in ['Cohort'] if col in table.columns]
+        
+        groups = [table[col] for col in by] if by else pd.Series('all', index=table.index, name='group')
+        counts = pd.crosstab(groups, types, dropna=False).reindex(columns=TYMPANOGRAM_TYPES, fill_value=0)
+        
+        if normalize:
+            counts = counts.div(counts.sum(axis=1).replace(0, np.nan), axis=0)
+        
+        return counts
+    
+    def get_parameter_table_path(self, cohort_suffix: str) -> Path:
+        """Get the path of a cohort's cached parameter table."""
+        cohort = cohort_suffix.replace('.csv', '')
+        return self.derived_dir / f'nhanes_auxt_{cohort}_parameters.parquet'
+    
+    def load_parameter_table(
+        self,
+        cohort_suffix: str,
+        use_curve_fitting: bool = True,
+        n_workers: int = 1,
+        refresh: bool = False
+    ) -> pd.DataFrame:
+        """
+        Load a cohort's per-ear parameter table, computing it only once.
+        
+        The table is persisted as Parquet with a manifest holding the hash of
+        the source file and the algorithm version; it is reused as long as
+        both match, and recomputed otherwise.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '1999-2000.csv').
+            use_curve_fitting: Whether to use curve fitting for peak detection.
+            n_workers: Number of worker processes if the table is computed.
+            refresh: Recompute the table even if a valid cached table exists.
+            
+        Returns:
+            DataFrame with one row per participant and ear: the parameter
+            columns, SEQN, Ear, tympanogram_type and Cohort.
+            
+        Raises:
+            FileNotFoundError: If the tympanometry file is not found.
+        """
+        source_file = self.get_cohort_file(cohort_suffix)
+        if not source_file.exists():
+            raise FileNotFoundError(
+                f"Tympanometry file not found: {source_file}. "
+                f"Please ensure data directory structure is correct."
+            )
+        
+        table_path = self.get_parameter_table_path(cohort_suffix)
+        manifest_path = table_path.with_suffix('.json')
+        key = {
+            'source_hash': hash_file(source_file),
+            'algorithm_version': TYMPANOMETRY_ALGORITHM_VERSION,
+            'use_curve_fitting': use_curve_fitting
+        }
+        
+        if not refresh and table_path.exists() and manifest_path.exists():
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+            if manifest.get('key') == key:
+                return pd.read_parquet(table_path)
+        
+        df = self.load_cohort_data(cohort_suffix)
+        table = self.calculate_parameter_table(df, use_curve_fitting=use_curve_fitting, n_workers=n_workers)
+        table['tympanogram_type'] = self.classify_parameter_table(table)
+        table['Cohort'] = cohort_suffix.replace('.csv', '')
+        
+        # Invalidate the old manifest first so a partial update is never reused
+        manifest_path.unlink(missing_ok=True)
+        write_parquet_atomic(table, table_path)
+        write_json_atomic({
+            'key': key,
+            'source_file': str(source_file),
+            'rows': len(table),
+            'created': datetime.now().isoformat()
+        }, manifest_path)
+        
+        return table
+    
+    def load_all_parameter_tables(
+        self,
+        cohort_suffixes: Optional[List[str]] = None,
+        use_curve_fitting: bool = True,
+        n_workers: int = 1,
+        refresh: bool = False
+    ) -> pd.DataFrame:
+        """
+        Load and combine the cached parameter tables of multiple cohorts.
+        
+        Args:
+            cohort_suffixes: Optional list of cohort suffixes to load.
+                           If None, loads all available cohorts.
+            use_curve_fitting: Whether to use curve fitting for peak detection.
+            n_workers: Number of worker processes for tables that are computed.
+            refresh: Recompute the tables even if valid cached tables exist.
+            
+        Returns:
+            Combined parameter table of all cohorts.
+        """
+        if cohort_suffixes is None:
+            cohort_suffixes = self.cohort_suffixes
+        
+        tables = []
+        
+        for suffix in cohort_suffixes:
+            try:
+                tables.append(self.load_parameter_table(suffix, use_curve_fitting, n_workers, refresh))
+            except FileNotFoundError:
+                print(f"Warning: Cohort file not found for {suffix}, skipping...")
+                continue
+        
+        if not tables:
+            raise FileNotFoundError("No tympanometry data files found")
+        
+        return pd.concat(tables, ignore_index=True)
+    
+    def summarize_parameter_table(
+        self,
+        table: pd.DataFrame,
+        by: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Summarize a parameter table by group, e.g. to compare cohorts or a
+        synthetic batch against real data.
+        
+        Args:
+            table: Parameter table from load_parameter_table() or
+                  calculate_parameter_table().
+            by: Grouping columns. Defaults to ['Cohort', 'Ear'] (the columns
+               that are present).
+            
+        Returns:
+            DataFrame with the number of ears and the median of each
+            parameter per group.
+        """
+        if by is None:
+            by = [col for col in ['Cohort', 'Ear'] if col in table.columns]
+        
+        grouped = table.groupby(by, sort=False) if by else table.groupby(lambda _: 'all')
+        summary = grouped[PARAMETER_NAMES].median()
+        summary.insert(0, 'n_ears', grouped.size())
+        
+        return summary
+    
     def _assess_curve_quality(
         self, 
         pressure: np.ndarray, 
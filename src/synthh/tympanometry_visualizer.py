@@ -6,6 +6,7 @@ including individual tympanograms, comparative plots, and summary statistics
 visualization.
 """
 
+import hashlib
 from typing import Dict, List, Optional, Tuple, Union
 
 import matplotlib.pyplot as plt
@@ -14,6 +15,7 @@ import numpy as np
 import pandas as pd
 import seaborn as sns
 
+from .curve_cache import CurveCache, get_curve_cache
 from .tympanometry_loader import NHANESTympanometryLoader
 
 
@@ -25,16 +27,22 @@ class TympanometryVisualizer:
     across participants, and creating publication-quality figures.
     """
     
-    def __init__(self, style: str = 'clinical'):
+    def __init__(self, style: str = 'clinical', curve_cache: Optional[CurveCache] = None):
         """
         Initialize the tympanometry visualizer.
         
         Args:
             style: Plotting style ('clinical', 'scientific', or 'minimal').
+            curve_cache: Optional cache of computed parameters. Defaults to
+                        the cache shared with the loaders.
         """
         self.style = style
         self._setup_style()
         
+        # Loader used only for parameter calculation, with the shared cache
+        self.curve_cache = curve_cache if curve_cache is not None else get_curve_cache()
+        self._parameter_loader = NHANESTympanometryLoader('.', curve_cache=self.curve_cache)
+        
         # Clinical reference ranges for tympanometric parameters
         self.reference_ranges = {
             'peak_pressure': (-150, 50),    # daPa, normal middle ear pressure
@@ -113,10 +121,12 @@ class TympanometryVisualizer:
         if show_reference_ranges:
             self._add_reference_ranges(ax)
         
-        # Calculate and display tympanometric parameters
-        from .tympanometry_loader import NHANESTympanometryLoader
-        loader = NHANESTympanometryLoader('.')  # Dummy loader for parameter calculation
-        params = loader.calculate_tympanometric_parameters(plot_pressure, plot_compliance)
+        # Calculate and display tympanometric parameters (cached per curve)
+        curve_key = hashlib.sha1(plot_pressure.tobytes() + plot_compliance.tobytes()).hexdigest()
+        params = dict(self.curve_cache.get_or_compute(
+            ('tympanometry', seqn, ear, 'plot_parameters', curve_key),
+            lambda: self._parameter_loader.calculate_tympanometric_parameters(plot_pressure, plot_compliance)
+        ))
         
         # Mark peak if valid
         if not np.isnan(params['peak_pressure']) and not np.isnan(params['peak_compliance']):
@@ -340,23 +350,7 @@ class TympanometryVisualizer:
         Returns:
             String describing the tympanogram type.
         """
-        peak_pressure = params.get('peak_pressure', np.nan)
-        peak_compliance = params.get('peak_compliance', np.nan)
-        
-        if np.isnan(peak_pressure) or np.isnan(peak_compliance):
-            return 'Type B'  # Flat/no clear peak
-        
-        # Type C: Negative pressure
-        if peak_pressure < -150:
-            return 'Type C'
-        
-        # Type A variants based on compliance
-        if peak_compliance < 0.3:
-            return 'Type As'  # Shallow/stiff
-        elif peak_compliance > 1.7:
-            return 'Type Ad'  # Deep/flaccid
-        else:
-            return 'Type A'   # Normal
+        return NHANESTympanometryLoader.classify_tympanogram_type(params)
     
     def _format_parameter_text(self, params: Dict[str, float]) -> str:
         """Format tympanometric parameters for display."""
@@ -380,47 +374,46 @@ class TympanometryVisualizer:
         self,
         df: pd.DataFrame,
         loader: NHANESTympanometryLoader,
-        sample_size: int = 100,
-        figsize: Tuple[float, float] = (15, 10)
+        sample_size: Optional[int] = None,
+        figsize: Tuple[float, float] = (15, 10),
+        n_workers: int = 1,
+        params_df: Optional[pd.DataFrame] = None
     ) -> plt.Figure:
         """
         Plot summary statistics for tympanometric parameters across participants.
         
         Args:
-            df: DataFrame containing tympanometry data.
+            df: DataFrame containing tympanometry data (unused if params_df is given).
             loader: NHANESTympanometryLoader instance.
-            sample_size: Number of participants to sample for analysis.
+            sample_size: Optional number of participants to sample. If None,
+                        every participant is included.
             figsize: Figure size as (width, height).
+            n_workers: Number of worker processes for the parameter calculation.
+            params_df: Optional precomputed parameter table, e.g. from
+                      loader.load_all_parameter_tables().
             
         Returns:
             Matplotlib figure with summary statistics plots.
         """
-        # Sample participants and calculate parameters
-        available_seqns = loader.get_participant_list(df)
-        sample_seqns = np.random.choice(available_seqns, 
-                                       size=min(sample_size, len(available_seqns)), 
-                                       replace=False)
-        
-        # Collect parameters for both ears
-        parameters_data = []
-        
-        for seqn in sample_seqns:
-            try:
-                ear_data = loader.extract_tympanogram_data(df, seqn)
-                
-                for ear in ['right', 'left']:
-                    pressure = ear_data[ear]['Pressure_daPa'].values
-                    compliance = ear_data[ear]['Compliance_ml'].values
-                    params = loader.calculate_tympanometric_parameters(pressure, compliance)
-                    
-                    params['SEQN'] = seqn
-                    params['Ear'] = ear.title()
-                    parameters_data.append(params)
-                    
-            except ValueError:
-                continue
+        if params_df is not None:
+            # Read from the precomputed table
+            if sample_size is not None:
+                available_seqns = params_df['SEQN'].dropna().unique()
+                sample_seqns = np.random.choice(available_seqns,
+                                               size=min(sample_size, len(available_seqns)),
+                                               replace=False)
+                params_df = params_df[params_df['SEQN'].isin(sample_seqns)]
+        else:
+            # Sample participants if requested
+            sample_seqns = None
+            if sample_size is not None:
+                available_seqns = loader.get_participant_list(df)
+                sample_seqns = np.random.choice(available_seqns, 
+                                               size=min(sample_size, len(available_seqns)), 
+                                               replace=False)
         
-        params_df = pd.DataFrame(parameters_data)
+            # Calculate parameters for both ears of all (sampled) participants at once
+            params_df = loader.calculate_parameter_table(df, sample_seqns, n_workers=n_workers)
         
         # Create subplots
         fig, axes = plt.subplots(2, 2, figsize=figsize)
@@ -449,6 +442,44 @@ class TympanometryVisualizer:
         
         plt.tight_layout()
         return fig
+    
+    def plot_type_distribution(
+        self,
+        params_df: pd.DataFrame,
+        loader: NHANESTympanometryLoader,
+        by: Optional[List[str]] = None,
+        normalize: bool = True,
+        figsize: Tuple[float, float] = (10, 6)
+    ) -> plt.Figure:
+        """
+        Plot the prevalence of Jerger tympanogram types per group.
+        
+        Args:
+            params_df: Parameter table, e.g. from loader.load_all_parameter_tables().
+            loader: NHANESTympanometryLoader instance.
+            by: Grouping columns. Defaults to ['Cohort'] if present.
+            normalize: Plot proportions per group instead of counts.
+            figsize: Figure size as (width, height).
+            
+        Returns:
+            Matplotlib figure with one group of bars per type.
+        """
+        counts = loader.count_tympanogram_types(params_df, by=by, normalize=normalize)
+        
+        fig, ax = plt.subplots(figsize=figsize)
+        counts.T.plot.bar(ax=ax, rot=0, alpha=0.8)
+        
+        ax.set_xticklabels([
+            f"{tymp_type}\n({self.tymp_types[tymp_type]['description']})" for tymp_type in counts.columns
+        ])
+        ax.set_xlabel('Tympanogram Type', fontsize=12, fontweight='bold')
+        ax.set_ylabel('Proportion of Ears' if normalize else 'Number of Ears', fontsize=12, fontweight='bold')
+        ax.set_title('Tympanogram Type Distribution', fontsize=14, fontweight='bold')
+        ax.grid(True, axis='y', alpha=self.grid_alpha)
+        ax.legend(title=' / '.join(str(name) for name in counts.index.names))
+        
+        plt.tight_layout()
+        return fig
 
 
 def visualize_participant_tympanograms(
@@ -0,0 +1,963 @@
+"""
+NHANES Wideband Reflectance Data Loading Module
+
+This module provides functions for loading and processing NHANES wideband
+reflectance (wideband acoustic immittance) data. The long-format records
+(one row per participant, ear, pressure and frequency) are parsed in chunks,
+reading only the needed columns, straight into a memory-mapped
+(participants, ears, pressures, frequencies) float32 absorbance array with a
+SEQN -> row index. Cohort arrays are cached on disk, keyed by the source
+file hash, so the CSV is parsed once; summary metrics (absorbance at ambient
+pressure, resonance frequency, peak pressure) are computed for blocks of
+participants with array operations.
+"""
+
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .cache_utils import hash_file, write_directory_atomic
+from .curve_cache import CurveCache, get_curve_cache
+from .curve_store import read_curve_store_metadata
+
+# Bump when the on-disk layout changes so saved stores are rebuilt
+WIDEBAND_STORE_FORMAT_VERSION = 1
+
+WIDEBAND_SUMMARY_NAMES = [
+    'ambient_absorbance',
+    'peak_absorbance',
+    'resonance_frequency',
+    'peak_pressure'
+]
+
+# Default columns of the long-format wideband files
+DEFAULT_WIDEBAND_COLUMNS = {
+    'seqn': 'SEQN',
+    'ear': 'Ear',
+    'pressure': 'Pressure_daPa',
+    'frequency': 'Frequency_Hz',
+    'absorbance': 'Absorbance'
+}
+
+# Source of unique store tokens, used in curve cache keys
+_store_tokens = itertools.count()
+
+
+def _ear_codes(values: pd.Series) -> np.ndarray:
+    """
+    Map ear values to ear positions (0 = Right, 1 = Left, -1 = unknown).
+    
+    Numeric values follow the NHANES coding (1 = Right, 2 = Left); text
+    values are matched on their first letter.
+    """
+    if pd.api.types.is_numeric_dtype(values):
+        numeric = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        return np.select([numeric == 1, numeric == 2], [0, 1], default=-1)
+    
+    first_letter = values.astype('string').str.strip().str[0].str.lower()
+    return np.select(
+        [(first_letter == 'r').to_numpy(dtype=bool, na_value=False),
+         (first_letter == 'l').to_numpy(dtype=bool, na_value=False)],
+        [0, 1],
+        default=-1
+    )
+
+
+def _axis_positions(axis: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Positions of values on a sorted axis (-1 for values not on it)."""
+    positions = np.searchsorted(axis, values)
+    positions = np.minimum(positions, len(axis) - 1)
+    return np.where(axis[positions] == values, positions, -1)
+
+
+def summarize_absorbance_batch(
+    grids: np.ndarray,
+    pressures: np.ndarray,
+    frequencies: np.ndarray,
+    ambient_pressure: float = 0
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate wideband summary metrics for every grid of a tensor.
+    
+    Metrics:
+    - ambient_absorbance: mean absorbance over frequency at the pressure
+      closest to ambient
+    - peak_absorbance: maximum absorbance at ambient pressure
+    - resonance_frequency: frequency (Hz) of the peak absorbance at ambient
+      pressure. Absorbance carries no phase, so the absorbance peak stands
+      in for the zero crossing of the susceptance.
+    - peak_pressure: pressure (daPa) of the highest mean absorbance over
+      frequency (the ambient pressure if only one pressure was measured)
+    
+    Missing points are ignored; grids without valid points give NaN.
+    
+    Args:
+        grids: Absorbance array of shape (..., n_pressures, n_frequencies),
+              e.g. (participants, ears, pressures, frequencies).
+        pressures: Pressure values in daPa of the second-to-last axis.
+        frequencies: Frequency values in Hz of the last axis.
+        ambient_pressure: Pressure (daPa) treated as ambient.
+    
+    Returns:
+        Dictionary of metric arrays of shape grids.shape[:-2], with the keys
+        WIDEBAND_SUMMARY_NAMES.
+    
+    Raises:
+        ValueError: If the shapes of the grids and axes do not match.
+    """
+    pressures = np.asarray(pressures, dtype=np.float64)
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    grids = np.asarray(grids, dtype=np.float32)
+    if grids.shape[-2:] != (len(pressures), len(frequencies)):
+        raise ValueError(
+            f"Grids of shape {grids.shape} do not match "
+            f"{len(pressures)} pressures and {len(frequencies)} frequencies"
+        )
+    
+    leading_shape = grids.shape[:-2]
+    grids = grids.reshape(-1, len(pressures), len(frequencies))
+    valid = ~np.isnan(grids)
+    
+    # Mean absorbance over frequency at each pressure
+    n_valid = valid.sum(axis=2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean_absorbance = np.where(valid, grids, 0).sum(axis=2, dtype=np.float64) / n_valid
+    
+    ambient_idx = int(np.abs(pressures - ambient_pressure).argmin())
+    ambient = grids[:, ambient_idx]
+    ambient_valid = valid[:, ambient_idx]
+    has_ambient = ambient_valid.any(axis=1)
+    
+    peak_idx = np.where(ambient_valid, ambient, -np.inf).argmax(axis=1)
+    peak_absorbance = ambient[np.arange(len(ambient)), peak_idx].astype(np.float64)
+    
+    has_pressure = n_valid > 0
+    peak_pressure_idx = np.where(has_pressure, mean_absorbance, -np.inf).argmax(axis=1)
+    
+    results = {
+        'ambient_absorbance': mean_absorbance[:, ambient_idx],
+        'peak_absorbance': np.where(has_ambient, peak_absorbance, np.nan),
+        'resonance_frequency': np.where(has_ambient, frequencies[peak_idx], np.nan),
+        'peak_pressure': np.where(has_pressure.any(axis=1), pressures[peak_pressure_idx], np.nan)
+    }
+    
+    return {name: values.reshape(leading_shape) for name, values in results.items()}
+
+
+class WidebandStore:
+    """
+    A SEQN-indexed store of wideband absorbance grids.
+    
+    Row i of the grid array holds the grids of participant seqns[i], with one
+    (pressures, frequencies) grid per ear in the order of `ears`. Grid points
+    that were not measured are NaN.
+    """
+    
+    def __init__(
+        self,
+        seqns: np.ndarray,
+        grids: np.ndarray,
+        pressures: np.ndarray,
+        frequencies: np.ndarray,
+        ears: Sequence[str] = ('Right', 'Left'),
+        metadata: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the wideband store.
+        
+        Args:
+            seqns: Participant sequence numbers, one per row of grids.
+            grids: Array of shape (n_participants, n_ears, n_pressures,
+                  n_frequencies). Memory-mapped arrays are used as they are.
+            pressures: Sorted pressure values in daPa.
+            frequencies: Sorted frequency values in Hz.
+            ears: Ear labels in the order of the second axis of grids.
+            metadata: Optional descriptive metadata (e.g. cohort, source file).
+        
+        Raises:
+            ValueError: If the array shapes do not match.
+        """
+        if not isinstance(grids, np.memmap):
+            grids = np.ascontiguousarray(grids, dtype=np.float32)
+        expected_shape = (len(seqns), len(ears), len(pressures), len(frequencies))
+        if grids.shape != expected_shape:
+            raise ValueError(f"Grids of shape {grids.shape} do not match the expected shape {expected_shape}")
+        
+        self.seqns = np.asarray(seqns, dtype=np.float64)
+        self.grids = grids
+        self.pressures = np.asarray(pressures, dtype=np.float64)
+        self.frequencies = np.asarray(frequencies, dtype=np.float64)
+        self.ears = list(ears)
+        self.metadata = dict(metadata or {})
+        self.token = next(_store_tokens)
+        
+        # SEQN -> row of its first occurrence (missing SEQNs are not indexed)
+        valid_rows = np.flatnonzero(~np.isnan(self.seqns))
+        unique_seqns, first = np.unique(self.seqns[valid_rows], return_index=True)
+        self.index = pd.Index(unique_seqns)
+        self.rows = valid_rows[first]
+        self._row_lookup = dict(zip(unique_seqns.tolist(), self.rows.tolist()))
+    
+    def __len__(self) -> int:
+        """Number of indexed participants."""
+        return len(self.index)
+    
+    def __contains__(self, seqn: Union[int, float]) -> bool:
+        """Whether a participant is in the store."""
+        return seqn in self._row_lookup
+    
+    @property
+    def nbytes(self) -> int:
+        """Size of the grid array (memory-mapped arrays are paged in on use)."""
+        return self.grids.nbytes
+    
+    def get_row(self, seqn: Union[int, float]) -> int:
+        """
+        Get the grid array row of a participant.
+        
+        Args:
+            seqn: Participant sequence number.
+        
+        Returns:
+            Row index into the grid array.
+        
+        Raises:
+            ValueError: If participant SEQN is not found in the store.
+        """
+        row = self._row_lookup.get(seqn)
+        if row is None:
+            raise ValueError(f"Participant SEQN {seqn} not found in dataset")
+        return row
+    
+    def _ear_index(self, ear: str) -> int:
+        """Get the position of an ear label (case-insensitive)."""
+        labels = [label.lower() for label in self.ears]
+        if ear.lower() not in labels:
+            raise ValueError(f"Ear {ear} not available. Use {self.ears}")
+        return labels.index(ear.lower())
+    
+    def _axis_selection(
+        self,
+        pressures: Optional[Sequence[float]],
+        frequencies: Optional[Sequence[float]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the grid positions of selected pressures and frequencies (all if None).
+        
+        Raises:
+            ValueError: If a selected value is not on the store's axes.
+        """
+        selections = []
+        for name, axis, values in (
+            ('Pressure', self.pressures, pressures),
+            ('Frequency', self.frequencies, frequencies)
+        ):
+            if values is None:
+                selections.append(np.arange(len(axis)))
+                continue
+            
+            values = np.atleast_1d(np.asarray(values, dtype=np.float64))
+            positions = _axis_positions(axis, values)
+            if (positions < 0).any():
+                raise ValueError(f"{name} {values[positions < 0][0]} not available in the store")
+            selections.append(positions)
+        
+        return selections[0], selections[1]
+    
+    def get(
+        self,
+        seqn: Union[int, float],
+        ear: Optional[str] = None,
+        pressures: Optional[Sequence[float]] = None,
+        frequencies: Optional[Sequence[float]] = None
+    ) -> np.ndarray:
+        """
+        Get the absorbance grids of a participant in O(1).
+        
+        Args:
+            seqn: Participant sequence number.
+            ear: Optional ear label. If None, grids of all ears are returned.
+            pressures: Optional pressures (daPa) to select. If None, all.
+            frequencies: Optional frequencies (Hz) to select. If None, all.
+        
+        Returns:
+            Array of shape (n_ears, n_pressures, n_frequencies), or
+            (n_pressures, n_frequencies) for one ear.
+        
+        Raises:
+            ValueError: If the participant, ear or an axis value is not found.
+        """
+        row = self.get_row(seqn)
+        pressure_sel, frequency_sel = self._axis_selection(pressures, frequencies)
+        ear_sel = [self._ear_index(ear)] if ear is not None else np.arange(len(self.ears))
+        
+        grids = np.array(self.grids[np.ix_([row], ear_sel, pressure_sel, frequency_sel)][0], dtype=np.float32)
+        if ear is not None:
+            grids = grids[0]
+        
+        grids.flags.writeable = False
+        return grids
+    
+    def lookup(
+        self,
+        seqns: Sequence[Union[int, float]],
+        missing: str = 'skip'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the rows of many participants at once.
+        
+        Args:
+            seqns: Participant sequence numbers.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            Tuple of (found SEQNs, rows), in the order of seqns.
+        
+        Raises:
+            ValueError: If missing='raise' and a participant is not found.
+        """
+        seqns = np.asarray(seqns, dtype=np.float64)
+        positions = self.index.get_indexer(seqns)
+        found = positions >= 0
+        
+        if missing == 'raise' and not found.all():
+            raise ValueError(f"Participant SEQN {seqns[~found][0]} not found in dataset")
+        
+        return seqns[found], self.rows[positions[found]]
+    
+    def gather(
+        self,
+        seqns: Optional[Sequence[Union[int, float]]] = None,
+        ear: Optional[str] = None,
+        pressures: Optional[Sequence[float]] = None,
+        frequencies: Optional[Sequence[float]] = None,
+        missing: str = 'skip'
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gather the grids of many participants, projected onto selected axes.
+        
+        Only the selected ear, pressures and frequencies are read, so
+        projecting a memory-mapped store pages in just those values.
+        
+        Args:
+            seqns: Participant sequence numbers. If None, all indexed participants.
+            ear: Optional ear label. If None, grids of all ears are returned.
+            pressures: Optional pressures (daPa) to select. If None, all.
+            frequencies: Optional frequencies (Hz) to select. If None, all.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            Tuple of (found SEQNs, float32 array of shape (n_found, n_ears,
+            n_pressures, n_frequencies), without the ear axis for one ear).
+        """
+        if seqns is None:
+            found_seqns, rows = self.index.to_numpy(), self.rows
+        else:
+            found_seqns, rows = self.lookup(seqns, missing)
+        
+        ear_sel = [self._ear_index(ear)] if ear is not None else np.arange(len(self.ears))
+        pressure_sel, frequency_sel = self._axis_selection(pressures, frequencies)
+        
+        grids = np.asarray(self.grids[np.ix_(rows, ear_sel, pressure_sel, frequency_sel)], dtype=np.float32)
+        if ear is not None:
+            grids = grids[:, 0]
+        return found_seqns, grids
+    
+    def to_long(
+        self,
+        seqns: Optional[Sequence[Union[int, float]]] = None,
+        ears: Optional[List[str]] = None,
+        pressures: Optional[Sequence[float]] = None,
+        frequencies: Optional[Sequence[float]] = None,
+        missing: str = 'skip',
+        dropna: bool = True
+    ) -> pd.DataFrame:
+        """
+        Gather grids into a long-format frame.
+        
+        Rows are ordered by participant (in the order of seqns), then ear,
+        then pressure, then frequency.
+        
+        Args:
+            seqns: Participant sequence numbers. If None, all indexed participants.
+            ears: Optional ear labels to include. If None, all ears.
+            pressures: Optional pressures (daPa) to select. If None, all.
+            frequencies: Optional frequencies (Hz) to select. If None, all.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+            dropna: Drop grid points that were not measured.
+        
+        Returns:
+            Long-format DataFrame with columns SEQN, Ear, Pressure_daPa,
+            Frequency_Hz and Absorbance.
+        """
+        found_seqns, grids = self.gather(seqns, None, pressures, frequencies, missing)
+        
+        ear_positions = [self._ear_index(ear) for ear in ears] if ears is not None else range(len(self.ears))
+        ear_labels = [self.ears[i] for i in ear_positions]
+        grids = grids[:, list(ear_positions)]
+        
+        pressure_sel, frequency_sel = self._axis_selection(pressures, frequencies)
+        pressure_values = self.pressures[pressure_sel]
+        frequency_values = self.frequencies[frequency_sel]
+        
+        n_found, n_ears, n_pressures, n_frequencies = grids.shape
+        long_df = pd.DataFrame({
+            'SEQN': np.repeat(found_seqns, n_ears * n_pressures * n_frequencies),
+            'Ear': np.tile(np.repeat(ear_labels, n_pressures * n_frequencies), n_found),
+            'Pressure_daPa': np.tile(np.repeat(pressure_values, n_frequencies), n_found * n_ears),
+            'Frequency_Hz': np.tile(frequency_values, n_found * n_ears * n_pressures),
+            'Absorbance': grids.reshape(-1)
+        })
+        
+        if dropna:
+            long_df = long_df[long_df['Absorbance'].notna()].reset_index(drop=True)
+        return long_df
+    
+    def summarize(
+        self,
+        seqns: Optional[Sequence[Union[int, float]]] = None,
+        ambient_pressure: float = 0,
+        block_rows: int = 1024,
+        missing: str = 'skip'
+    ) -> pd.DataFrame:
+        """
+        Calculate summary metrics for every participant and ear.
+        
+        Participants are processed in blocks of rows, so only one block of a
+        memory-mapped store is in memory at a time.
+        
+        Args:
+            seqns: Participant sequence numbers. If None, all indexed participants.
+            ambient_pressure: Pressure (daPa) treated as ambient.
+            block_rows: Participants per block.
+            missing: 'skip' to drop participants not in the store, or 'raise'.
+        
+        Returns:
+            DataFrame with columns SEQN, Ear and WIDEBAND_SUMMARY_NAMES, one
+            row per participant and ear.
+        """
+        if seqns is None:
+            found_seqns, rows = self.index.to_numpy(), self.rows
+        else:
+            found_seqns, rows = self.lookup(seqns, missing)
+        
+        block_results = [
+            summarize_absorbance_batch(
+                self.grids[rows[start:start + block_rows]],
+                self.pressures,
+                self.frequencies,
+                ambient_pressure
+            )
+            for start in range(0, len(rows), block_rows)
+        ]
+        
+        n_ears = len(self.ears)
+        summary = pd.DataFrame({
+            'SEQN': np.repeat(found_seqns, n_ears),
+            'Ear': np.tile(self.ears, len(found_seqns))
+        })
+        for name in WIDEBAND_SUMMARY_NAMES:
+            values = [results[name].reshape(-1) for results in block_results]
+            summary[name] = np.concatenate(values) if values else np.empty(0)
+        
+        return summary
+    
+    def _info(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Metadata saved with the store."""
+        return {
+            'format_version': WIDEBAND_STORE_FORMAT_VERSION,
+            'dtype': 'float32',
+            'shape': list(self.grids.shape),
+            'ears': self.ears,
+            'pressures': self.pressures.tolist(),
+            'frequencies': self.frequencies.tolist(),
+            'metadata': {**self.metadata, **(metadata or {})}
+        }
+    
+    def save(self, path: Union[str, Path], metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """
+        Save the store as a directory that can be memory-mapped with load().
+        
+        The directory holds grids.npy (all rows, including duplicate SEQNs),
+        seqns.npy and metadata.json, and is replaced atomically.
+        
+        Args:
+            path: Destination directory.
+            metadata: Optional descriptive metadata, merged into the store's.
+        
+        Returns:
+            Path of the saved directory.
+        """
+        info = self._info(metadata)
+        
+        def write(directory: Path) -> None:
+            np.save(directory / 'grids.npy', np.asarray(self.grids, dtype=np.float32))
+            np.save(directory / 'seqns.npy', self.seqns)
+            with open(directory / 'metadata.json', 'w') as f:
+                json.dump(info, f, indent=2, default=str)
+        
+        return write_directory_atomic(write, path)
+    
+    @classmethod
+    def load(cls, path: Union[str, Path], mmap: bool = True) -> 'WidebandStore':
+        """
+        Load a store saved with save().
+        
+        Args:
+            path: Directory of the saved store.
+            mmap: Memory-map the grid array (read-only) instead of reading it.
+        
+        Returns:
+            WidebandStore instance.
+        
+        Raises:
+            FileNotFoundError: If the directory does not hold a saved store.
+            ValueError: If the store was saved in an unsupported format.
+        """
+        path = Path(path)
+        info = read_curve_store_metadata(path)
+        if info is None:
+            raise FileNotFoundError(f"Wideband store not found: {path}")
+        if info.get('format_version') != WIDEBAND_STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Wideband store {path} has format version {info.get('format_version')}, "
+                f"expected {WIDEBAND_STORE_FORMAT_VERSION}"
+            )
+        
+        grids = np.load(path / 'grids.npy', mmap_mode='r' if mmap else None)
+        seqns = np.load(path / 'seqns.npy')
+        
+        return cls(
+            seqns, grids, np.asarray(info['pressures']), np.asarray(info['frequencies']),
+            info['ears'], metadata=info['metadata']
+        )
+    
+    @classmethod
+    def concatenate(cls, stores: Sequence['WidebandStore']) -> 'WidebandStore':
+        """
+        Combine stores (e.g. of several cohorts) into one in-memory store.
+        
+        The combined axes are the union of the stores' pressures and
+        frequencies; points a store did not measure are NaN.
+        
+        Args:
+            stores: Stores with the same ear labels.
+        
+        Returns:
+            Combined WidebandStore.
+        
+        Raises:
+            ValueError: If no stores are given or their ear labels differ.
+        """
+        if not stores:
+            raise ValueError("No wideband stores to combine")
+        ears = stores[0].ears
+        if any(store.ears != ears for store in stores):
+            raise ValueError("Wideband stores have different ear labels")
+        
+        pressures = np.unique(np.concatenate([store.pressures for store in stores]))
+        frequencies = np.unique(np.concatenate([store.frequencies for store in stores]))
+        
+        n_rows = sum(len(store.seqns) for store in stores)
+        grids = np.full((n_rows, len(ears), len(pressures), len(frequencies)), np.nan, dtype=np.float32)
+        
+        start = 0
+        for store in stores:
+            pressure_idx = np.searchsorted(pressures, store.pressures)
+            frequency_idx = np.searchsorted(frequencies, store.frequencies)
+            end = start + len(store.seqns)
+            grids[start:end, :, pressure_idx[:, None], frequency_idx] = store.grids
+            start = end
+        
+        return cls(
+            np.concatenate([store.seqns for store in stores]), grids, pressures, frequencies, ears,
+            metadata={'cohorts': [store.metadata.get('cohort') for store in stores]}
+        )
+
+
+class NHANESWidebandLoader:
+    """
+    A class for loading and processing NHANES wideband reflectance data.
+    
+    Wideband files hold absorbance over a grid of frequencies (and, for
+    wideband tympanometry, ear canal pressures) per ear, which makes them the
+    largest per-participant records in NHANES. The loader parses them in
+    chunks into a compact (participants, ears, pressures, frequencies)
+    float32 array instead of keeping the long frame in memory.
+    """
+    
+    def __init__(
+        self,
+        data_dir: Union[str, Path],
+        derived_dir: Optional[Union[str, Path]] = None,
+        columns: Optional[Dict[str, str]] = None,
+        curve_cache: Optional[CurveCache] = None
+    ):
+        """
+        Initialize the wideband reflectance data loader.
+        
+        Args:
+            data_dir: Path to the NHANES data directory containing wideband files.
+            derived_dir: Optional directory for cached wideband stores. Defaults
+                        to a 'derived' directory next to the wideband files.
+            columns: Optional column names of the long-format files, overriding
+                    DEFAULT_WIDEBAND_COLUMNS (keys 'seqn', 'ear', 'pressure',
+                    'frequency' and 'absorbance').
+            curve_cache: Optional cache of per-participant grids. Defaults to
+                        the cache shared by all loaders.
+        """
+        self.data_dir = Path(data_dir)
+        self.wideband_dir = self.data_dir / 'nhanes' / 'wideband'
+        self.derived_dir = Path(derived_dir) if derived_dir else self.wideband_dir / 'derived'
+        
+        self.columns = {**DEFAULT_WIDEBAND_COLUMNS, **(columns or {})}
+        self.ears = ['Right', 'Left']
+        
+        # Rows without a pressure were measured at ambient pressure
+        self.ambient_pressure = 0  # daPa
+        
+        # Rows per chunk when parsing the long-format files
+        self.chunk_rows = 1_000_000
+        
+        # Cohort suffixes available
+        self.cohort_suffixes = ['2011-12.csv', '2015-16.csv', '2017-18.csv', '2017-20.csv']
+        
+        self.curve_cache = curve_cache if curve_cache is not None else get_curve_cache()
+    
+    def get_cohort_file(self, cohort_suffix: str) -> Path:
+        """Get the path of a cohort's wideband reflectance file."""
+        return self.wideband_dir / f'nhanes_auxw_{cohort_suffix}'
+    
+    def get_wideband_store_path(self, cohort_suffix: str) -> Path:
+        """Get the directory of a cohort's saved wideband store."""
+        cohort = cohort_suffix.replace('.csv', '')
+        return self.derived_dir / f'nhanes_auxw_{cohort}_grids'
+    
+    def _read_chunks(self, filepath: Path, keys: Sequence[str]):
+        """
+        Read the projected columns of a long-format file in chunks.
+        
+        Yields:
+            DataFrames with the columns of the given keys (missing optional
+            columns are absent).
+        
+        Raises:
+            FileNotFoundError: If the wideband file is not found.
+            ValueError: If a required column is missing.
+        """
+        if not filepath.exists():
+            raise FileNotFoundError(
+                f"Wideband reflectance file not found: {filepath}. "
+                f"Please ensure data directory structure is correct."
+            )
+        
+        header = pd.read_csv(filepath, nrows=0).columns
+        for key in ('seqn', 'ear', 'frequency', 'absorbance'):
+            if key in keys and self.columns[key] not in header:
+                raise ValueError(f"Column {self.columns[key]} not found in {filepath}")
+        
+        usecols = [self.columns[key] for key in keys if self.columns[key] in header]
+        numeric_columns = [
+            self.columns[key] for key in ('seqn', 'pressure', 'frequency', 'absorbance')
+            if key in keys and self.columns[key] in header
+        ]
+        
+        yield from pd.read_csv(
+            filepath,
+            usecols=usecols,
+            dtype={col: 'float64' for col in numeric_columns},
+            chunksize=self.chunk_rows
+        )
+    
+    def _chunk_pressures(self, chunk: pd.DataFrame) -> np.ndarray:
+        """Pressures of a chunk's rows (ambient where none was recorded)."""
+        col = self.columns['pressure']
+        if col not in chunk.columns:
+            return np.full(len(chunk), float(self.ambient_pressure))
+        return chunk[col].fillna(self.ambient_pressure).to_numpy(dtype=np.float64)
+    
+    def scan_axes(self, cohort_suffix: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Find the participants, pressures and frequencies of a cohort file.
+        
+        Only the SEQN, pressure and frequency columns are read.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '2011-12.csv').
+        
+        Returns:
+            Tuple of (SEQNs in order of first appearance, sorted pressures,
+            sorted frequencies).
+        """
+        seqn_col, frequency_col = self.columns['seqn'], self.columns['frequency']
+        seqns, pressures, frequencies = [], [], []
+        
+        for chunk in self._read_chunks(self.get_cohort_file(cohort_suffix), ('seqn', 'pressure', 'frequency')):
+            seqns.append(pd.unique(chunk[seqn_col].dropna().to_numpy()))
+            pressures.append(np.unique(self._chunk_pressures(chunk)))
+            frequencies.append(np.unique(chunk[frequency_col].dropna().to_numpy()))
+        
+        return (
+            pd.unique(np.concatenate(seqns)) if seqns else np.empty(0),
+            np.unique(np.concatenate(pressures)) if pressures else np.empty(0),
+            np.unique(np.concatenate(frequencies)) if frequencies else np.empty(0)
+        )
+    
+    def _scatter_chunk(
+        self,
+        grids: np.ndarray,
+        chunk: pd.DataFrame,
+        seqn_index: pd.Index,
+        pressures: np.ndarray,
+        frequencies: np.ndarray
+    ) -> None:
+        """Write the absorbance values of a long-format chunk into the grid array."""
+        rows = seqn_index.get_indexer(chunk[self.columns['seqn']].to_numpy(dtype=np.float64))
+        ears = _ear_codes(chunk[self.columns['ear']])
+        pressure_idx = _axis_positions(pressures, self._chunk_pressures(chunk))
+        frequency_idx = _axis_positions(frequencies, chunk[self.columns['frequency']].to_numpy(dtype=np.float64))
+        absorbance = chunk[self.columns['absorbance']].to_numpy(dtype=np.float64)
+        
+        keep = (rows >= 0) & (ears >= 0) & (pressure_idx >= 0) & (frequency_idx >= 0) & ~np.isnan(absorbance)
+        grids[rows[keep], ears[keep], pressure_idx[keep], frequency_idx[keep]] = absorbance[keep]
+    
+    def build_wideband_store(self, df: pd.DataFrame) -> WidebandStore:
+        """
+        Pack a long-format wideband frame into an in-memory store.
+        
+        If a grid point occurs more than once for a participant and ear, the
+        last row is kept.
+        
+        Args:
+            df: Long-format DataFrame with the loader's wideband columns.
+        
+        Returns:
+            WidebandStore of shape (participants, 2 ears, pressures, frequencies).
+        """
+        seqns = pd.unique(df[self.columns['seqn']].dropna().to_numpy(dtype=np.float64))
+        pressures = np.unique(self._chunk_pressures(df))
+        frequencies = np.unique(df[self.columns['frequency']].dropna().to_numpy(dtype=np.float64))
+        
+        grids = np.full((len(seqns), len(self.ears), len(pressures), len(frequencies)), np.nan, dtype=np.float32)
+        self._scatter_chunk(grids, df, pd.Index(seqns), pressures, frequencies)
+        
+        return WidebandStore(seqns, grids, pressures, frequencies, self.ears)
+    
+    def load_cohort_data(self, cohort_suffix: str) -> pd.DataFrame:
+        """
+        Load the projected long-format wideband data of a single cohort.
+        
+        Only the SEQN, ear, pressure, frequency and absorbance columns are
+        read. For whole cohorts prefer load_wideband_store(), which does not
+        keep the long frame in memory.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '2011-12.csv').
+        
+        Returns:
+            DataFrame containing the long-format wideband data.
+        
+        Raises:
+            FileNotFoundError: If the wideband file is not found.
+        """
+        chunks = list(self._read_chunks(self.get_cohort_file(cohort_suffix), tuple(self.columns)))
+        return pd.concat(chunks, ignore_index=True)
+    
+    def load_wideband_store(
+        self,
+        cohort_suffix: str,
+        mmap: bool = True,
+        refresh: bool = False
+    ) -> WidebandStore:
+        """
+        Load a cohort's absorbance grids as a memory-mapped wideband store.
+        
+        The first load (or a load after the file changes) parses the CSV in
+        chunks straight into a memory-mapped array on disk; later loads only
+        map the saved array.
+        
+        Args:
+            cohort_suffix: Filename suffix for the cohort (e.g., '2011-12.csv').
+            mmap: Memory-map the grid array instead of reading it.
+            refresh: Rebuild the store even if a valid saved store exists.
+        
+        Returns:
+            WidebandStore of shape (participants, 2 ears, pressures, frequencies).
+        
+        Raises:
+            FileNotFoundError: If the wideband file is not found.
+        """
+        source_file = self.get_cohort_file(cohort_suffix)
+        if not source_file.exists():
+            raise FileNotFoundError(
+                f"Wideband reflectance file not found: {source_file}. "
+                f"Please ensure data directory structure is correct."
+            )
+        
+        path = self.get_wideband_store_path(cohort_suffix)
+        key = {
+            'source_hash': hash_file(source_file),
+            'columns': self.columns,
+            'ambient_pressure': self.ambient_pressure,
+            'format_version': WIDEBAND_STORE_FORMAT_VERSION
+        }
+        
+        info = None if refresh else read_curve_store_metadata(path)
+        if info is None or info.get('metadata', {}).get('key') != key:
+            seqns, pressures, frequencies = self.scan_axes(cohort_suffix)
+            shape = (len(seqns), len(self.ears), len(pressures), len(frequencies))
+            
+            def write(directory: Path) -> None:
+                # Parse chunks directly into the on-disk array
+                grids = np.lib.format.open_memmap(
+                    directory / 'grids.npy', mode='w+', dtype=np.float32, shape=shape
+                )
+                grids[:] = np.nan
+                seqn_index = pd.Index(seqns)
+                for chunk in self._read_chunks(source_file, tuple(self.columns)):
+                    self._scatter_chunk(grids, chunk, seqn_index, pressures, frequencies)
+                grids.flush()
+                del grids
+                
+                np.save(directory / 'seqns.npy', np.asarray(seqns, dtype=np.float64))
+                store_info = {
+                    'format_version': WIDEBAND_STORE_FORMAT_VERSION,
+                    'dtype': 'float32',
+                    'shape': list(shape),
+                    'ears': self.ears,
+                    'pressures': np.asarray(pressures, dtype=np.float64).tolist(),
+                    'frequencies': np.asarray(frequencies, dtype=np.float64).tolist(),
+                    'metadata': {
+                        'cohort': cohort_suffix.replace('.csv', ''),
+                        'measurement': 'wideband_reflectance',
+                        'key': key,
+                        'source_file': str(source_file)
+                    }
+                }
+                with open(directory / 'metadata.json', 'w') as f:
+                    json.dump(store_info, f, indent=2, default=str)
+            
+            write_directory_atomic(write, path)
+        
+        return WidebandStore.load(path, mmap=mmap)
+    
+    def load_all_cohorts_wideband(
+        self,
+        cohort_suffixes: Optional[List[str]] = None,
+        refresh: bool = False
+    ) -> WidebandStore:
+        """
+        Load and combine wideband stores from multiple cohorts.
+        
+        A single cohort is returned memory-mapped; several cohorts are
+        combined into an in-memory store on the union of their axes.
+        
+        Args:
+            cohort_suffixes: Optional list of cohort suffixes to load.
+                           If None, loads all available cohorts.
+            refresh: Rebuild the cohort stores even if valid saved stores exist.
+        
+        Returns:
+            WidebandStore with the grids of all loaded cohorts.
+        
+        Raises:
+            FileNotFoundError: If no wideband files are found.
+        """
+        if cohort_suffixes is None:
+            cohort_suffixes = self.cohort_suffixes
+        
+        stores = []
+        for suffix in cohort_suffixes:
+            try:
+                stores.append(self.load_wideband_store(suffix, refresh=refresh))
+            except FileNotFoundError:
+                print(f"Warning: Cohort file not found for {suffix}, skipping...")
+                continue
+        
+        if not stores:
+            raise FileNotFoundError("No wideband reflectance data files found")
+        
+        return stores[0] if len(stores) == 1 else WidebandStore.concatenate(stores)
+    
+    def extract_wideband_data(
+        self,
+        store: WidebandStore,
+        seqn: Union[int, float]
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Extract the absorbance grids of a specific participant.
+        
+        Args:
+            store: Wideband store containing the participant.
+            seqn: Participant sequence number (SEQN).
+        
+        Returns:
+            Dictionary containing one grid per ear:
+            - 'right': DataFrame of absorbance with pressures (daPa) as the
+              index and frequencies (Hz) as the columns
+            - 'left': the same for the left ear
+        
+        Raises:
+            ValueError: If participant SEQN is not found.
+        """
+        store.get_row(seqn)
+        
+        def build_ear_grid(ear: str) -> pd.DataFrame:
+            return pd.DataFrame(
+                store.get(seqn, ear),
+                index=pd.Index(store.pressures, name='Pressure_daPa'),
+                columns=pd.Index(store.frequencies, name='Frequency_Hz')
+            )
+        
+        return {
+            ear.lower(): self.curve_cache.get_or_compute(
+                ('wideband_reflectance', store.token, seqn, ear, 'grid'),
+                lambda: build_ear_grid(ear)
+            ).copy()
+            for ear in store.ears
+        }
+    
+    def calculate_wideband_table(
+        self,
+        store: WidebandStore,
+        seqn_list: Optional[List[Union[int, float]]] = None,
+        block_rows: int = 1024
+    ) -> pd.DataFrame:
+        """
+        Calculate wideband summary metrics for many participants at once.
+        
+        Args:
+            store: Wideband store (e.g. from load_wideband_store()).
+            seqn_list: Optional participant sequence numbers. If None, all
+                      participants in the store.
+            block_rows: Participants per block.
+        
+        Returns:
+            DataFrame with columns SEQN, Ear and WIDEBAND_SUMMARY_NAMES, one
+            row per participant and ear.
+        """
+        return store.summarize(seqn_list, ambient_pressure=self.ambient_pressure, block_rows=block_rows)
+
+
+def load_nhanes_wideband(
+    data_dir: Union[str, Path],
+    cohort_suffixes: Optional[List[str]] = None
+) -> Tuple[NHANESWidebandLoader, WidebandStore]:
+    """
+    Convenience function to load NHANES wideband reflectance data.
+    
+    Args:
+        data_dir: Path to NHANES data directory.
+        cohort_suffixes: Optional list of cohort suffixes to load.
+    
+    Returns:
+        Tuple of (loader_instance, wideband_store).
+    """
+    loader = NHANESWidebandLoader(data_dir)
+    store = loader.load_all_cohorts_wideband(cohort_suffixes)
+    
+    return loader, store
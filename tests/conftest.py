@@ -0,0 +1,93 @@
+"""
+Shared fixtures: a small synthetic NHANES data directory.
+
+The files follow the NHANES layout the loaders expect (demographics, pure
+tone audiometry, tympanometry and acoustic reflex tables for two cohorts),
+with random but reproducible values.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+COHORTS = ['1999-2000.csv', '2001-02.csv']
+RECORDS_PER_COHORT = 60
+
+PTA_COLUMNS = [
+    f'AUXU{freq}{ear}'
+    for ear in 'RL'
+    for freq in ['1K1', '500', '1K2', '2K', '3K', '4K', '6K', '8K']
+]
+
+
+def write_synthetic_nhanes(data_dir, n_records=RECORDS_PER_COHORT, seed=0):
+    """Write synthetic NHANES tables for every cohort in COHORTS."""
+    rng = np.random.default_rng(seed)
+    for subdir in ['demo', 'pta', 'tymp', 'reflex']:
+        (data_dir / subdir).mkdir(parents=True, exist_ok=True)
+    
+    first_seqn = 1
+    for cohort in COHORTS:
+        seqns = np.arange(first_seqn, first_seqn + n_records)
+        first_seqn += n_records
+        
+        pd.DataFrame({
+            'SEQN': seqns,
+            'RIAGENDR': rng.integers(1, 3, n_records).astype(float),
+            'RIDAGEYR': rng.integers(12, 86, n_records).astype(float),
+            'RIDAGEMN': np.nan,
+            'RIDRETH1': rng.integers(1, 6, n_records).astype(float),
+            'WTMEC2YR': rng.uniform(1000, 50000, n_records)
+        }).to_csv(data_dir / 'demo' / f'nhanes_demo_{cohort}', index=False)
+        
+        pta = pd.DataFrame({'SEQN': seqns})
+        level = rng.normal(10, 15, n_records)
+        for col in PTA_COLUMNS:
+            high_frequency = '4K' in col or '8K' in col
+            values = np.round((level + rng.normal(0, 10, n_records) + 20 * high_frequency) / 5) * 5
+            values[rng.random(n_records) < 0.03] = np.nan
+            values[rng.random(n_records) < 0.01] = 888  # No response code
+            pta[col] = values
+        pta.to_csv(data_dir / 'pta' / f'nhanes_aux_{cohort}', index=False)
+        
+        pressure = np.arange(-300, 204, 6)
+        tymp = {'SEQN': seqns}
+        for ear in 'RL':
+            peak = rng.normal(-30, 60, n_records)[:, None]
+            amplitude = rng.gamma(2, 0.4, n_records)[:, None]
+            width = rng.uniform(40, 120, n_records)[:, None]
+            baseline = rng.uniform(0.3, 1.5, n_records)[:, None]
+            curves = (
+                baseline * (1 - (pressure + 300) / 1000)
+                + amplitude / (1 + ((pressure - peak) / (width / 2)) ** 2)
+                + rng.normal(0, 0.02, (n_records, len(pressure)))
+            )
+            curves[rng.random(n_records) < 0.05] = np.nan
+            for i in range(len(pressure)):
+                tymp[f'AUDTY{ear}{i + 1:02d}'] = np.round(curves[:, i], 3)
+        pd.DataFrame(tymp).to_csv(data_dir / 'tymp' / f'nhanes_auxt_{cohort}', index=False)
+        
+        times = np.linspace(0, 1500, 84)
+        reflex = {'SEQN': seqns}
+        for ear in 'RL':
+            for stimulus in '12':
+                amplitude = rng.uniform(-0.5, 0.5, n_records)[:, None]
+                onset = rng.uniform(100, 400, n_records)[:, None]
+                decay = rng.uniform(300, 3000, n_records)[:, None]
+                curves = (
+                    amplitude * (times > onset) * np.exp(-(times - onset).clip(0) / decay)
+                    + rng.normal(0, 0.01, (n_records, len(times)))
+                )
+                curves[rng.random(n_records) < 0.05] = np.nan
+                for i in range(len(times)):
+                    reflex[f'AUX{ear}R{stimulus}{i + 1:02d}'] = np.round(curves[:, i], 3)
+        pd.DataFrame(reflex).to_csv(data_dir / 'reflex' / f'nhanes_auxr_{cohort}', index=False)
+    
+    return data_dir
+
+
+@pytest.fixture(scope='session')
+def nhanes_data_dir(tmp_path_factory):
+    """Directory of synthetic NHANES tables shared by the test session."""
+    return write_synthetic_nhanes(tmp_path_factory.mktemp('nhanes'))
@@ -0,0 +1,215 @@
+"""
+Tests that the batched tympanometry and acoustic reflex engines match the
+per-curve loader methods, that batched peak fits recover known curves, that
+the vectorised Jerger classification keeps the per-ear rules, and that
+quantised curve stores round-trip.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthh.acoustic_reflex_loader import NHANESAcousticReflexLoader
+from synthh.curve_store import CurveStore
+from synthh.reflex_batch import REFLEX_PARAMETER_NAMES, calculate_reflex_parameters_batch
+from synthh.tympanometry_batch import (
+    PARAMETER_NAMES,
+    TYMPANOGRAM_TYPES,
+    calculate_tympanometric_parameters_batch,
+    classify_tympanograms_batch,
+    fit_tympanograms_batch
+)
+from synthh.tympanometry_loader import NHANESTympanometryLoader
+
+from .conftest import COHORTS
+
+
+def make_tympanograms(pressure, n_curves=40, seed=1):
+    """Peaked compliance curves, including missing and sparse curves."""
+    rng = np.random.default_rng(seed)
+    peak = rng.normal(-50, 80, n_curves)[:, None]
+    amplitude = rng.gamma(2, 0.4, n_curves)[:, None]
+    width = rng.uniform(30, 150, n_curves)[:, None]
+    curves = (
+        rng.uniform(0.2, 1.5, n_curves)[:, None]
+        + amplitude / (1 + ((pressure - peak) / (width / 2)) ** 2)
+        + rng.normal(0, 0.02, (n_curves, len(pressure)))
+    )
+    curves[rng.random(curves.shape) < 0.05] = np.nan
+    curves[0] = np.nan
+    curves[1, 4:] = np.nan  # Too few valid points
+    curves[2] = -curves[2]  # Negative compliance is discarded
+    return np.round(curves, 3)
+
+
+def make_reflex_curves(times, n_curves=40, seed=2):
+    """Step responses of both signs, including missing and flat curves."""
+    rng = np.random.default_rng(seed)
+    onset = rng.uniform(100, 400, n_curves)[:, None]
+    amplitude = rng.uniform(-0.5, 0.5, n_curves)[:, None]
+    decay = rng.uniform(300, 3000, n_curves)[:, None]
+    curves = (
+        amplitude * (times > onset) * np.exp(-(times - onset).clip(0) / decay)
+        + rng.normal(0, 0.01, (n_curves, len(times)))
+    )
+    curves[rng.random(curves.shape) < 0.05] = np.nan
+    curves[0] = np.nan
+    curves[1] = 0.0
+    return np.round(curves, 3)
+
+
+@pytest.mark.parametrize('use_curve_fitting', [True, False])
+def test_tympanometry_batch_matches_scalar(tmp_path, use_curve_fitting):
+    loader = NHANESTympanometryLoader(tmp_path)
+    curves = make_tympanograms(loader.pressure_values)
+    
+    batch = calculate_tympanometric_parameters_batch(
+        loader.pressure_values, curves, use_curve_fitting=use_curve_fitting, block_rows=16
+    )
+    
+    for i, curve in enumerate(curves):
+        scalar = loader.calculate_tympanometric_parameters(
+            loader.pressure_values, curve, use_curve_fitting=use_curve_fitting
+        )
+        for name in PARAMETER_NAMES:
+            np.testing.assert_allclose(batch[name][i], scalar[name], rtol=1e-9, err_msg=f'{name}, curve {i}')
+
+
+def make_peaks(pressure, model, n_curves=30, seed=3):
+    """Noisy Gaussian or Lorentzian peaks with known centres and full widths."""
+    rng = np.random.default_rng(seed)
+    centre = rng.uniform(-200, 100, n_curves)
+    full_width = rng.uniform(40, 160, n_curves)
+    u = (pressure - centre[:, None]) / full_width[:, None]
+    shape = np.exp(-4 * np.log(2) * u ** 2) if model == 'gaussian' else 1 / (1 + 4 * u ** 2)
+    curves = (
+        rng.uniform(0.2, 1.0, n_curves)[:, None]
+        + rng.uniform(0.3, 1.5, n_curves)[:, None] * shape
+        + rng.normal(0, 0.005, (n_curves, len(pressure)))
+    )
+    return curves, centre, full_width
+
+
+@pytest.mark.parametrize('model', ['gaussian', 'lorentzian'])
+def test_fit_recovers_known_peaks(tmp_path, model):
+    pressure = NHANESTympanometryLoader(tmp_path).pressure_values
+    curves, centre, full_width = make_peaks(pressure, model)
+    
+    fits = fit_tympanograms_batch(pressure, curves, model=model, block_rows=8)
+    
+    assert fits['converged'].all()
+    np.testing.assert_allclose(fits['peak_pressure'], centre, atol=3)
+    np.testing.assert_allclose(fits['width'], full_width, atol=3)
+
+
+def test_fit_flat_curves_have_no_peak(tmp_path):
+    pressure = NHANESTympanometryLoader(tmp_path).pressure_values
+    curves = np.full((2, len(pressure)), 0.3)
+    curves[1, :4] = np.nan
+    
+    fits = fit_tympanograms_batch(pressure, curves)
+    
+    for name in ['peak_pressure', 'peak_compliance', 'width']:
+        assert np.isnan(fits[name]).all(), name
+    assert not fits['converged'].any()
+    np.testing.assert_allclose(fits['baseline'], 0.3)
+
+
+def test_fit_workers_match_serial(tmp_path):
+    pressure = NHANESTympanometryLoader(tmp_path).pressure_values
+    curves = make_tympanograms(pressure)
+    
+    serial = fit_tympanograms_batch(pressure, curves, block_rows=16)
+    parallel = fit_tympanograms_batch(pressure, curves, block_rows=16, n_workers=2)
+    
+    for name in serial:
+        np.testing.assert_array_equal(parallel[name], serial[name], err_msg=name)
+
+
+def classify_scalar(params):
+    """Per-ear Jerger rules the batched classification replaced."""
+    peak_pressure = params.get('peak_pressure', np.nan)
+    peak_compliance = params.get('peak_compliance', np.nan)
+    if np.isnan(peak_pressure) or np.isnan(peak_compliance):
+        return 'Type B'
+    if peak_pressure < -150:
+        return 'Type C'
+    if peak_compliance < 0.3:
+        return 'Type As'
+    if peak_compliance > 1.7:
+        return 'Type Ad'
+    return 'Type A'
+
+
+def make_parameter_table(n_rows=200, seed=4):
+    """Peak parameters on and around the type boundaries, with missing peaks."""
+    rng = np.random.default_rng(seed)
+    table = pd.DataFrame({
+        'Cohort': rng.choice(['1999-2000', '2001-02', '2003-04'], n_rows),
+        'peak_pressure': rng.choice([-150.0, -151.0, 0.0], n_rows) + rng.normal(0, 100, n_rows).round(-2),
+        'peak_compliance': rng.choice([0.3, 1.7, 0.29, 1.71], n_rows) * rng.choice([1.0, 0.5, 2.0], n_rows)
+    })
+    table.loc[rng.random(n_rows) < 0.1, 'peak_pressure'] = np.nan
+    table.loc[rng.random(n_rows) < 0.1, 'peak_compliance'] = np.nan
+    return table
+
+
+def test_classification_matches_scalar_rules():
+    table = make_parameter_table()
+    
+    types = classify_tympanograms_batch(table['peak_pressure'], table['peak_compliance'])
+    
+    expected = [classify_scalar(params) for params in table.to_dict('records')]
+    assert list(types.categories) == TYMPANOGRAM_TYPES
+    assert list(types) == expected
+    assert NHANESTympanometryLoader.classify_tympanogram_type({}) == 'Type B'
+
+
+@pytest.mark.parametrize('normalize', [False, True])
+def test_type_counts_per_cohort(tmp_path, normalize):
+    loader = NHANESTympanometryLoader(tmp_path)
+    table = make_parameter_table()
+    table = table[table['Cohort'] != '2003-04'].copy()
+    table.loc[table['Cohort'] == '2001-02', 'peak_pressure'] = np.nan  # Only Type B
+    
+    counts = loader.count_tympanogram_types(table, normalize=normalize)
+    
+    types = pd.Series([classify_scalar(params) for params in table.to_dict('records')], index=table.index)
+    expected = pd.crosstab(table['Cohort'], types, normalize='index' if normalize else False)
+    expected = expected.reindex(columns=TYMPANOGRAM_TYPES, fill_value=0)
+    assert list(counts.columns) == TYMPANOGRAM_TYPES
+    np.testing.assert_allclose(counts.loc[expected.index].to_numpy(), expected.to_numpy())
+    assert counts.loc['2001-02', 'Type B'] == (1.0 if normalize else (table['Cohort'] == '2001-02').sum())
+
+
+def test_reflex_batch_matches_scalar(tmp_path):
+    loader = NHANESAcousticReflexLoader(tmp_path)
+    curves = make_reflex_curves(loader.time_values)
+    
+    batch = calculate_reflex_parameters_batch(loader.time_values, curves.reshape(10, 2, 2, -1))
+    
+    for i, curve in enumerate(curves):
+        scalar = loader.calculate_reflex_parameters(loader.time_values, curve)
+        for name in REFLEX_PARAMETER_NAMES:
+            np.testing.assert_allclose(
+                batch[name].reshape(-1)[i], scalar[name], rtol=1e-9, err_msg=f'{name}, curve {i}'
+            )
+
+
+def test_int16_curve_store_round_trips(nhanes_data_dir, tmp_path):
+    df = pd.read_csv(nhanes_data_dir / 'tymp' / f'nhanes_auxt_{COHORTS[0]}')
+    pressure = np.arange(-300, 204, 6)
+    ear_columns = {
+        ear: [f'AUDTY{ear[0]}{i + 1:02d}' for i in range(len(pressure))]
+        for ear in ['Right', 'Left']
+    }
+    store = CurveStore.from_frame(df, ear_columns, pressure)
+    
+    store.save(tmp_path / 'curves', dtype='int16')
+    loaded = CurveStore.load(tmp_path / 'curves')
+    
+    assert loaded.curves.dtype == np.int16
+    np.testing.assert_array_equal(loaded.seqns, store.seqns)
+    np.testing.assert_array_equal(loaded.x_values, store.x_values)
+    for seqn in store.seqns:
+        np.testing.assert_array_equal(loaded.get(seqn), store.get(seqn))
@@ -0,0 +1,64 @@
+"""
+Tests for the generate and evaluate subcommands.
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthh.cli import main
+
+
+N_FEATURES = 13  # Ten thresholds, gender, age and race/ethnicity codes
+
+
+class ArgumentSeededModel:
+    """A density model seeded through sample(..., random_state), like KernelDensity."""
+    
+    def sample(self, n_samples=1, random_state=None):
+        rng = np.random.RandomState(random_state)
+        samples = rng.normal(20, 15, (n_samples, N_FEATURES))
+        samples[:, 10] = rng.rand(n_samples)
+        samples[:, 11] = rng.uniform(20, 80, n_samples)
+        samples[:, 12] = rng.uniform(0, 4, n_samples)
+        return samples
+
+
+class AttributeSeededModel(ArgumentSeededModel):
+    """A density model seeded through its random_state attribute, like GaussianMixture."""
+    
+    def __init__(self):
+        self.random_state = None
+    
+    def sample(self, n_samples=1):
+        samples = super().sample(n_samples, random_state=self.random_state)
+        return samples, np.zeros(n_samples, dtype=int)
+
+
+@pytest.mark.parametrize('model', [ArgumentSeededModel(), AttributeSeededModel()])
+def test_generate_then_evaluate(tmp_path, model):
+    model_path = tmp_path / 'model.pkl'
+    with open(model_path, 'wb') as f:
+        pickle.dump(model, f)
+    
+    outputs = [tmp_path / 'first.csv', tmp_path / 'second.csv']
+    for output in outputs:
+        assert main(['generate', str(model_path), '-n', '200', '-o', str(output), '--seed', '3']) == 0
+    
+    synthetic_df = pd.read_csv(outputs[0])
+    pd.testing.assert_frame_equal(pd.read_csv(outputs[1]), synthetic_df)
+    assert set(synthetic_df['Gender']) == {'Female', 'Male'}
+    assert set(synthetic_df['Race/ethnicity']) <= {
+        'Mexican American', 'Other Hispanic', 'Non-Hispanic White',
+        'Non-Hispanic Black', 'Other Race - Including Multi-Racial'
+    }
+    
+    report_path = tmp_path / 'report.json'
+    assert main(['evaluate', str(outputs[0]), '-o', str(report_path)]) == 0
+    
+    with open(report_path) as f:
+        prevalence = json.load(f)['shape_prevalence']['synthetic']
+    assert {'Noise Notch Right', 'Noise Notch Left', 'Asymmetric Loss', 'Unilateral Loss'} <= set(prevalence)
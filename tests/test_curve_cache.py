@@ -0,0 +1,80 @@
+"""
+Tests of the LRU curve cache and of the loaders' use of it.
+"""
+
+import numpy as np
+import pandas as pd
+
+from synthh.curve_cache import CurveCache
+from synthh.tympanometry_loader import NHANESTympanometryLoader
+
+from .conftest import COHORTS
+
+
+def test_evicts_least_recently_used_entries():
+    cache = CurveCache(max_entries=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now least recently used
+    
+    cache.put('c', 3)
+    
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    assert cache.info()['evictions'] == 1
+
+
+def test_evicts_by_bytes():
+    block = np.zeros(100)  # 800 bytes
+    cache = CurveCache(max_bytes=2000)
+    for key in 'abc':
+        cache.put(key, block.copy())
+    
+    assert len(cache) == 2
+    assert 'a' not in cache
+    assert cache.info()['nbytes'] == 2 * block.nbytes
+    
+    cache.put('b', np.zeros(10))  # Replacing an entry releases its bytes
+    assert cache.info()['nbytes'] == block.nbytes + 80
+    
+    cache.put('large', np.zeros(1000))  # Larger than max_bytes on its own
+    assert len(cache) == 0
+
+
+def test_counts_hits_and_misses():
+    cache = CurveCache()
+    calls = []
+    
+    def compute():
+        calls.append(1)
+        return 'value'
+    
+    assert cache.get_or_compute('key', compute) == 'value'
+    assert cache.get_or_compute('key', compute) == 'value'
+    assert cache.get('other') is None
+    
+    info = cache.info()
+    assert len(calls) == 1
+    assert (info['hits'], info['misses']) == (1, 2)
+    assert info['hit_rate'] == 1 / 3
+    
+    cache.clear()
+    assert len(cache) == 0 and cache.info()['hits'] == 1
+
+
+def test_loader_returns_copies_of_cached_frames(nhanes_data_dir, tmp_path):
+    df = pd.read_csv(nhanes_data_dir / 'tymp' / f'nhanes_auxt_{COHORTS[0]}')
+    cache = CurveCache()
+    loader = NHANESTympanometryLoader(tmp_path, curve_cache=cache)
+    seqn = df['SEQN'].iloc[3]
+    
+    first = loader.extract_tympanogram_data(df, seqn)
+    expected = first['right'].copy()
+    first['right']['Compliance_ml'] = -1.0
+    second = loader.extract_tympanogram_data(df, seqn)
+    
+    assert cache.info()['hits'] == 2
+    pd.testing.assert_frame_equal(second['right'], expected)
+    np.testing.assert_array_equal(
+        second['left']['Compliance_ml'], df.loc[3, loader.left_ear_columns].to_numpy(dtype=np.float64)
+    )
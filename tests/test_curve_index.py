@@ -0,0 +1,76 @@
+"""
+Tests that the curve similarity index search methods agree and that saved
+indexes round-trip.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthh.curve_index import CurveSimilarityIndex
+
+
+PRESSURE = np.arange(-300, 204, 6)
+
+
+def make_curves(n_curves, seed):
+    """Peaked curves with some missing points and a few unusable curves."""
+    rng = np.random.default_rng(seed)
+    peak = rng.normal(-50, 80, n_curves)[:, None]
+    width = rng.uniform(30, 150, n_curves)[:, None]
+    curves = (
+        rng.uniform(0.2, 1.5, n_curves)[:, None]
+        + rng.gamma(2, 0.4, n_curves)[:, None] / (1 + ((PRESSURE - peak) / (width / 2)) ** 2)
+        + rng.normal(0, 0.02, (n_curves, len(PRESSURE)))
+    )
+    curves[rng.random(curves.shape) < 0.05] = np.nan
+    curves[:3, 10:] = np.nan  # Too few valid points to be indexed
+    return curves
+
+
+@pytest.fixture(scope='module')
+def index():
+    curves = make_curves(300, seed=5)
+    return CurveSimilarityIndex.fit(
+        curves, np.arange(300), np.tile(['Right', 'Left'], 150), PRESSURE, n_components=6
+    )
+
+
+def test_kdtree_and_blocked_search_agree(index):
+    queries = make_curves(50, seed=6)
+    queries[:3] = np.nan  # Cannot be projected
+    
+    tree_distances, tree_indices = index.query(queries, k=7, method='kdtree', block_rows=16)
+    blocked_distances, blocked_indices = index.query(queries, k=7, method='blocked', block_rows=16)
+    
+    assert len(index) == 297
+    assert (tree_indices[:3] == -1).all() and np.isnan(tree_distances[:3]).all()
+    np.testing.assert_array_equal(blocked_indices, tree_indices)
+    np.testing.assert_allclose(blocked_distances, tree_distances, rtol=1e-6, equal_nan=True)
+    
+    # Merging the running top-k across several index blocks
+    embeddings = index.transform(queries[3:])
+    merged_distances, merged_indices = index._query_blocked(embeddings, 7, index_block_rows=40)
+    np.testing.assert_array_equal(merged_indices, tree_indices[3:])
+    np.testing.assert_allclose(merged_distances, tree_distances[3:], rtol=1e-6)
+
+
+def test_indexed_curves_are_their_own_nearest_neighbours(index):
+    curves = make_curves(300, seed=5)
+    
+    frame = index.query_frame(curves[3:20], k=1, query_ids=np.arange(3, 20))
+    
+    np.testing.assert_array_equal(frame['SEQN'], np.arange(3, 20))
+    np.testing.assert_allclose(frame['distance'], 0, atol=1e-4)
+
+
+def test_save_load_round_trips(index, tmp_path):
+    path = index.save(tmp_path / 'index' / 'tymp.npz')
+    loaded = CurveSimilarityIndex.load(path)
+    
+    for name in ['mean', 'components', 'explained_variance', 'embeddings', 'seqns', 'ears', 'x_values']:
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(index, name), err_msg=name)
+    assert loaded.total_variance == index.total_variance
+    
+    queries = make_curves(20, seed=7)
+    pd.testing.assert_frame_equal(loaded.query_frame(queries), index.query_frame(queries))
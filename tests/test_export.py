@@ -0,0 +1,65 @@
+"""
+Tests that streamed exports match exports of the whole dataset.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthh.export import DatasetExporter, StreamingDatasetWriter
+
+
+def make_blocks(n_blocks=3, block_rows=20, seed=9):
+    """Blocks of thresholds on the 5 dB grid; a later block holds 888 codes."""
+    rng = np.random.default_rng(seed)
+    blocks = []
+    for i in range(n_blocks):
+        block = pd.DataFrame({
+            'Cohort': rng.choice(['1999-2000', '2001-02'], block_rows),
+            '1kHz Right': rng.integers(-2, 20, block_rows) * 5.0,
+            '2kHz Left': rng.integers(-2, 20, block_rows) * 5.0,
+            'Age': rng.uniform(12, 85, block_rows)
+        })
+        block.loc[rng.random(block_rows) < 0.1, '1kHz Right'] = np.nan
+        if i == 1:
+            block.loc[[3, 7], '1kHz Right'] = 888  # No response code
+        blocks.append(block)
+    return blocks
+
+
+def read_outputs(output_dir):
+    """Read back the CSV and Parquet outputs in a stable row order."""
+    frames = {
+        'csv': pd.read_csv(output_dir / 'nhanes_wide.csv'),
+        'parquet': pd.read_parquet(output_dir / 'nhanes_wide.parquet')
+    }
+    return {
+        fmt: df[sorted(df.columns)].astype({'Cohort': str}).sort_values(['Cohort', 'Age'], ignore_index=True)
+        for fmt, df in frames.items()
+    }
+
+
+@pytest.mark.parametrize('partition_column', ['Cohort', None])
+def test_streamed_thresholds_fall_back_to_float(tmp_path, partition_column):
+    blocks = make_blocks()
+    DatasetExporter(tmp_path / 'full', partition_column=partition_column).export(
+        {'wide': pd.concat(blocks, ignore_index=True)}
+    )
+    
+    writer = StreamingDatasetWriter(DatasetExporter(tmp_path / 'streamed', partition_column=partition_column))
+    for block in blocks:
+        writer.write('wide', block)
+    manifest = writer.close()
+    
+    schema = manifest['datasets']['wide']['schema']
+    assert schema['1kHz Right'] == 'double'
+    assert schema['2kHz Left'] == 'int8'
+    assert sorted(path.name for path in (tmp_path / 'streamed').iterdir()) == [
+        'export_manifest.json', 'nhanes_wide.csv', 'nhanes_wide.parquet'
+    ]
+    
+    expected = read_outputs(tmp_path / 'full')
+    actual = read_outputs(tmp_path / 'streamed')
+    for fmt in ['csv', 'parquet']:
+        pd.testing.assert_frame_equal(actual[fmt], expected[fmt])
+    assert (actual['parquet']['1kHz Right'] == 888).sum() == 2
@@ -0,0 +1,24 @@
+"""
+Tests that importing the package stays cheap.
+"""
+
+import subprocess
+import sys
+
+
+def test_import_does_not_load_heavy_dependencies():
+    # A fresh interpreter, as modules imported by other tests would mask the result
+    code = (
+        "import sys, synthh; "
+        "print(sorted({'pandas', 'scipy'} & {name.split('.')[0] for name in sys.modules}))"
+    )
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    
+    assert result.stdout.strip() == '[]'
+
+
+def test_lazy_attributes_resolve():
+    import synthh
+    
+    assert synthh.NHANESPreprocessingPipeline.__module__ == 'synthh.preprocessing_pipeline'
+    assert 'NHANESPreprocessingPipeline' in dir(synthh)
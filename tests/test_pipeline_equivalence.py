@@ -0,0 +1,94 @@
+"""
+Tests that every execution mode of the preprocessing pipeline produces the
+same datasets as a plain serial run.
+"""
+
+import pandas as pd
+import pytest
+
+from synthh import preprocessing_pipeline
+from synthh.feature_store import NHANESFeatureStore
+from synthh.parallel import engineer_features_parallel
+from synthh.preprocessing_pipeline import NHANESPreprocessingPipeline
+
+from .conftest import COHORTS
+
+
+DATASETS = ['wide', 'long', 'modeling']
+
+
+def make_pipeline(data_dir, output_dir, **config):
+    """Create a quiet pipeline over the synthetic cohorts."""
+    pipeline = NHANESPreprocessingPipeline(data_dir, output_dir, log_level='WARNING')
+    return pipeline.configure(cohorts=COHORTS, **config)
+
+
+@pytest.fixture(scope='module')
+def serial_run(nhanes_data_dir, tmp_path_factory):
+    """Engineered datasets and output directory of a serial run."""
+    output_dir = tmp_path_factory.mktemp('serial')
+    pipeline = make_pipeline(nhanes_data_dir, output_dir, export_formats=['csv'])
+    return pipeline.run_full_pipeline(), output_dir
+
+
+def assert_datasets_equal(actual, expected):
+    assert sorted(actual) == sorted(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(actual[name], expected[name])
+
+
+@pytest.mark.parametrize('shard_by', ['cohort', 'rows'])
+def test_parallel_matches_serial(nhanes_data_dir, tmp_path, serial_run, shard_by):
+    pipeline = make_pipeline(nhanes_data_dir, tmp_path, n_workers=2, shard_by=shard_by)
+    engineered = pipeline.run_full_pipeline(export=False)
+    
+    assert_datasets_equal(engineered, serial_run[0])
+
+
+def test_streaming_matches_serial(nhanes_data_dir, tmp_path, serial_run):
+    pipeline = make_pipeline(
+        nhanes_data_dir, tmp_path, export_formats=['csv'], streaming=True, stream_block_rows=25
+    )
+    pipeline.run_full_pipeline()
+    
+    for name in DATASETS:
+        expected = pd.read_csv(serial_run[1] / f'nhanes_{name}.csv')
+        actual = pd.read_csv(tmp_path / f'nhanes_{name}.csv')
+        if name == 'long':
+            # Streamed long-format rows are ordered block by block
+            expected = expected.sort_values(list(expected.columns), ignore_index=True)
+            actual = actual.sort_values(list(actual.columns), ignore_index=True)
+        pd.testing.assert_frame_equal(actual, expected)
+
+
+def test_checkpoint_resume_matches_serial(nhanes_data_dir, tmp_path, serial_run):
+    config = {'checkpoint_dir': tmp_path / 'checkpoints'}
+    make_pipeline(nhanes_data_dir, tmp_path / 'first', **config).run_full_pipeline(export=False)
+    
+    resumed = make_pipeline(nhanes_data_dir, tmp_path / 'second', **config)
+    engineered = resumed.run_full_pipeline(export=False)
+    
+    assert resumed.resumed_stages == ['load', 'clean', 'engineer']
+    assert_datasets_equal(engineered, serial_run[0])
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_feature_store_hit_matches_miss(nhanes_data_dir, tmp_path, serial_run, monkeypatch, n_workers):
+    parallel_calls = []
+    
+    def spy(*args, **kwargs):
+        parallel_calls.append(args)
+        return engineer_features_parallel(*args, **kwargs)
+    
+    monkeypatch.setattr(preprocessing_pipeline, 'engineer_features_parallel', spy)
+    config = {'feature_store_dir': tmp_path / 'features', 'n_workers': n_workers}
+    
+    miss = make_pipeline(nhanes_data_dir, tmp_path, **config).run_full_pipeline(export=False)
+    assert len(NHANESFeatureStore(tmp_path / 'features').list_entries()) == 1
+    assert len(parallel_calls) == (n_workers > 1)  # Misses use the worker pool
+    
+    hit = make_pipeline(nhanes_data_dir, tmp_path, **config).run_full_pipeline(export=False)
+    assert len(parallel_calls) == (n_workers > 1)
+    
+    assert_datasets_equal(miss, serial_run[0])
+    assert_datasets_equal(hit, miss)
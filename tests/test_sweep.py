@@ -0,0 +1,25 @@
+"""
+Tests for configuration sweeps.
+"""
+
+import pandas as pd
+
+from synthh.sweep import ConfigurationSweep
+
+from .conftest import COHORTS
+
+
+GRID = {
+    'missing_strategy': ['listwise', 'partial'],
+    'hearing_loss_method': ['any_frequency', 'pta_average']
+}
+
+
+def test_spawned_sweep_matches_serial(nhanes_data_dir):
+    serial = ConfigurationSweep(nhanes_data_dir, cohorts=COHORTS).run(GRID)
+    spawned = ConfigurationSweep(
+        nhanes_data_dir, cohorts=COHORTS, n_workers=2, mp_context='spawn'
+    ).run(GRID)
+    
+    assert len(serial) == 4
+    pd.testing.assert_frame_equal(spawned, serial)
@@ -0,0 +1,124 @@
+"""
+Tests of the chunked wideband reflectance loader and its cached stores.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from synthh.curve_cache import CurveCache
+from synthh.wideband_loader import NHANESWidebandLoader
+
+
+PRESSURES = [-200.0, -100.0, np.nan]  # Missing pressure = ambient (0 daPa)
+COHORT_FREQUENCIES = {
+    '2011-12.csv': [226.0, 1000.0, 2000.0],
+    '2015-16.csv': [1000.0, 2000.0, 4000.0]
+}
+
+
+def write_wideband_files(data_dir, n_participants=6, seed=8):
+    """Write shuffled long-format wideband files with some unmeasured points."""
+    rng = np.random.default_rng(seed)
+    wideband_dir = data_dir / 'nhanes' / 'wideband'
+    wideband_dir.mkdir(parents=True)
+    
+    frames = {}
+    first_seqn = 100
+    for cohort, frequencies in COHORT_FREQUENCIES.items():
+        seqns = np.arange(first_seqn, first_seqn + n_participants, dtype=float)
+        first_seqn += n_participants
+        
+        grid = pd.MultiIndex.from_product(
+            [seqns, ['Right', 'Left'], PRESSURES, frequencies],
+            names=['SEQN', 'Ear', 'Pressure_daPa', 'Frequency_Hz']
+        ).to_frame(index=False)
+        grid['Absorbance'] = rng.uniform(0, 1, len(grid)).round(4)
+        grid['Extra'] = 'unused'
+        grid = grid[rng.random(len(grid)) > 0.1].sample(frac=1, random_state=seed)
+        if cohort == '2015-16.csv':
+            grid['Ear'] = grid['Ear'].map({'Right': 1, 'Left': 2})  # NHANES coding
+        
+        grid.to_csv(wideband_dir / f'nhanes_auxw_{cohort}', index=False)
+        frames[cohort] = grid
+    
+    return frames
+
+
+def expected_grid(frame, seqn, ear, frequencies):
+    """Absorbance grid of one ear, ambient pressure last as on the store axis."""
+    rows = frame[(frame['SEQN'] == seqn) & frame['Ear'].isin([ear, {'Right': 1, 'Left': 2}[ear]])]
+    grid = rows.assign(Pressure_daPa=rows['Pressure_daPa'].fillna(0)).pivot(
+        index='Pressure_daPa', columns='Frequency_Hz', values='Absorbance'
+    )
+    return grid.reindex(index=[-200.0, -100.0, 0.0], columns=frequencies).to_numpy(dtype=np.float32)
+
+
+@pytest.fixture
+def wideband(tmp_path):
+    frames = write_wideband_files(tmp_path)
+    loader = NHANESWidebandLoader(tmp_path, curve_cache=CurveCache())
+    loader.chunk_rows = 25  # Much smaller than the files
+    return loader, frames
+
+
+def test_chunked_store_matches_long_frame(wideband):
+    loader, frames = wideband
+    cohort = '2011-12.csv'
+    
+    store = loader.load_wideband_store(cohort)
+    in_memory = loader.build_wideband_store(loader.load_cohort_data(cohort))
+    
+    assert isinstance(store.grids, np.memmap)
+    np.testing.assert_array_equal(store.pressures, [-200, -100, 0])
+    np.testing.assert_array_equal(store.frequencies, COHORT_FREQUENCIES[cohort])
+    np.testing.assert_array_equal(np.sort(store.seqns), np.sort(in_memory.seqns))
+    for seqn in store.seqns:
+        for ear in ['Right', 'Left']:
+            expected = expected_grid(frames[cohort], seqn, ear, COHORT_FREQUENCIES[cohort])
+            np.testing.assert_array_equal(store.get(seqn, ear), expected)
+            np.testing.assert_array_equal(in_memory.get(seqn, ear), expected)
+    
+    grids = loader.extract_wideband_data(store, store.seqns[0])
+    np.testing.assert_array_equal(grids['left'].to_numpy(), store.get(store.seqns[0], 'Left'))
+
+
+def test_second_load_reuses_saved_store(wideband, monkeypatch):
+    loader, frames = wideband
+    cohort = '2011-12.csv'
+    first = loader.load_wideband_store(cohort)
+    
+    def fail(*args, **kwargs):
+        raise AssertionError('The wideband file was parsed again')
+    
+    with monkeypatch.context() as patch:
+        patch.setattr(loader, '_read_chunks', fail)
+        second = loader.load_wideband_store(cohort)
+    np.testing.assert_array_equal(second.grids, first.grids)
+    
+    # A changed source file invalidates the saved store
+    frame = frames[cohort].assign(Absorbance=0.5)
+    frame.to_csv(loader.get_cohort_file(cohort), index=False)
+    rebuilt = loader.load_wideband_store(cohort)
+    assert np.nanmax(rebuilt.grids) == np.nanmin(rebuilt.grids) == 0.5
+
+
+def test_cohorts_concatenate_on_union_axes(wideband):
+    loader, frames = wideband
+    
+    combined = loader.load_all_cohorts_wideband(list(COHORT_FREQUENCIES) + ['2017-18.csv'])
+    
+    assert len(combined) == 12
+    assert combined.metadata['cohorts'] == ['2011-12', '2015-16']
+    np.testing.assert_array_equal(combined.frequencies, [226, 1000, 2000, 4000])
+    for cohort, frequencies in COHORT_FREQUENCIES.items():
+        for seqn in frames[cohort]['SEQN'].unique():
+            for ear in ['Right', 'Left']:
+                expected = expected_grid(frames[cohort], seqn, ear, combined.frequencies)
+                np.testing.assert_array_equal(combined.get(seqn, ear), expected)
+    
+    table = loader.calculate_wideband_table(combined)
+    assert len(table) == 24
+    
+    with pytest.raises(FileNotFoundError):
+        loader.load_all_cohorts_wideband(['2017-18.csv'])